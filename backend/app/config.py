@@ -26,6 +26,49 @@ class Settings(BaseSettings):
     database_url: str = Field(default="sqlite:///./data/checkout.db")
     test_database_url: str = Field(default="sqlite:///./data/test_checkout.db")
     
+    # Product cache (process-local, per database)
+    product_cache_enabled: bool = Field(default=True)
+    product_cache_max_size: int = Field(default=10000)
+    product_cache_ttl_seconds: float = Field(default=300.0)
+    
+    # Search result cache (process-local, per database)
+    search_cache_enabled: bool = Field(default=True)
+    search_cache_max_entries: int = Field(default=2048)
+    search_cache_ttl_seconds: float = Field(default=60.0)
+    
+    # Catalog search engine: "sql" (database queries) or "columnar"
+    # (in-memory NumPy snapshot, requires numpy)
+    catalog_engine: str = Field(default="sql")
+    catalog_snapshot_background_refresh: bool = Field(default=True)
+    
+    # Autocomplete trie: rebuild on a worker thread after catalog changes
+    autocomplete_background_refresh: bool = Field(default=True)
+    
+    # Typo-tolerant search: retry searches without results with corrected
+    # words (trigram similarity against title and brand words)
+    fuzzy_search_enabled: bool = Field(default=True)
+    fuzzy_search_min_similarity: float = Field(default=0.4)
+    fuzzy_search_background_refresh: bool = Field(default=True)
+    
+    # Catalog delta feed: changes newer than this are held back until a
+    # later request, so writes still being committed are never skipped
+    catalog_delta_settle_seconds: float = Field(default=2.0)
+    
+    # Checkout session store: "sql" (every change committed before the
+    # request returns) or "write_behind" (sessions in memory, changes flushed
+    # in batches; completion is always synchronous). See
+    # app.services.session_store for the durability of each.
+    checkout_session_store: str = Field(default="sql")
+    checkout_session_flush_seconds: float = Field(default=1.0)
+    checkout_session_max_sessions: int = Field(default=10000)
+    
+    # Expired checkout sessions: deleted by one worker (leader lease) every
+    # interval, in batches (see app.services.session_sweeper)
+    checkout_sweeper_enabled: bool = Field(default=True)
+    checkout_sweeper_interval_seconds: float = Field(default=300.0)
+    checkout_sweeper_batch_size: int = Field(default=500)
+    checkout_sweeper_max_batches: int = Field(default=20)
+    
     # Stripe
     stripe_secret_key: str = Field(default="")
     stripe_publishable_key: str = Field(default="")
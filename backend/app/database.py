@@ -4,9 +4,10 @@ Database Configuration and Session Management
 Uses SQLAlchemy for ORM and database operations.
 """
 
+from contextlib import contextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from typing import Generator
+from typing import Generator, Iterator
 
 from app.config import settings
 
@@ -45,11 +46,82 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+_UNIT_OF_WORK = "unit_of_work_depth"
+
+
+@contextmanager
+def unit_of_work(db: Session, expire: bool = True) -> Iterator[Session]:
+    """
+    Group the writes of several services into one transaction.
+    
+    Inside the block, services calling commit() only flush; the block
+    commits once on exit, or rolls everything back if it raises. Blocks
+    may nest; the outermost one commits.
+    
+    Args:
+        db: Session to commit
+        expire: Expire loaded objects on commit (see commit())
+    
+    Example:
+        ```python
+        with unit_of_work(db):
+            order = order_service.create_order(session, payment_id)
+            session.status = "completed"
+        ```
+    """
+    depth = db.info.get(_UNIT_OF_WORK, 0)
+    db.info[_UNIT_OF_WORK] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            _commit(db, expire)
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info[_UNIT_OF_WORK] = depth
+
+
+def commit(db: Session, expire: bool = True) -> None:
+    """
+    Commit a service's writes, or only flush them inside a unit_of_work().
+    
+    Services call this instead of ``db.commit()`` so callers can combine
+    their writes into one transaction.
+    
+    Args:
+        db: Session to commit
+        expire: Expire loaded objects, so they are reloaded on next access
+            (the session default). Writers whose models read server-side
+            values back with RETURNING (eager_defaults) pass False to keep
+            using their objects without a reload.
+    """
+    if db.info.get(_UNIT_OF_WORK):
+        db.flush()
+    else:
+        _commit(db, expire)
+
+
+def _commit(db: Session, expire: bool) -> None:
+    previous = db.expire_on_commit
+    db.expire_on_commit = previous and expire
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = previous
+
+
 def init_db() -> None:
     """
     Initialize database by creating all tables.
     
-    This should be called on application startup.
+    This should be called on application startup. Also upgrades databases
+    created by older versions (see app.models.migrations).
     """
+    from app.models.migrations import upgrade_schema
+
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        upgrade_schema(connection)
 
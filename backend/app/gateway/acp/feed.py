@@ -0,0 +1,159 @@
+"""
+ACP Product Feed
+
+Translates catalog records into ACP product feed items and encodes them as
+NDJSON (one JSON object per line), optionally gzipped.
+
+The delta feed lists changes since a watermark instead of the whole
+catalog: an "upsert" line with the feed item of each changed product, a
+"delete" line (tombstone) for each deleted one, and a final "watermark" line
+with the position to request next. Every change line carries its own
+``updated_at`` and ``id``, so an interrupted transfer resumes from the last
+complete line.
+
+Encoding is incremental: lines are buffered into chunks of about
+``chunk_size`` bytes and each chunk is yielded (compressed) as soon as it
+is full, so a feed of any size streams in constant memory. Gzipped chunks
+end on a sync flush, so whatever a client has received decompresses up to
+the last line of the last chunk.
+"""
+
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from app.config import settings
+from app.models.product_record import ProductRecord
+from app.services.catalog_delta import CHANGE_UPSERT, CatalogDelta, CatalogDeltaEntry
+
+
+FEED_FORMAT_NDJSON = "ndjson"
+FEED_FORMAT_GZIP = "jsonl.gz"
+FEED_FORMATS = (FEED_FORMAT_NDJSON, FEED_FORMAT_GZIP)
+
+FEED_MEDIA_TYPES = {
+    FEED_FORMAT_NDJSON: "application/x-ndjson",
+    FEED_FORMAT_GZIP: "application/gzip",
+}
+
+
+def to_feed_item(record: ProductRecord) -> dict:
+    """
+    Convert a catalog record to an ACP product feed item.
+
+    Products that cannot be purchased are listed for discovery with
+    ``enable_checkout`` false.
+    """
+    images = list(record.images or [])
+    return {
+        "id": record.id,
+        "gtin": record.gtin,
+        "mpn": record.mpn,
+        "title": record.title,
+        "description": record.description,
+        "link": f"{settings.commerce_base_url}/products/{record.id}",
+        "brand": record.brand,
+        "product_category": record.category,
+        "price": f"{record.price:.2f} {record.currency}",
+        "availability": record.availability,
+        "image_link": images[0] if images else None,
+        "additional_image_link": images[1:],
+        "color": record.color,
+        "gender": record.gender,
+        "variants": list(record.variants or []),
+        "popularity_score": record.popularity_score,
+        "enable_search": True,
+        "enable_checkout": bool(record.is_buyable),
+    }
+
+
+def to_delta_line(change: CatalogDeltaEntry) -> dict:
+    """Convert a catalog change to a delta feed line."""
+    line = {"op": change.op, "id": change.id, "updated_at": change.changed_at}
+    if change.op == CHANGE_UPSERT:
+        line["item"] = to_feed_item(change.record)
+    else:
+        line["gtin"] = change.gtin
+    return line
+
+
+def encode_feed(
+    records: Iterable[ProductRecord],
+    feed_format: str = FEED_FORMAT_NDJSON,
+    chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Encode records as feed lines, chunk by chunk.
+
+    With ``jsonl.gz`` the chunks together form one gzip member; gzip files
+    made of several members (e.g., a resumed export appended to a partial
+    one) decompress as the concatenation of their contents.
+
+    Args:
+        records: Records in feed order
+        feed_format: "ndjson" or "jsonl.gz"
+        chunk_size: Approximate uncompressed bytes per chunk
+
+    Yields:
+        Encoded chunks
+
+    Raises:
+        ValueError: If feed_format is not supported
+    """
+    return _encode_lines((to_feed_item(record) for record in records), feed_format, chunk_size)
+
+
+def encode_delta(
+    delta: CatalogDelta,
+    feed_format: str = FEED_FORMAT_NDJSON,
+    chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Encode a catalog delta as delta feed lines, chunk by chunk.
+
+    The last line is ``{"op": "watermark", "updated_at": ..., "id": ...,
+    "has_more": ...}``; when ``has_more`` is true the limit cut the delta
+    short and the next request should follow immediately.
+
+    Raises:
+        ValueError: If feed_format is not supported
+    """
+    def lines():
+        for change in delta:
+            yield to_delta_line(change)
+        watermark = delta.watermark.to_dict() if delta.watermark else {"updated_at": None, "id": None}
+        yield {"op": "watermark", **watermark, "has_more": delta.has_more}
+
+    return _encode_lines(lines(), feed_format, chunk_size)
+
+
+def _encode_lines(items: Iterable[dict], feed_format: str, chunk_size: int) -> Iterator[bytes]:
+    if feed_format not in FEED_FORMATS:
+        raise ValueError(f"Unsupported feed format: {feed_format}")
+
+    # wbits=31: deflate in a gzip container
+    compressor = zlib.compressobj(wbits=31) if feed_format == FEED_FORMAT_GZIP else None
+
+    def emit(data: bytes) -> bytes:
+        if not compressor:
+            return data
+        # Sync flush: all lines sent so far decompress without the rest
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    buffer = []
+    buffered = 0
+    for item in items:
+        line = json.dumps(item, separators=(",", ":"), default=str).encode() + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            chunk = emit(b"".join(buffer))
+            buffer, buffered = [], 0
+            if chunk:
+                yield chunk
+
+    tail = b"".join(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
@@ -5,14 +5,18 @@ Implements the 5 required ACP endpoints.
 TODO: Add comprehensive tests
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from app.database import get_db
+from app.database import get_db, unit_of_work
+from app.gateway.acp.feed import FEED_FORMAT_GZIP, FEED_FORMATS, FEED_MEDIA_TYPES, encode_delta, encode_feed
+from app.services.catalog_delta import Watermark
 from app.services.checkout_service import CheckoutService
 from app.services.payment_service import PaymentService
 from app.services.order_service import OrderService
+from app.services.product_service import ProductNotFoundError, ProductService
 
 router = APIRouter(prefix="/acp/v1", tags=["ACP Protocol"])
 
@@ -30,17 +34,22 @@ async def create_checkout_session(
     try:
         checkout_service = CheckoutService(db)
         
-        # Extract items from line_items
+        # Convert GTINs (product or size-level variant) to product_ids in one query
+        line_items = request.get("line_items", [])
+        resolved = checkout_service.product_service.resolve_gtins(
+            item["gtin"] for item in line_items
+        )
+        
         items = []
-        for item in request.get("line_items", []):
-            # Convert GTIN to product_id (for POC, we'll search by GTIN)
-            from app.services.product_service import ProductService
-            product_service = ProductService(db)
-            product = product_service.get_by_gtin(item["gtin"])
+        for item in line_items:
+            if item["gtin"] not in resolved:
+                raise ProductNotFoundError(f"Product with GTIN '{item['gtin']}' not found")
+            product, variant = resolved[item["gtin"]]
             
             items.append({
                 "product_id": product.id,
-                "quantity": item["quantity"]
+                "quantity": item["quantity"],
+                "variant": variant.to_dict() if variant else None
             })
         
         # Create session
@@ -189,14 +198,10 @@ async def complete_checkout_session(
         if payment_intent["status"] != "succeeded":
             raise ValueError("Payment failed")
         
-        # Create order
-        order = order_service.create_order(session, payment_intent["id"])
-        
-        # Update session
-        session.status = "completed"
-        session.payment_token_id = payment_token
-        session.order_id = order.id
-        db.commit()
+        # Create order and complete session in one transaction
+        with unit_of_work(db, expire=False):
+            order = order_service.create_order(session, payment_intent["id"])
+            checkout_service.complete_session(session, payment_token, order.id)
         
         return {
             "id": session.id,
@@ -233,10 +238,7 @@ async def cancel_checkout_session(
     """
     try:
         checkout_service = CheckoutService(db)
-        session = checkout_service.get_session(session_id)
-        
-        session.status = "canceled"
-        db.commit()
+        session = checkout_service.cancel_session(session_id)
         
         return {
             "id": session.id,
@@ -279,3 +281,89 @@ async def delegate_payment(request: Dict):
     except Exception as e:
         raise HTTPException(status_code=400, detail={"code": "invalid", "message": str(e)})
 
+
+
+@router.get("/product_feed")
+async def product_feed(
+    format: str = Query("ndjson", description="ndjson or jsonl.gz"),
+    cursor: Optional[str] = Query(None, description="Resume after this product ID (last id received)"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the whole catalog as an ACP product feed.
+    
+    One product per line, ordered by product ID. The feed is streamed while
+    rows are read in batches, so it can be of any size. If a transfer is
+    interrupted, request again with ``cursor`` set to the ``id`` of the last
+    complete line.
+    """
+    if format not in FEED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "invalid", "message": f"Unsupported feed format: {format}"}
+        )
+    
+    # Rows are read a batch at a time while the response is sent; no read
+    # transaction stays open in between, so writers are not blocked
+    records = ProductService(db).iter_catalog(after=cursor, batch_size=batch_size)
+    headers = {}
+    if format == FEED_FORMAT_GZIP:
+        headers["Content-Disposition"] = 'attachment; filename="product_feed.jsonl.gz"'
+    
+    return StreamingResponse(
+        encode_feed(records, format),
+        media_type=FEED_MEDIA_TYPES[format],
+        headers=headers
+    )
+
+
+@router.get("/product_feed/changes")
+async def product_feed_changes(
+    updated_at: Optional[str] = Query(None, description="Watermark timestamp (ISO 8601); omit for every product"),
+    after_id: Optional[str] = Query(None, alias="id", description="Watermark product ID"),
+    format: str = Query("ndjson", description="ndjson or jsonl.gz"),
+    limit: Optional[int] = Query(None, ge=1, le=100000, description="Maximum number of changes"),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the products changed or deleted since a watermark.
+    
+    One change per line in change order: ``"op": "upsert"`` lines carry the
+    feed item, ``"op": "delete"`` lines (tombstones) the deleted ID and
+    GTIN. The last line is ``"op": "watermark"`` with the ``updated_at`` and
+    ``id`` to send next time, and ``has_more`` when ``limit`` was reached.
+    If a transfer is interrupted, request again with the ``updated_at`` and
+    ``id`` of the last complete line.
+    """
+    if format not in FEED_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "invalid", "message": f"Unsupported feed format: {format}"}
+        )
+    if after_id is not None and updated_at is None:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "invalid", "message": "id requires updated_at"}
+        )
+    
+    since = None
+    if updated_at is not None:
+        try:
+            since = Watermark.parse(updated_at, after_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"code": "invalid", "message": str(e)})
+    
+    # Changes are read a batch at a time while the response is sent; no read
+    # transaction stays open in between, so writers are not blocked
+    delta = ProductService(db).changes_since(since, limit=limit, batch_size=batch_size)
+    headers = {}
+    if format == FEED_FORMAT_GZIP:
+        headers["Content-Disposition"] = 'attachment; filename="product_feed_changes.jsonl.gz"'
+    
+    return StreamingResponse(
+        encode_delta(delta, format),
+        media_type=FEED_MEDIA_TYPES[format],
+        headers=headers
+    )
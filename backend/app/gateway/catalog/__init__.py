@@ -0,0 +1 @@
+"""Catalog REST Gateway."""
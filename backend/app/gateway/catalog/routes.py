@@ -0,0 +1,87 @@
+"""
+Catalog REST Endpoints
+
+Product search for storefronts and agents that do not speak MCP.
+"""
+
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.product_service import ProductService
+
+router = APIRouter(prefix="/catalog/v1", tags=["Catalog"])
+
+
+@router.get("/products/search")
+async def search_products(
+    q: str = Query("", description="Search keywords"),
+    category: Optional[str] = Query(None, description="Category path or name (includes subcategories)"),
+    price_min: Optional[Decimal] = Query(None, ge=0),
+    price_max: Optional[Decimal] = Query(None, ge=0),
+    availability: Optional[str] = Query(None, description="e.g., in_stock"),
+    gender: Optional[str] = Query(None, description="e.g., men, women, unisex"),
+    color: Optional[str] = Query(None, description="e.g., Black"),
+    buyable_only: bool = Query(False, description="Exclude products that cannot be purchased"),
+    limit: int = Query(20, ge=1, le=100),
+    sort: Optional[str] = Query(None, description="relevance or popularity"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    facets: bool = Query(False, description="Include facet counts over all matches"),
+    db: Session = Depends(get_db)
+):
+    """
+    Search products, one page at a time.
+
+    Returns the page of products, the cursor of the next page, the
+    typo-corrected query if ``q`` matched nothing as given and, with
+    ``facets=true``, counts per category, availability, price bucket, color
+    and gender over all matching products.
+    """
+    try:
+        page = ProductService(db).search_products_page(
+            query=q,
+            category=category,
+            price_min=price_min,
+            price_max=price_max,
+            availability=availability,
+            gender=gender,
+            color=color,
+            buyable_only=buyable_only,
+            limit=limit,
+            sort=sort,
+            cursor=cursor,
+            facets=facets
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"code": "invalid", "message": str(e)})
+
+    response = {
+        "products": [product.to_dict() for product in page.items],
+        "next_cursor": page.next_cursor,
+        "sort": page.sort,
+        "corrected_query": page.corrected_query,
+    }
+    if facets:
+        response["facets"] = page.facets
+    return response
+
+
+@router.get("/autocomplete")
+async def autocomplete(
+    q: str = Query(..., description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest product titles, brands and categories as the user types.
+
+    Served from memory; cheap enough to call on every keystroke.
+    """
+    completions = ProductService(db).autocomplete(q, limit=limit)
+    return {
+        "query": q,
+        "suggestions": [completion.to_dict() for completion in completions],
+    }
@@ -4,14 +4,24 @@ Main FastAPI Application
 Entry point for the Agentic Commerce POC backend.
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import init_db
+from app.database import init_db, engine
 from app.gateway.acp import routes as acp_routes
+from app.gateway.catalog import routes as catalog_routes
 from app.mcp import server as mcp_server
+from app.services.product_cache import get_product_cache
+from app.services.catalog_snapshot import get_catalog_engine
+from app.services.search_cache import get_search_cache
+from app.services.trigram_index import get_trigram_index
+from app.services.autocomplete import get_autocomplete_engine
+from app.services.session_store import close_session_stores, get_session_store
+from app.services.session_sweeper import get_session_sweeper
 
 
 @asynccontextmanager
@@ -19,9 +29,23 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     init_db()
+    trigram_index = get_trigram_index(engine)
+    if trigram_index is not None:
+        # Built off the request path; searches only read memory
+        trigram_index.warm_up()
+    sweeper = get_session_sweeper(engine)
+    sweep_task = asyncio.create_task(sweeper.run_forever()) if sweeper else None
     yield
     # Shutdown
-    pass
+    if sweep_task is not None:
+        sweep_task.cancel()
+        try:
+            await sweep_task
+        except asyncio.CancelledError:
+            pass
+        sweeper.release_lease()
+    # Write sessions still held by a write-behind store
+    close_session_stores()
 
 
 # Create FastAPI app
@@ -43,6 +67,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(acp_routes.router)
+app.include_router(catalog_routes.router)
 app.include_router(mcp_server.router)
 
 
@@ -57,6 +82,25 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process cache and background task metrics."""
+    product_cache = get_product_cache(engine)
+    catalog_engine = get_catalog_engine(engine)
+    search_cache = get_search_cache(engine)
+    trigram_index = get_trigram_index(engine)
+    sweeper = get_session_sweeper(engine)
+    return {
+        "product_cache": product_cache.stats() if product_cache else None,
+        "catalog_snapshot": catalog_engine.stats() if catalog_engine else None,
+        "search_cache": search_cache.stats() if search_cache else None,
+        "trigram_index": trigram_index.stats() if trigram_index else None,
+        "autocomplete": get_autocomplete_engine(engine).stats(),
+        "session_store": get_session_store(engine).stats(),
+        "session_sweeper": sweeper.stats() if sweeper else None
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -9,12 +9,20 @@ from typing import Dict, Any, List
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
-from app.services.product_service import ProductService, ProductNotFoundError
+from app.database import unit_of_work
+from app.services.product_service import ProductService, ProductNotFoundError, InvalidGTINError
 from app.services.checkout_service import CheckoutService
 from app.services.payment_service import PaymentService
 from app.services.order_service import OrderService
 
 
+# Product attributes search results are serialized with (only these columns are read)
+SEARCH_RESULT_FIELDS = ("gtin", "title", "description", "price", "currency", "category", "availability", "images")
+
+# Largest batch get_products_details accepts
+MAX_DETAILS_GTINS = 50
+
+
 class MCPHandlers:
     """Handlers for MCP tool invocations."""
     
@@ -25,22 +33,47 @@ class MCPHandlers:
         self.payment_service = PaymentService()
         self.order_service = OrderService(db)
     
-    async def search_products(self, query: str, category: str = None, price_max: float = None, limit: int = 10) -> List[Dict]:
+    async def search_products(
+        self,
+        query: str,
+        category: str = None,
+        price_max: float = None,
+        limit: int = 10,
+        sort: str = None,
+        cursor: str = None,
+        facets: bool = False,
+        gender: str = None,
+        color: str = None,
+        buyable_only: bool = False
+    ) -> Dict:
         """
         Search products tool handler.
         
-        Returns list of products matching search criteria.
+        Returns one page of products matching search criteria and the
+        cursor for the next page (None on the last page), plus facet
+        counts over all matches when requested. Queries that match nothing
+        are retried with typos corrected (reported as corrected_query).
         """
         price_max_decimal = Decimal(str(price_max)) if price_max else None
         
-        products = self.product_service.search_products(
-            query=query,
-            category=category,
-            price_max=price_max_decimal,
-            limit=limit
-        )
+        try:
+            page = self.product_service.search_products_page(
+                query=query,
+                category=category,
+                price_max=price_max_decimal,
+                gender=gender,
+                color=color,
+                buyable_only=bool(buyable_only),
+                limit=int(limit),
+                sort=sort,
+                cursor=cursor,
+                facets=bool(facets),
+                fields=SEARCH_RESULT_FIELDS
+            )
+        except ValueError as e:  # Bad sort, limit or cursor (InvalidCursorError)
+            return {"error": str(e)}
         
-        return [
+        products = [
             {
                 "gtin": p.gtin,
                 "title": p.title,
@@ -51,8 +84,19 @@ class MCPHandlers:
                 "availability": p.availability,
                 "images": p.images if p.images else []
             }
-            for p in products
+            for p in page.items
         ]
+        
+        result = {
+            "products": products,
+            "next_cursor": page.next_cursor,
+            "sort": page.sort
+        }
+        if page.corrected_query:
+            result["corrected_query"] = page.corrected_query
+        if facets:
+            result["facets"] = page.facets
+        return result
     
     async def get_product_details(self, gtin: str) -> Dict:
         """
@@ -62,36 +106,81 @@ class MCPHandlers:
         """
         try:
             product = self.product_service.get_by_gtin(gtin)
-            
-            return {
-                "gtin": product.gtin,
-                "id": product.id,
-                "title": product.title,
-                "description": product.description,
-                "price": float(product.price),
-                "currency": product.currency,
-                "brand": product.brand,
-                "category": product.category,
-                "availability": product.availability,
-                "images": product.images if product.images else [],
-                "variants": product.variants if product.variants else []
-            }
+            return self._product_details(product)
         except ProductNotFoundError as e:
             return {"error": str(e), "gtin": gtin}
     
+    async def get_products_details(self, gtins: List[str]) -> Dict:
+        """
+        Get details of several products tool handler.
+        
+        Looks up all GTINs with one query and returns their details in
+        request order. Invalid or unknown GTINs come back as per-item
+        errors; the rest of the batch is still returned.
+        """
+        if not isinstance(gtins, list) or not gtins:
+            return {"error": "gtins must be a non-empty list"}
+        if len(gtins) > MAX_DETAILS_GTINS:
+            return {"error": f"At most {MAX_DETAILS_GTINS} GTINs per call, got {len(gtins)}"}
+        
+        errors = []
+        for gtin in gtins:
+            try:
+                if not isinstance(gtin, str):
+                    raise InvalidGTINError(f"GTIN must be a string, got: {gtin!r}")
+                self.product_service.validate_gtin(gtin)
+                errors.append(None)
+            except InvalidGTINError as e:
+                errors.append(str(e))
+        
+        # One query for the whole batch
+        resolved = self.product_service.get_many_by_gtin(
+            gtin for gtin, error in zip(gtins, errors) if error is None
+        )
+        
+        products = []
+        for gtin, error in zip(gtins, errors):
+            if error is None and gtin in resolved:
+                products.append(self._product_details(resolved[gtin]))
+            else:
+                products.append({"gtin": gtin, "error": error or f"Product with GTIN '{gtin}' not found"})
+        return {"products": products}
+    
+    @staticmethod
+    def _product_details(product) -> Dict:
+        """Serialize a product for the details tools."""
+        return {
+            "gtin": product.gtin,
+            "id": product.id,
+            "title": product.title,
+            "description": product.description,
+            "price": float(product.price),
+            "currency": product.currency,
+            "brand": product.brand,
+            "category": product.category,
+            "availability": product.availability,
+            "images": product.images if product.images else [],
+            "variants": product.variants if product.variants else []
+        }
+    
     async def create_checkout(self, items: List[Dict], buyer_email: str = None) -> Dict:
         """
         Create checkout tool handler.
         
         Creates a checkout session and returns session details.
         """
-        # Convert items to internal format
+        # Convert items to internal format (whole cart in one query)
+        resolved = self.product_service.resolve_gtins(item["gtin"] for item in items)
+        
         internal_items = []
         for item in items:
-            product = self.product_service.get_by_gtin(item["gtin"])
+            if item["gtin"] not in resolved:
+                raise ProductNotFoundError(f"Product with GTIN '{item['gtin']}' not found")
+            product, variant = resolved[item["gtin"]]
             internal_items.append({
                 "product_id": product.id,
-                "quantity": item["quantity"]
+                "quantity": item["quantity"],
+                "variant": variant.to_dict() if variant else None
             })
         
         buyer_info = None
@@ -176,14 +265,10 @@ class MCPHandlers:
                 "message": "Payment was declined. Please check payment details."
             }
         
-        # Create order
-        order = self.order_service.create_order(session, payment_intent["id"])
-        
-        # Update session
-        session.status = "completed"
-        session.payment_token_id = payment_token
-        session.order_id = order.id
-        self.db.commit()
+        # Create order and complete session in one transaction
+        with unit_of_work(self.db, expire=False):
+            order = self.order_service.create_order(session, payment_intent["id"])
+            self.checkout_service.complete_session(session, payment_token, order.id)
         
         return {
             "success": True,
@@ -114,6 +114,9 @@ async def handle_tools_call(request: JSONRPCRequest, db: Session) -> JSONRPCResp
         elif tool_name == "get_product_details":
             result = await handlers.get_product_details(**arguments)
         
+        elif tool_name == "get_products_details":
+            result = await handlers.get_products_details(**arguments)
+        
         elif tool_name == "create_checkout":
             result = await handlers.create_checkout(**arguments)
         
@@ -18,7 +18,7 @@ def get_tools() -> List[ToolSchema]:
     return [
         ToolSchema(
             name="search_products",
-            description="Search products by keywords, category, or price range. Returns a list of matching products with details.",
+            description="Search products by keywords, category, or price range. Returns a page of matching products with details and a next_cursor for fetching the next page. Misspelled keywords are corrected when nothing matches (see corrected_query in the result); no need to retry with alternative spellings.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -35,10 +35,37 @@ def get_tools() -> List[ToolSchema]:
                         "type": "number",
                         "description": "Maximum price filter in USD"
                     },
+                    "gender": {
+                        "type": "string",
+                        "description": "Filter by gender (e.g., 'men', 'women', 'unisex')"
+                    },
+                    "color": {
+                        "type": "string",
+                        "description": "Filter by color (e.g., 'Black', 'White')"
+                    },
+                    "buyable_only": {
+                        "type": "boolean",
+                        "description": "Only return products that can be purchased through this channel",
+                        "default": False
+                    },
                     "limit": {
                         "type": "number",
                         "description": "Maximum number of results to return",
                         "default": 10
+                    },
+                    "sort": {
+                        "type": "string",
+                        "description": "Result order: 'relevance' (default for keyword searches) or 'popularity'",
+                        "enum": ["relevance", "popularity"]
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor from a previous call with the same arguments, to fetch the next page"
+                    },
+                    "facets": {
+                        "type": "boolean",
+                        "description": "Also return counts of all matching products by category, availability, price range, color and gender",
+                        "default": False
                     }
                 },
                 "required": ["query"]
@@ -61,6 +88,24 @@ def get_tools() -> List[ToolSchema]:
             }
         ),
         
+        ToolSchema(
+            name="get_products_details",
+            description="Get detailed information about several products at once, e.g. to compare them. Takes up to 50 GTINs and returns details in the same order; unknown or invalid GTINs come back as items with an error instead of failing the call.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "gtins": {
+                        "type": "array",
+                        "description": "Product GTINs (8-14 digit numbers)",
+                        "items": {"type": "string", "pattern": "^[0-9]{8,14}$"},
+                        "minItems": 1,
+                        "maxItems": 50
+                    }
+                },
+                "required": ["gtins"]
+            }
+        ),
+        
         ToolSchema(
             name="create_checkout",
             description="Create a checkout session with selected products. Returns a session ID and initial pricing.",
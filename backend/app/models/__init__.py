@@ -5,14 +5,26 @@ SQLAlchemy ORM models for the application.
 """
 
 from app.models.product import Product
+from app.models.product_variant import ProductVariant
+from app.models.product_tombstone import ProductTombstone
+from app.models.category import Category, CategoryClosure, ProductCategory
 from app.models.checkout_session import CheckoutSession
 from app.models.order import Order
 from app.models.order_event import OrderEvent
+from app.models.maintenance_lease import MaintenanceLease
+from app.models import product_search  # noqa: F401  (registers FTS5 DDL)
+from app.models import buyability  # noqa: F401  (registers write-time buyability rules)
 
 __all__ = [
     "Product",
+    "ProductVariant",
+    "ProductTombstone",
+    "Category",
+    "CategoryClosure",
+    "ProductCategory",
     "CheckoutSession",
     "Order",
     "OrderEvent",
+    "MaintenanceLease",
 ]
 
@@ -0,0 +1,126 @@
+"""
+Product Buyability
+
+Rules deciding whether a product can be purchased through agentic
+channels, evaluated when a product is written and stored on the row
+(``Product.is_buyable`` / ``Product.buyability_reason``).
+
+Storing the outcome lets search drop non-buyable products with an indexed
+filter and lets checkout read a flag instead of re-scanning titles and
+categories on every call. After changing the rules, run
+``scripts/recompute_buyability.py`` (or ``recompute_buyability``) to
+re-evaluate existing products.
+"""
+
+from typing import Optional
+
+from sqlalchemy import select, update, bindparam, event
+from sqlalchemy.engine import Connection
+
+from app.models.product import Product
+
+
+# Reason codes stored in Product.buyability_reason
+OUT_OF_STOCK = "out_of_stock"
+GIFT_CARD = "gift_card"
+CUSTOMIZABLE = "customizable"
+
+BUYABILITY_MESSAGES = {
+    OUT_OF_STOCK: "Product is out of stock",
+    GIFT_CARD: "Gift cards cannot be purchased through this channel",
+    CUSTOMIZABLE: "Customizable products (Nike By You) cannot be purchased through this channel",
+}
+
+
+def evaluate_buyability(
+    availability: Optional[str],
+    title: Optional[str],
+    category: Optional[str],
+    metadata: Optional[dict]
+) -> Optional[str]:
+    """
+    Apply the buyability rules to a product's attributes.
+
+    Rules, in order:
+    - Product must be in stock
+    - No gift cards
+    - No Nike By You (customizable products)
+
+    Returns:
+        Reason code of the first rule that fails, or None if buyable
+    """
+    if availability != "in_stock":
+        return OUT_OF_STOCK
+
+    category = (category or "").lower()
+    title = (title or "").lower()
+
+    if "gift card" in category or "gift card" in title:
+        return GIFT_CARD
+
+    if "customizable" in category or (metadata or {}).get("customizable"):
+        return CUSTOMIZABLE
+
+    return None
+
+
+def buyability_message(reason: Optional[str]) -> Optional[str]:
+    """Human-readable message for a reason code."""
+    if reason is None:
+        return None
+    return BUYABILITY_MESSAGES.get(reason, "Product cannot be purchased through this channel")
+
+
+def apply_buyability(product: Product) -> None:
+    """Evaluate the rules for a Product instance and store the outcome on it."""
+    reason = evaluate_buyability(
+        product.availability, product.title, product.category, product.product_metadata
+    )
+    product.is_buyable = reason is None
+    product.buyability_reason = reason
+
+
+def recompute_buyability(connection: Connection, batch_size: int = 1000) -> int:
+    """
+    Re-evaluate every product and store the changed outcomes.
+
+    Used after rule changes and by schema upgrades and bulk loads, which
+    bypass the ORM events.
+
+    Returns:
+        Number of products whose stored outcome changed
+    """
+    table = Product.__table__
+    result = connection.execution_options(yield_per=batch_size).execute(
+        select(
+            table.c.id, table.c.availability, table.c.title, table.c.category,
+            table.c.product_metadata, table.c.is_buyable, table.c.buyability_reason
+        )
+    )
+
+    changes = []
+    for partition in result.partitions():
+        for product_id, availability, title, category, metadata, is_buyable, stored_reason in partition:
+            reason = evaluate_buyability(availability, title, category, metadata)
+            if reason != stored_reason or bool(is_buyable) != (reason is None):
+                changes.append({"product_id": product_id, "buyable": reason is None, "reason": reason})
+
+    # Written after the read cursor is exhausted
+    for start in range(0, len(changes), batch_size):
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam("product_id"))
+            .values(is_buyable=bindparam("buyable"), buyability_reason=bindparam("reason")),
+            changes[start:start + batch_size]
+        )
+    return len(changes)
+
+
+@event.listens_for(Product, "before_insert")
+def _evaluate_inserted_product(mapper, connection, target):
+    apply_buyability(target)
+
+
+@event.listens_for(Product, "before_update")
+def _evaluate_updated_product(mapper, connection, target):
+    apply_buyability(target)
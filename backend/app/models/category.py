@@ -0,0 +1,339 @@
+"""
+Category Models
+
+Materialized category tree derived from ``Product.category`` paths.
+
+``Product.category`` stores a path such as ``"Shoes > Running > Sneakers"``.
+Every path and each of its prefixes becomes a Category node, the closure
+table lists every (ancestor, descendant) pair, and each product is mapped to
+its leaf node. Filtering by a category is then an indexed join that includes
+all descendants, and ``Category.product_count`` (products in the subtree) is
+adjusted incrementally on every product write.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import (
+    Column, Integer, String, ForeignKey, Index, event, select, delete, insert, update, func, or_
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.attributes import get_history
+
+from app.database import Base
+from app.models.product import Product
+
+
+CATEGORY_SEPARATOR = " > "
+
+
+class Category(Base):
+    """
+    Node of the category tree.
+
+    Attributes:
+        id: Surrogate key
+        parent_id: Parent node (None for top-level categories)
+        path: Full display path (e.g., "Shoes > Running")
+        path_key: Lowercase path used for lookups (unique)
+        name: Last path segment (e.g., "Running")
+        name_key: Lowercase name used for lookups
+        depth: 0 for top-level categories
+        product_count: Products in this category or any descendant
+    """
+
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    parent_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    path = Column(String(200), nullable=False)
+    path_key = Column(String(200), unique=True, nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    name_key = Column(String(100), nullable=False, index=True)
+    depth = Column(Integer, nullable=False, default=0)
+    product_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<Category(path='{self.path}', product_count={self.product_count})>"
+
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return {
+            "path": self.path,
+            "name": self.name,
+            "depth": self.depth,
+            "product_count": self.product_count,
+        }
+
+
+class CategoryClosure(Base):
+    """
+    Ancestor/descendant pair of the category tree (including each node with itself).
+
+    Attributes:
+        ancestor_id: Ancestor node
+        descendant_id: Descendant node
+        distance: Number of levels between them (0 for the self pair)
+    """
+
+    __tablename__ = "category_closure"
+    __table_args__ = (
+        Index("ix_category_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    distance = Column(Integer, nullable=False, default=0)
+
+
+class ProductCategory(Base):
+    """
+    Product-to-category mapping (the leaf node of ``Product.category``).
+
+    Attributes:
+        product_id: Product
+        category_id: Category node
+    """
+
+    __tablename__ = "product_categories"
+
+    product_id = Column(String(100), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
+
+
+# ============================================================================
+# Path Helpers
+# ============================================================================
+
+def split_category_path(path: Optional[str]) -> List[str]:
+    """
+    Split a category path into its segments.
+
+    Example:
+        >>> split_category_path("Shoes >Running > Sneakers ")
+        ['Shoes', 'Running', 'Sneakers']
+    """
+    if not path:
+        return []
+    return [segment.strip() for segment in path.split(">") if segment.strip()]
+
+
+def category_key(path: Optional[str]) -> str:
+    """Normalized lowercase lookup key of a category path or name."""
+    return CATEGORY_SEPARATOR.join(split_category_path(path)).lower()
+
+
+def category_matches(path: Optional[str], category: str) -> bool:
+    """
+    Check whether a product category path falls under a category filter.
+
+    Same semantics as category_filter(): ``category`` names either a full
+    path ("Shoes > Running") or a single node name ("Running"), and matches
+    that node and all of its descendants.
+    """
+    segments = [segment.lower() for segment in split_category_path(path)]
+    key = category_key(category)
+    if not segments or not key:
+        return False
+    if CATEGORY_SEPARATOR in key:
+        prefix = split_category_path(key)
+        return segments[:len(prefix)] == prefix
+    return key in segments
+
+
+def category_filter(category: str):
+    """
+    Build a subquery of product IDs in a category and its descendants.
+
+    Args:
+        category: Full category path or the name of any node
+
+    Returns:
+        Selectable of ``product_categories.product_id``
+
+    Example:
+        >>> query.filter(Product.id.in_(category_filter("Running")))
+    """
+    key = category_key(category)
+    roots = select(Category.id).where(or_(Category.path_key == key, Category.name_key == key))
+    return (
+        select(ProductCategory.product_id)
+        .join(CategoryClosure, CategoryClosure.descendant_id == ProductCategory.category_id)
+        .where(CategoryClosure.ancestor_id.in_(roots))
+    )
+
+
+# ============================================================================
+# Tree Maintenance
+# ============================================================================
+
+def ensure_category_path(connection: Connection, path: Optional[str]) -> Optional[int]:
+    """
+    Create the nodes of a category path that do not exist yet.
+
+    Args:
+        connection: Open connection (e.g., of the flush in progress)
+        path: Category path
+
+    Returns:
+        ID of the leaf node, or None for an empty path
+    """
+    categories = Category.__table__
+    closure = CategoryClosure.__table__
+
+    parent_id = None
+    segments = split_category_path(path)
+    for depth, name in enumerate(segments):
+        node_path = CATEGORY_SEPARATOR.join(segments[:depth + 1])
+        node_id = connection.execute(
+            select(categories.c.id).where(categories.c.path_key == node_path.lower())
+        ).scalar()
+
+        if node_id is None:
+            node_id = connection.execute(
+                insert(categories).values(
+                    parent_id=parent_id,
+                    path=node_path,
+                    path_key=node_path.lower(),
+                    name=name,
+                    name_key=name.lower(),
+                    depth=depth,
+                    product_count=0
+                )
+            ).inserted_primary_key[0]
+
+            ancestors = [{"ancestor_id": node_id, "descendant_id": node_id, "distance": 0}]
+            if parent_id is not None:
+                ancestors += [
+                    {"ancestor_id": ancestor_id, "descendant_id": node_id, "distance": distance + 1}
+                    for ancestor_id, distance in connection.execute(
+                        select(closure.c.ancestor_id, closure.c.distance)
+                        .where(closure.c.descendant_id == parent_id)
+                    )
+                ]
+            connection.execute(insert(closure), ancestors)
+
+        parent_id = node_id
+
+    return parent_id
+
+
+def _adjust_product_counts(connection: Connection, category_id: int, delta: int) -> None:
+    """Add ``delta`` to the product count of a node and all of its ancestors."""
+    closure = CategoryClosure.__table__
+    categories = Category.__table__
+    connection.execute(
+        update(categories)
+        .where(categories.c.id.in_(
+            select(closure.c.ancestor_id).where(closure.c.descendant_id == category_id)
+        ))
+        .values(product_count=categories.c.product_count + delta)
+    )
+
+
+def sync_product_category(connection: Connection, product_id: str, path: Optional[str]) -> None:
+    """
+    Map one product to the leaf node of its category path.
+
+    Args:
+        connection: Connection of the flush in progress
+        product_id: Product
+        path: New ``Product.category`` value (None removes the mapping)
+    """
+    mapping = ProductCategory.__table__
+
+    current_id = connection.execute(
+        select(mapping.c.category_id).where(mapping.c.product_id == product_id)
+    ).scalar()
+    new_id = ensure_category_path(connection, path)
+
+    if current_id == new_id:
+        return
+
+    if current_id is not None:
+        _adjust_product_counts(connection, current_id, -1)
+        connection.execute(delete(mapping).where(mapping.c.product_id == product_id))
+
+    if new_id is not None:
+        connection.execute(insert(mapping).values(product_id=product_id, category_id=new_id))
+        _adjust_product_counts(connection, new_id, 1)
+
+
+def rebuild_categories(connection: Connection, batch_size: int = 1000) -> int:
+    """
+    Rebuild the category tree, mappings and counts from ``products``.
+
+    Used by schema upgrades and bulk loads, which bypass the ORM events.
+
+    Returns:
+        Number of products mapped to a category
+    """
+    connection.execute(delete(ProductCategory.__table__))
+    connection.execute(delete(CategoryClosure.__table__))
+    connection.execute(delete(Category.__table__))
+
+    products = Product.__table__
+    result = connection.execution_options(yield_per=batch_size).execute(
+        select(products.c.id, products.c.category).where(products.c.category.isnot(None))
+    )
+
+    leaf_ids = {}
+    mapped = 0
+    for partition in result.partitions():
+        rows = []
+        for product_id, path in partition:
+            key = category_key(path)
+            if not key:
+                continue
+            if key not in leaf_ids:
+                leaf_ids[key] = ensure_category_path(connection, path)
+            rows.append({"product_id": product_id, "category_id": leaf_ids[key]})
+        if rows:
+            connection.execute(insert(ProductCategory.__table__), rows)
+            mapped += len(rows)
+
+    _recount_categories(connection)
+    return mapped
+
+
+def _recount_categories(connection: Connection) -> None:
+    """Recompute every subtree product count with one aggregate query."""
+    categories = Category.__table__
+    closure = CategoryClosure.__table__
+    mapping = ProductCategory.__table__
+
+    subtree_count = (
+        select(func.count(mapping.c.product_id))
+        .select_from(closure.join(mapping, mapping.c.category_id == closure.c.descendant_id))
+        .where(closure.c.ancestor_id == categories.c.id)
+        .scalar_subquery()
+    )
+    connection.execute(update(categories).values(product_count=subtree_count))
+
+
+def ensure_categories(connection: Connection) -> None:
+    """Backfill the category tree on databases created before it existed."""
+    if connection.execute(select(func.count()).select_from(ProductCategory.__table__)).scalar():
+        return
+
+    has_categories = connection.execute(
+        select(Product.__table__.c.id).where(Product.__table__.c.category.isnot(None)).limit(1)
+    ).first()
+    if has_categories:
+        rebuild_categories(connection)
+
+
+@event.listens_for(Product, "after_insert")
+def _map_inserted_category(mapper, connection, target):
+    if target.category:
+        sync_product_category(connection, target.id, target.category)
+
+
+@event.listens_for(Product, "after_update")
+def _map_updated_category(mapper, connection, target):
+    if get_history(target, "category").has_changes():
+        sync_product_category(connection, target.id, target.category)
+
+
+@event.listens_for(Product, "after_delete")
+def _unmap_deleted_category(mapper, connection, target):
+    sync_product_category(connection, target.id, None)
@@ -4,7 +4,7 @@ Checkout Session Model
 Represents a checkout session for the Agentic Commerce Protocol.
 """
 
-from sqlalchemy import Column, String, JSON, DateTime, Text
+from sqlalchemy import Column, String, JSON, DateTime, Text, Index
 from sqlalchemy.sql import func
 from datetime import datetime, timedelta
 from app.database import Base
@@ -47,7 +47,7 @@ class CheckoutSession(Base):
     currency = Column(String(3), nullable=False, default="USD")
     
     # Cart items
-    line_items = Column(JSON, nullable=False)  # List of {gtin, quantity, unit_price, total}
+    line_items = Column(JSON, nullable=False)  # List of {gtin, quantity, unit_price, unit_amount (cents), total}
     
     # Fulfillment information
     fulfillment_address = Column(JSON, nullable=True)  # {name, address_line_1, city, state, zip, country}
@@ -74,6 +74,15 @@ class CheckoutSession(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        # Expiry sweeper: expired sessions per status (app.services.session_sweeper)
+        Index("ix_checkout_sessions_status_expires_at", status, expires_at),
+    )
+    
+    # Read server-generated timestamps back with INSERT/UPDATE ... RETURNING
+    # instead of a SELECT after commit
+    __mapper_args__ = {"eager_defaults": True}
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if not self.expires_at:
@@ -0,0 +1,65 @@
+"""
+GTIN Normalization
+
+GTIN-8, UPC-A (12 digits), EAN-13 and GTIN-14 numbers for the same item
+differ only in leading zeros. Left-padded to 14 digits they become a single
+canonical GTIN-14, which is what product and variant lookups match on.
+
+Only numbers with a valid GS1 check digit are normalized. Anything else
+(typos, internal codes) has no canonical form and is matched exactly as
+given.
+"""
+
+from typing import Optional
+
+
+GTIN_LENGTHS = (8, 12, 13, 14)
+
+
+def gtin_check_digit(payload: str) -> int:
+    """
+    GS1 mod-10 check digit for a GTIN without its last digit.
+
+    Digits are weighted 3, 1, 3, ... from the right.
+    """
+    total = sum(int(digit) * (3 if position % 2 == 0 else 1) for position, digit in enumerate(reversed(payload)))
+    return (10 - total % 10) % 10
+
+
+def canonical_gtin(gtin: str) -> Optional[str]:
+    """
+    Canonical GTIN-14 of a GTIN-8, UPC-A, EAN-13 or GTIN-14.
+
+    Returns:
+        The number zero-padded to 14 digits, or None if it is not a GTIN
+        of a standard length with a valid check digit
+
+    Example:
+        >>> canonical_gtin("012345678905")  # UPC-A
+        '00012345678905'
+        >>> canonical_gtin("012345678900")  # Wrong check digit
+    """
+    if not isinstance(gtin, str) or not gtin.isdigit() or len(gtin) not in GTIN_LENGTHS:
+        return None
+    if gtin_check_digit(gtin[:-1]) != int(gtin[-1]):
+        return None
+    return gtin.zfill(14)
+
+
+def canonical_gtin_sql(column: str) -> str:
+    """
+    SQLite expression computing canonical_gtin() of a text column.
+
+    Used for the generated ``gtin14`` columns, so the canonical form is
+    indexed without being written by every code path that stores a GTIN.
+    Digits missing on the left of short GTINs are read as '' (zero).
+    """
+    weighted = " + ".join(
+        f"substr({column}, {-position - 1}, 1) * {3 if position % 2 else 1}"
+        for position in range(1, 14)
+    )
+    return (
+        f"CASE WHEN {column} NOT GLOB '*[^0-9]*' AND length({column}) IN {GTIN_LENGTHS} "
+        f"AND (10 - ({weighted}) % 10) % 10 = CAST(substr({column}, -1) AS INTEGER) "
+        f"THEN substr('0000000000000' || {column}, -14) END"
+    )
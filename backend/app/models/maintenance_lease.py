@@ -0,0 +1,33 @@
+"""
+Maintenance Lease Model
+
+Leader election for background maintenance shared by several app workers.
+"""
+
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+
+
+class MaintenanceLease(Base):
+    """
+    Time-limited claim on a maintenance task.
+
+    The worker whose row is unexpired is the task's leader; it renews the
+    lease on every run. Other workers take over once the lease lapses
+    (e.g., the leader crashed) or is released.
+
+    Attributes:
+        name: Task the lease is for (e.g., "checkout_session_sweeper")
+        holder: Worker holding the lease (host, PID and a random suffix)
+        expires_at: When the lease lapses unless renewed (UTC)
+    """
+
+    __tablename__ = "maintenance_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<MaintenanceLease(name='{self.name}', holder='{self.holder}')>"
@@ -0,0 +1,128 @@
+"""
+Schema Migrations
+
+Idempotent upgrades for databases created by an older version of the app.
+
+``Base.metadata.create_all`` only creates missing tables; it never adds
+indexes, triggers or derived data to tables that already exist. Each step
+here checks for what it needs and backfills it, so ``upgrade_schema`` is
+safe to run on every startup.
+"""
+
+import logging
+from typing import Optional, Set
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from app.models.checkout_session import CheckoutSession
+from app.models.product import Product
+from app.models.buyability import recompute_buyability
+from app.models.product_search import ensure_product_search_index
+from app.models.product_variant import ProductVariant, ensure_product_variants
+from app.models.category import ensure_categories
+from app.models.product_tombstone import create_tombstone_triggers
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_product_columns(connection: Connection) -> Set[str]:
+    """
+    Add missing columns to products and product_variants.
+
+    Generated columns are VIRTUAL (the only kind SQLite can add to an
+    existing table), so no rows need to be rewritten. Stored columns must
+    be nullable or have a server default.
+
+    Returns:
+        Names of the product columns added
+    """
+    if connection.dialect.name != "sqlite":
+        return set()
+
+    added = _add_missing_columns(connection, Product.__table__)
+    _add_missing_columns(connection, ProductVariant.__table__)
+    return added
+
+
+def _add_missing_columns(connection: Connection, table: Table) -> Set[str]:
+    # table_info hides generated columns; table_xinfo lists them
+    existing = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_xinfo({table.name})")}
+
+    added = set()
+    for column in table.columns:
+        if column.name not in existing:
+            definition = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+            added.add(column.name)
+
+    return added
+
+
+def ensure_product_indexes(connection: Connection) -> None:
+    """Create product and variant indexes missing from the database (e.g., ones added to existing columns)."""
+    ensure_unique_gtin14(connection)
+    for table in (Product.__table__, ProductVariant.__table__):
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def ensure_unique_gtin14(connection: Connection) -> None:
+    """
+    Replace the non-unique gtin14 indexes of older databases with unique ones.
+
+    Products already sharing a canonical GTIN (e.g., loaded once as UPC-A
+    and once as EAN-13) are left alone and the old ``ix_products_gtin14``
+    kept; they are logged so they can be merged by hand. Variant rows are
+    derived data: of variants sharing a canonical GTIN, the one written
+    last is kept, as sync_product_variants() would have done.
+    """
+    if _index_is_unique(connection, "products", "ix_products_gtin14") is False:
+        duplicates = connection.exec_driver_sql(
+            "SELECT gtin14, group_concat(id, ', ') FROM products WHERE gtin14 IS NOT NULL "
+            "GROUP BY gtin14 HAVING count(*) > 1"
+        ).all()
+        for gtin14, product_ids in duplicates:
+            logger.warning("Products %s share GTIN %s; ix_products_gtin14 stays non-unique", product_ids, gtin14)
+        if not duplicates:
+            connection.exec_driver_sql("DROP INDEX ix_products_gtin14")
+
+    if _index_is_unique(connection, "product_variants", "ix_product_variants_gtin14") is False:
+        removed = connection.exec_driver_sql(
+            "DELETE FROM product_variants WHERE gtin14 IS NOT NULL AND id NOT IN "
+            "(SELECT max(id) FROM product_variants WHERE gtin14 IS NOT NULL GROUP BY gtin14)"
+        ).rowcount
+        if removed:
+            logger.warning("Removed %d variants whose GTIN another variant spells differently", removed)
+        connection.exec_driver_sql("DROP INDEX ix_product_variants_gtin14")
+
+
+def _index_is_unique(connection: Connection, table: str, index: str) -> Optional[bool]:
+    """Whether an index is unique, or None if it does not exist (the caller creates it)."""
+    indexes = {row[1]: bool(row[2]) for row in connection.exec_driver_sql(f"PRAGMA index_list({table})")}
+    return indexes.get(index)
+
+
+def ensure_checkout_session_indexes(connection: Connection) -> None:
+    """Create checkout session indexes missing from the database."""
+    for index in CheckoutSession.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """
+    Bring an existing database up to the current schema.
+
+    Args:
+        connection: Open connection inside a transaction
+    """
+    added = ensure_product_columns(connection)
+    ensure_product_indexes(connection)
+    ensure_checkout_session_indexes(connection)
+    if "is_buyable" in added:
+        recompute_buyability(connection)
+    ensure_product_search_index(connection)
+    ensure_product_variants(connection)
+    ensure_categories(connection)
+    create_tombstone_triggers(connection)
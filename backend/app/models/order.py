@@ -71,6 +71,10 @@ class Order(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Read server-generated timestamps back with INSERT/UPDATE ... RETURNING
+    # instead of a SELECT after commit
+    __mapper_args__ = {"eager_defaults": True}
+    
     def __repr__(self):
         return f"<Order(id='{self.id}', status='{self.status}')>"
     
@@ -4,9 +4,10 @@ Product Model
 Represents a Nike product in the catalog.
 """
 
-from sqlalchemy import Column, String, Numeric, JSON, DateTime, Text
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Numeric, JSON, DateTime, Text, Float, Boolean, Computed, Index
+from sqlalchemy.sql import func, true
 from app.database import Base
+from app.models.gtin import canonical_gtin_sql
 
 
 class Product(Base):
@@ -16,6 +17,8 @@ class Product(Base):
     Attributes:
         id: Internal product ID
         gtin: Global Trade Item Number (8-14 digits)
+        gtin14: Canonical GTIN-14 of ``gtin`` (None without a valid check
+            digit; see app.models.gtin)
         mpn: Manufacturer Part Number (Nike product code)
         title: Product title (max 150 chars)
         description: Product description (max 5000 chars)
@@ -27,6 +30,21 @@ class Product(Base):
         availability: Stock status ("in_stock", "out_of_stock")
         variants: Product variants (JSON list of size/color options)
         product_metadata: Additional product metadata (JSON)
+        popularity_score: product_metadata["popularity_score"] (0 if missing)
+        gender: product_metadata["gender"] (case-insensitive)
+        color: product_metadata["color"] (case-insensitive)
+        customizable: product_metadata["customizable"] (False if missing)
+        is_buyable: Whether the product can be purchased through agentic channels
+        buyability_reason: Reason code when not buyable (e.g., "gift_card")
+    
+    ``gtin14`` and the four metadata fields are virtual generated columns:
+    SQLite computes them from ``gtin`` and ``product_metadata`` on read and
+    keeps their indexes up to date on write, so filtering and sorting on
+    them never parses JSON per row. They are read-only; write ``gtin`` and
+    ``product_metadata`` instead.
+    
+    ``is_buyable`` and ``buyability_reason`` are evaluated whenever the
+    product is written (see app.models.buyability).
     """
     
     __tablename__ = "products"
@@ -35,6 +53,7 @@ class Product(Base):
     id = Column(String(100), primary_key=True, index=True)
     gtin = Column(String(14), unique=True, nullable=False, index=True)
     mpn = Column(String(50), nullable=True, index=True)
+    gtin14 = Column(String(14), Computed(canonical_gtin_sql("gtin"), persisted=False))
     
     # Product information
     title = Column(String(150), nullable=False)
@@ -58,10 +77,48 @@ class Product(Base):
     # Additional metadata (renamed from 'metadata' to avoid SQLAlchemy reserved name)
     product_metadata = Column(JSON, nullable=True)
     
+    # Hot metadata fields promoted to indexed generated columns
+    popularity_score = Column(
+        Float,
+        Computed(
+            "CAST(COALESCE(json_extract(product_metadata, '$.popularity_score'), 0) AS REAL)",
+            persisted=False
+        )
+    )
+    gender = Column(
+        String(20, collation="NOCASE"),
+        Computed("json_extract(product_metadata, '$.gender')", persisted=False),
+        index=True
+    )
+    color = Column(
+        String(50, collation="NOCASE"),
+        Computed("json_extract(product_metadata, '$.color')", persisted=False),
+        index=True
+    )
+    customizable = Column(
+        Boolean,
+        Computed("COALESCE(json_extract(product_metadata, '$.customizable'), 0) != 0", persisted=False),
+        index=True
+    )
+    
+    # Buyability (evaluated on write)
+    is_buyable = Column(Boolean, nullable=False, default=True, server_default=true(), index=True)
+    buyability_reason = Column(String(30), nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Popularity-ordered search and keyset pagination (popularity DESC, id)
+        Index("ix_products_popularity", popularity_score.desc(), id),
+        # Catalog delta feed: keyset scan of changes (updated_at, id)
+        Index("ix_products_updated_at_id", updated_at, id),
+        # One product per canonical GTIN (UPC-A and EAN-13 spellings of an
+        # item collide); GTINs without a valid check digit are keyed by gtin
+        Index("ix_products_gtin14", gtin14, unique=True, sqlite_where=gtin14.is_not(None)),
+    )
+    
     def __repr__(self):
         return f"<Product(id='{self.id}', gtin='{self.gtin}', title='{self.title}')>"
     
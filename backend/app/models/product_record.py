@@ -0,0 +1,177 @@
+"""
+Product Record
+
+Immutable, session-independent snapshot of a Product row.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import Column
+
+from app.models.product import Product
+
+
+# ============================================================================
+# Frozen JSON Containers
+# ============================================================================
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class FrozenDict(dict):
+    """Read-only dict. Still a dict, so it serializes and prints like one."""
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __hash__(self):
+        return hash(tuple(sorted(self.items())))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list. Still a list, so it serializes and prints like one."""
+
+    __setitem__ = __delitem__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __iadd__ = __imul__ = _immutable
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert JSON dicts and lists into frozen containers."""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+# ============================================================================
+# Product Record
+# ============================================================================
+
+@dataclass(frozen=True, slots=True)
+class ProductRecord:
+    """
+    Detached, read-only product with the same attributes as Product.
+
+    Safe to share between sessions and threads (e.g., from a cache). JSON
+    attributes (images, variants, product_metadata) are frozen containers;
+    mutating them raises TypeError. Records of a projected list (see
+    projection()) carry only some attributes.
+    """
+
+    id: str
+    gtin: str
+    mpn: Optional[str]
+    title: str
+    description: Optional[str]
+    brand: Optional[str]
+    category: Optional[str]
+    price: Decimal
+    currency: str
+    images: Optional[list]
+    availability: str
+    variants: Optional[list]
+    product_metadata: Optional[dict]
+    popularity_score: Optional[float]
+    gender: Optional[str]
+    color: Optional[str]
+    customizable: Optional[bool]
+    is_buyable: bool
+    buyability_reason: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_product(cls, product: Product) -> "ProductRecord":
+        """Snapshot a loaded Product instance."""
+        return cls(**{field.name: freeze(getattr(product, field.name)) for field in fields(cls)})
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any], projection: Optional[Tuple[str, ...]] = None) -> "ProductRecord":
+        """
+        Build a record from a ``products`` row selected with columns().
+
+        With a projection, only those attributes are set; reading any other
+        raises AttributeError rather than passing for a NULL column.
+        """
+        if projection is None:
+            return cls(**{field.name: freeze(row[field.name]) for field in fields(cls)})
+
+        record = object.__new__(cls)
+        for name in projection:
+            object.__setattr__(record, name, freeze(row[name]))
+        return record
+
+    @classmethod
+    def columns(cls, projection: Optional[Tuple[str, ...]] = None) -> List[Column]:
+        """``products`` columns needed by from_row()."""
+        table = Product.__table__
+        names = projection if projection is not None else [field.name for field in fields(cls)]
+        return [table.c[name] for name in names]
+
+    @classmethod
+    def projection(cls, names: Iterable[str]) -> Tuple[str, ...]:
+        """
+        Normalize attribute names to a projection for columns() and from_row().
+
+        The result is in declaration order and always includes ``id`` and
+        ``updated_at``, which list paths need for cursors and cache checks.
+
+        Raises:
+            ValueError: If a name is not a product attribute
+        """
+        wanted = set(names) | {"id", "updated_at"}
+        unknown = wanted - {field.name for field in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown product fields: {', '.join(sorted(unknown))}")
+        return tuple(field.name for field in fields(cls) if field.name in wanted)
+
+    def __repr__(self):
+        return f"<ProductRecord(id='{self.id}', gtin='{getattr(self, 'gtin', '?')}', title='{getattr(self, 'title', '?')}')>"
+
+    def to_dict(self):
+        """Convert record to dictionary (same shape as Product.to_dict)."""
+        return {
+            "id": self.id,
+            "gtin": self.gtin,
+            "mpn": self.mpn,
+            "title": self.title,
+            "description": self.description,
+            "brand": self.brand,
+            "category": self.category,
+            "price": float(self.price) if self.price else None,
+            "currency": self.currency,
+            "images": self.images,
+            "availability": self.availability,
+            "variants": self.variants,
+            "metadata": self.product_metadata,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
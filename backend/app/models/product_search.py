@@ -0,0 +1,232 @@
+"""
+Product Search Index
+
+SQLite FTS5 full-text index over the product catalog.
+
+The index is an external-content FTS5 table: it stores only the inverted
+index and reads column values back from ``products`` by rowid. Triggers on
+``products`` keep it in sync on every insert, update and delete, so nothing
+in the application writes to it directly.
+
+Note: ``VACUUM`` may renumber the implicit rowids of ``products`` (its primary
+key is a string). Run ``rebuild_product_search_index`` after vacuuming.
+"""
+
+import re
+import weakref
+import logging
+from typing import List, Optional
+
+from sqlalchemy import Table, Column, Integer, Float, Text, MetaData, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+
+PRODUCT_SEARCH_TABLE = "products_fts"
+
+# Standalone metadata so ``Base.metadata.create_all`` never tries to create
+# the virtual table as a regular table.
+_search_metadata = MetaData()
+
+products_fts = Table(
+    PRODUCT_SEARCH_TABLE,
+    _search_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column(PRODUCT_SEARCH_TABLE, Text),  # Hidden column used as MATCH target
+    Column("rank", Float),
+    Column("title", Text),
+    Column("description", Text),
+    Column("brand", Text),
+    Column("category", Text),
+)
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_SEARCH_TABLE} USING fts5(
+        title, description, brand, category,
+        content='products',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, title, description, brand, category)
+        VALUES (new.rowid, new.title, new.description, new.brand, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, title, description, brand, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.brand, old.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF title, description, brand, category ON products BEGIN
+        INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}, rowid, title, description, brand, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.brand, old.category);
+        INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, title, description, brand, category)
+        VALUES (new.rowid, new.title, new.description, new.brand, new.category);
+    END
+    """,
+]
+
+_DROP_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS products_fts_ai",
+    "DROP TRIGGER IF EXISTS products_fts_ad",
+    "DROP TRIGGER IF EXISTS products_fts_au",
+    f"DROP TABLE IF EXISTS {PRODUCT_SEARCH_TABLE}",
+]
+
+# Per-engine cache of whether the index exists (avoids a sqlite_master
+# lookup on every search).
+_availability: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")  # Word characters except "_", like unicode61
+
+
+# ============================================================================
+# Index Management
+# ============================================================================
+
+def create_product_search_index(connection: Connection) -> bool:
+    """
+    Create the FTS5 table and its sync triggers.
+
+    Args:
+        connection: Open database connection
+
+    Returns:
+        True if the index exists afterwards, False if FTS5 is unavailable
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    try:
+        for statement in _CREATE_STATEMENTS:
+            connection.exec_driver_sql(statement)
+    except OperationalError as e:
+        # SQLite builds without FTS5 raise "no such module: fts5"
+        logger.warning("Product search index unavailable, using ILIKE fallback: %s", e)
+        _availability[connection.engine] = False
+        return False
+
+    _availability[connection.engine] = True
+    return True
+
+
+def drop_product_search_index(connection: Connection) -> None:
+    """Drop the FTS5 table and its triggers."""
+    if connection.dialect.name != "sqlite":
+        return
+
+    for statement in _DROP_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    _availability[connection.engine] = False
+
+
+def drop_product_search_triggers(connection: Connection) -> None:
+    """
+    Stop keeping the index in sync, for bulk loads.
+
+    Call create_product_search_index and rebuild_product_search_index in the
+    same transaction afterwards.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    for statement in _DROP_STATEMENTS[:-1]:  # The triggers, not the table
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_product_search_index(connection: Connection) -> None:
+    """Rebuild the index from the current contents of ``products``."""
+    connection.exec_driver_sql(
+        f"INSERT INTO {PRODUCT_SEARCH_TABLE}({PRODUCT_SEARCH_TABLE}) VALUES ('rebuild')"
+    )
+
+
+def has_product_search_index(connection: Connection) -> bool:
+    """Check sqlite_master for the FTS5 table."""
+    if connection.dialect.name != "sqlite":
+        return False
+
+    row = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (PRODUCT_SEARCH_TABLE,)
+    ).first()
+    return row is not None
+
+
+def ensure_product_search_index(connection: Connection) -> bool:
+    """
+    Create and backfill the index on databases created before it existed.
+
+    Safe to call on every startup.
+    """
+    if has_product_search_index(connection):
+        _availability[connection.engine] = True
+        return True
+
+    if not create_product_search_index(connection):
+        return False
+
+    rebuild_product_search_index(connection)
+    return True
+
+
+def search_index_available(connection: Connection) -> bool:
+    """Return whether the FTS5 index can be used (cached per engine)."""
+    engine = connection.engine
+    if engine not in _availability:
+        _availability[engine] = has_product_search_index(connection)
+    return _availability[engine]
+
+
+# ============================================================================
+# Query Helpers
+# ============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens (same rules as the FTS5 index)."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def build_match_expression(query: str) -> Optional[str]:
+    """
+    Convert free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and terms are implicitly ANDed,
+    so "air max" matches "Nike Air Max 90". Quoting neutralises FTS5 syntax
+    characters in user input.
+
+    Returns:
+        MATCH expression, or None if the query has no indexable words
+
+    Example:
+        >>> build_match_expression("Air Max")
+        '"air"* "max"*'
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+# ============================================================================
+# Schema Events
+# ============================================================================
+
+@event.listens_for(Product.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_product_search_index(connection)
+
+
+@event.listens_for(Product.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    drop_product_search_index(connection)
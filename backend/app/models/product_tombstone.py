@@ -0,0 +1,77 @@
+"""
+Product Tombstone Model
+
+Records deleted products so the catalog delta feed can report deletions.
+"""
+
+from sqlalchemy import Column, String, DateTime, Index, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ProductTombstone(Base):
+    """
+    Marker left behind by a deleted product.
+
+    Rows are written by triggers on ``products``, so deletions made with
+    raw SQL are recorded as well: deleting a product replaces its tombstone
+    with one stamped now, and inserting a product with the same ID removes
+    it again.
+
+    Attributes:
+        product_id: ID of the deleted product
+        gtin: GTIN the product had
+        deleted_at: When the product was deleted (same clock and format as
+            ``Product.updated_at``)
+    """
+
+    __tablename__ = "product_tombstones"
+
+    product_id = Column(String(100), primary_key=True)
+    gtin = Column(String(14), nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Catalog delta feed: keyset scan of deletions (deleted_at, product_id)
+        Index("ix_product_tombstones_deleted_at_id", deleted_at, product_id),
+    )
+
+    def __repr__(self):
+        return f"<ProductTombstone(product_id='{self.product_id}', deleted_at='{self.deleted_at}')>"
+
+
+_CREATE_STATEMENTS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS products_tombstone_ad AFTER DELETE ON products BEGIN
+        INSERT OR REPLACE INTO product_tombstones(product_id, gtin, deleted_at)
+        VALUES (old.id, old.gtin, CURRENT_TIMESTAMP);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_tombstone_ai AFTER INSERT ON products BEGIN
+        DELETE FROM product_tombstones WHERE product_id = new.id;
+    END
+    """,
+]
+
+
+def create_tombstone_triggers(connection: Connection) -> None:
+    """Create the triggers that maintain product tombstones."""
+    if connection.dialect.name != "sqlite":
+        return
+
+    for statement in _CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+
+
+# ============================================================================
+# Schema Events
+# ============================================================================
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_tombstone_triggers(target, connection, **kw):
+    # After every table exists: the triggers span products and tombstones,
+    # and an older database gains them when its tombstone table is created
+    create_tombstone_triggers(connection)
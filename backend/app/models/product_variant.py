@@ -0,0 +1,228 @@
+"""
+Product Variant Model
+
+Normalized, indexed copy of the variants stored in ``Product.variants``.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Column, Computed, Index, Integer, String, JSON, ForeignKey, event, select, delete, insert, func, or_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm.attributes import get_history
+
+from app.database import Base
+from app.models.gtin import canonical_gtin, canonical_gtin_sql
+from app.models.product import Product
+
+
+class ProductVariant(Base):
+    """
+    Product variant (size/color option) with its own GTIN.
+
+    ``Product.variants`` remains the source of truth; rows here are derived
+    from it on every product write so that a size-level GTIN resolves with a
+    single indexed lookup instead of parsing every product's JSON.
+
+    Attributes:
+        id: Surrogate key
+        product_id: Owning product
+        gtin: Variant GTIN (unique)
+        gtin14: Canonical GTIN-14 of ``gtin`` (virtual generated column,
+            see app.models.gtin); unique, so equivalent spellings of a
+            GTIN are one variant
+        size: Size label (e.g., "9")
+        size_system: Size system (e.g., "US")
+        color: Color name, when the variant defines one
+        attributes: Original variant entry from ``Product.variants`` (JSON)
+    """
+
+    __tablename__ = "product_variants"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    product_id = Column(
+        String(100),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    gtin = Column(String(14), unique=True, nullable=False, index=True)
+    gtin14 = Column(String(14), Computed(canonical_gtin_sql("gtin"), persisted=False))
+    size = Column(String(20), nullable=True)
+    size_system = Column(String(10), nullable=True)
+    color = Column(String(50), nullable=True)
+    attributes = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        # One variant per canonical GTIN, as for products (ix_products_gtin14)
+        Index("ix_product_variants_gtin14", gtin14, unique=True, sqlite_where=gtin14.is_not(None)),
+    )
+
+    def __repr__(self):
+        return f"<ProductVariant(product_id='{self.product_id}', gtin='{self.gtin}')>"
+
+    def to_dict(self):
+        """Convert model to dictionary (the original variant entry)."""
+        data = dict(self.attributes or {})
+        data["gtin"] = self.gtin
+        return data
+
+
+# ============================================================================
+# Index Maintenance
+# ============================================================================
+
+# A variant is indexed when it is an object whose "gtin" is a non-empty
+# string or an integer: JSON type in SQLite -> Python type. Both rebuild
+# paths below apply this one rule.
+_GTIN_TYPES = {"text": str, "integer": int}
+
+
+def _variant_gtin(variant) -> Optional[str]:
+    """The GTIN a ``Product.variants`` entry is indexed under, or None."""
+    if not isinstance(variant, dict):
+        return None
+    gtin = variant.get("gtin")
+    if type(gtin) not in _GTIN_TYPES.values() or gtin == "":  # Exact types: JSON true is not an integer
+        return None
+    return str(gtin)
+
+
+def _gtin_key(gtin: str) -> str:
+    """Key under which a GTIN is unique: its canonical GTIN-14, else the GTIN as written."""
+    return canonical_gtin(gtin) or gtin
+
+
+def _claimed_by(rows: Iterable[Dict]):
+    """Condition matching the variant rows that any of ``rows`` would collide with."""
+    table = ProductVariant.__table__
+    rows = list(rows)
+    canonical = [key for key in (canonical_gtin(row["gtin"]) for row in rows) if key]
+    return or_(table.c.gtin.in_([row["gtin"] for row in rows]), table.c.gtin14.in_(canonical))
+
+
+def _variant_rows(product_id: str, variants: Iterable) -> List[Dict]:
+    """Build product_variants rows from a ``Product.variants`` list."""
+    rows = {}
+    for variant in variants or []:
+        gtin = _variant_gtin(variant)
+        if gtin is None:
+            continue
+        rows[_gtin_key(gtin)] = {
+            "product_id": product_id,
+            "gtin": gtin,
+            "size": variant.get("size"),
+            "size_system": variant.get("size_system"),
+            "color": variant.get("color"),
+            "attributes": variant,
+        }
+    return list(rows.values())
+
+
+def sync_product_variants(
+    connection: Connection,
+    product_id: str,
+    variants: Iterable,
+    replace: bool = True
+) -> None:
+    """
+    Replace the indexed variants of one product.
+
+    A variant GTIN already claimed by another product, in any spelling of
+    the same canonical GTIN, is reassigned to this one (last write wins)
+    rather than failing the product write.
+
+    Args:
+        connection: Connection of the flush in progress
+        product_id: Owning product
+        variants: New ``Product.variants`` value
+        replace: Delete the product's existing rows first (False for inserts)
+    """
+    table = ProductVariant.__table__
+    rows = _variant_rows(product_id, variants)
+
+    if replace:
+        connection.execute(delete(table).where(table.c.product_id == product_id))
+    if rows:
+        connection.execute(delete(table).where(_claimed_by(rows)))
+        connection.execute(insert(table), rows)
+
+
+_REBUILD_SQL = """
+    INSERT OR REPLACE INTO product_variants (product_id, gtin, size, size_system, color, attributes)
+    SELECT products.id,
+           CAST(json_extract(variant.value, '$.gtin') AS TEXT),
+           json_extract(variant.value, '$.size'),
+           json_extract(variant.value, '$.size_system'),
+           json_extract(variant.value, '$.color'),
+           variant.value
+    FROM products, json_each(products.variants) AS variant
+    WHERE variant.type = 'object'
+      AND json_type(variant.value, '$.gtin') IN ({types})
+      AND json_extract(variant.value, '$.gtin') != ''
+""".format(types=", ".join(f"'{name}'" for name in _GTIN_TYPES))
+
+
+def rebuild_product_variants(connection: Connection, batch_size: int = 1000) -> int:
+    """
+    Rebuild the whole variant index from ``products``.
+
+    Used by schema upgrades and bulk loads, which bypass the ORM events.
+
+    Returns:
+        Number of variant rows written
+    """
+    table = ProductVariant.__table__
+    connection.execute(delete(table))
+
+    if connection.dialect.name == "sqlite":
+        # Expanded by SQLite's json_each instead of row by row in Python.
+        # Products are visited in table order, as below, and OR REPLACE
+        # keeps the last owner of a GTIN claimed twice (in any spelling:
+        # ix_product_variants_gtin14 is unique too).
+        return connection.exec_driver_sql(_REBUILD_SQL).rowcount
+
+    result = connection.execution_options(yield_per=batch_size).execute(
+        select(Product.__table__.c.id, Product.__table__.c.variants)
+        .where(Product.__table__.c.variants.isnot(None))
+    )
+
+    written = 0
+    for partition in result.partitions():
+        rows = {}
+        for product_id, variants in partition:
+            for row in _variant_rows(product_id, variants):
+                rows[_gtin_key(row["gtin"])] = row
+        if rows:
+            connection.execute(delete(table).where(_claimed_by(rows.values())))
+            connection.execute(insert(table), list(rows.values()))
+            written += len(rows)
+    return written
+
+
+def ensure_product_variants(connection: Connection) -> None:
+    """Backfill the variant index on databases created before it existed."""
+    table = ProductVariant.__table__
+    if connection.execute(select(func.count()).select_from(table)).scalar():
+        return
+
+    has_variants = connection.execute(
+        select(Product.__table__.c.id).where(Product.__table__.c.variants.isnot(None)).limit(1)
+    ).first()
+    if has_variants:
+        rebuild_product_variants(connection)
+
+
+@event.listens_for(Product, "after_insert")
+def _index_inserted_variants(mapper, connection, target):
+    sync_product_variants(connection, target.id, target.variants, replace=False)
+
+
+@event.listens_for(Product, "after_update")
+def _index_updated_variants(mapper, connection, target):
+    if get_history(target, "variants").has_changes():
+        sync_product_variants(connection, target.id, target.variants)
+
+
+@event.listens_for(Product, "after_delete")
+def _remove_deleted_variants(mapper, connection, target):
+    sync_product_variants(connection, target.id, [])
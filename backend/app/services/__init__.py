@@ -4,11 +4,19 @@ Internal Services
 Protocol-agnostic business logic services.
 """
 
-from app.services.product_service import ProductService, ProductNotFoundError, InvalidGTINError
+from app.services.product_service import (
+    ProductService,
+    ProductNotFoundError,
+    InvalidGTINError,
+    InvalidCursorError,
+    SearchPage,
+)
 
 __all__ = [
     "ProductService",
     "ProductNotFoundError",
     "InvalidGTINError",
+    "InvalidCursorError",
+    "SearchPage",
 ]
 
@@ -0,0 +1,302 @@
+"""
+Autocomplete
+
+Suggest-as-you-type over product titles, brands and categories, served from
+memory so keystrokes never reach the database.
+
+Completions are stored in a compressed (radix) trie: chains of single-child
+nodes are merged into one edge labelled with the whole substring, so the
+trie has at most two nodes per completion key. Every node keeps its top
+completions by popularity precomputed at build time, so a lookup walks the
+prefix and returns that list without visiting the subtree.
+
+Titles are indexed as written and, when they start with the brand, without
+it ("air max" completes "Nike Air Max 90"). Categories are indexed by full
+path and by node name. Brands and categories rank by their most popular
+product.
+
+The trie is immutable. It is rebuilt in the background after committed
+catalog changes and swapped in (see app.services.snapshot_refresh).
+"""
+
+import bisect
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.category import CATEGORY_SEPARATOR, split_category_path
+from app.models.product import Product
+from app.services import catalog_events
+from app.services.snapshot_refresh import RefreshingSnapshot
+
+
+# Completions precomputed per trie node; the most a lookup can return
+MAX_COMPLETIONS = 20
+
+KIND_PRODUCT = "product"
+KIND_BRAND = "brand"
+KIND_CATEGORY = "category"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def completion_key(text: Optional[str]) -> str:
+    """Normalized trie key: lowercase with single spaces."""
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+@dataclass(frozen=True, slots=True)
+class Completion:
+    """
+    One suggestion.
+
+    Attributes:
+        text: Text to display or search for
+        kind: "product", "brand" or "category"
+        popularity: Ranking score (product popularity_score)
+        product_id: Product, for product completions
+    """
+
+    text: str
+    kind: str
+    popularity: float
+    product_id: Optional[str] = None
+
+    def to_dict(self):
+        """Convert completion to dictionary."""
+        return {
+            "text": self.text,
+            "kind": self.kind,
+            "popularity": self.popularity,
+            "product_id": self.product_id,
+        }
+
+
+def _rank(completion: Completion):
+    return (-completion.popularity, completion.text, completion.kind)
+
+
+def _top(ranked: Iterable[Completion]) -> Tuple[Completion, ...]:
+    """First MAX_COMPLETIONS of ranked completions, one per (text, kind)."""
+    top = []
+    seen = set()
+    for completion in ranked:
+        identity = (completion.text, completion.kind)
+        if identity not in seen:
+            seen.add(identity)
+            top.append(completion)
+            if len(top) == MAX_COMPLETIONS:
+                break
+    return tuple(top)
+
+
+class _Node:
+    __slots__ = ("edges", "top")
+
+    def __init__(self):
+        self.edges: Dict[str, Tuple[str, "_Node"]] = {}  # first char -> (label, child)
+        self.top: Tuple[Completion, ...] = ()
+
+
+class CompletionTrie:
+    """
+    Immutable radix trie from normalized prefixes to ranked completions.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Completion]]):
+        """
+        Build the trie.
+
+        Args:
+            entries: (text to match, completion) pairs; the text is
+                normalized with completion_key()
+        """
+        keyed = sorted(
+            ((completion_key(text), completion) for text, completion in entries),
+            key=lambda item: item[0]
+        )
+        keyed = [item for item in keyed if item[0]]
+        keys = [key for key, _ in keyed]
+        completions = [completion for _, completion in keyed]
+
+        self._root = self._build(keys, completions, 0, len(keys), 0) if keys else _Node()
+        self.size = len(keys)
+        self.nodes = self._count(self._root)
+        self.built_at = time.time()
+
+    @classmethod
+    def _build(cls, keys: List[str], completions: List[Completion], lo: int, hi: int, depth: int) -> _Node:
+        """Node for keys[lo:hi], which share their first ``depth`` characters."""
+        node = _Node()
+        ranked = []  # Candidates for node.top
+
+        position = lo
+        while position < hi and len(keys[position]) == depth:
+            position += 1
+        if position == hi == lo + 1:
+            node.top = (completions[lo],)  # Leaf of a single key
+            return node
+        ranked.extend(completions[lo:position])  # Keys ending here
+
+        while position < hi:
+            # Keys continuing with the same character form one contiguous run
+            first = keys[position][depth]
+            end = bisect.bisect_left(keys, keys[position][:depth] + chr(ord(first) + 1), position, hi)
+
+            # Sorted keys: the common prefix of the first and last key is
+            # shared by every key in between
+            low, high = keys[position], keys[end - 1]
+            if low == high:
+                split = len(low)
+            else:
+                split = depth + 1
+                while split < len(low) and low[split] == high[split]:  # high > low
+                    split += 1
+
+            child = cls._build(keys, completions, position, end, split)
+            node.edges[first] = (low[depth:split], child)
+            ranked.extend(child.top)
+            position = end
+
+        node.top = _top(sorted(ranked, key=_rank))
+        return node
+
+    @staticmethod
+    def _count(root: _Node) -> int:
+        count, stack = 0, [root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(child for _, child in node.edges.values())
+        return count
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """
+        Most popular completions of a prefix.
+
+        Example:
+            >>> trie.complete("air m", limit=3)
+            [Completion(text='Nike Air Max 90', kind='product', ...)]
+        """
+        key = completion_key(prefix)
+        node = self._root
+        position = 0
+        while position < len(key):
+            edge = node.edges.get(key[position])
+            if edge is None:
+                return []
+            label, child = edge
+            remaining = key[position:position + len(label)]
+            if not label.startswith(remaining):
+                return []
+            position += len(label)
+            node = child
+        return list(node.top[:limit])
+
+    @classmethod
+    def load(cls, bind: Engine) -> "CompletionTrie":
+        """Build a trie from the product catalog."""
+        table = Product.__table__
+        entries = []
+        brands: Dict[str, Completion] = {}
+        categories: Dict[str, Completion] = {}
+
+        def keep_most_popular(completions, key, completion):
+            current = completions.get(key)
+            if current is None or _rank(completion) < _rank(current):
+                completions[key] = completion
+
+        with bind.connect() as connection:
+            result = connection.execution_options(yield_per=1000).execute(
+                select(table.c.id, table.c.title, table.c.brand, table.c.category, table.c.popularity_score)
+            )
+            for product_id, title, brand, category, popularity in result:
+                popularity = float(popularity or 0)
+
+                if title:
+                    completion = Completion(title, KIND_PRODUCT, popularity, product_id)
+                    entries.append((title, completion))
+                    title_key, brand_key = completion_key(title), completion_key(brand)
+                    if brand_key and title_key.startswith(brand_key + " "):
+                        entries.append((title_key[len(brand_key) + 1:], completion))
+
+                if brand and brand.strip():
+                    keep_most_popular(brands, completion_key(brand), Completion(brand.strip(), KIND_BRAND, popularity))
+
+                segments = split_category_path(category)
+                for depth in range(len(segments)):
+                    path = CATEGORY_SEPARATOR.join(segments[:depth + 1])
+                    keep_most_popular(categories, path.lower(), Completion(path, KIND_CATEGORY, popularity))
+
+        entries.extend((completion.text, completion) for completion in brands.values())
+        for completion in categories.values():
+            entries.append((completion.text, completion))
+            segments = split_category_path(completion.text)
+            if len(segments) > 1:
+                entries.append((segments[-1], completion))
+
+        return cls(entries)
+
+
+# ============================================================================
+# Engine (trie lifecycle)
+# ============================================================================
+
+class AutocompleteEngine(RefreshingSnapshot[CompletionTrie]):
+    """Owns the current completion trie of one database."""
+
+    thread_name = "autocomplete-refresh"
+
+    def build(self) -> CompletionTrie:
+        """Build a new trie from the database."""
+        return CompletionTrie.load(self.bind)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Complete a prefix from the current trie (see CompletionTrie.complete)."""
+        return self.snapshot.complete(prefix, limit)
+
+    def stats(self) -> Dict[str, float]:
+        """Trie size and rebuild metrics."""
+        trie = self._snapshot
+        return {
+            "completions": trie.size if trie else 0,
+            "nodes": trie.nodes if trie else 0,
+            "built_at": trie.built_at if trie else None,
+            "rebuilds": self.rebuilds,
+            "last_build_seconds": round(self.last_build_seconds, 4),
+        }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_engines: "weakref.WeakKeyDictionary[Engine, AutocompleteEngine]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_autocomplete_engine(bind: Engine) -> AutocompleteEngine:
+    """Return the autocomplete engine for a database, creating it on first use."""
+    with _registry_lock:
+        engine = _engines.get(bind)
+        if engine is None:
+            engine = AutocompleteEngine(
+                bind, background_refresh=settings.autocomplete_background_refresh
+            )
+            _engines[bind] = engine
+        return engine
+
+
+@catalog_events.subscribe
+def _refresh_on_catalog_change(bind: Engine, change: catalog_events.CatalogChange) -> None:
+    # Rebuild only from committed data
+    engine = _engines.get(bind)
+    if engine is not None and change.committed:
+        engine.mark_stale()
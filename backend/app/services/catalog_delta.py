@@ -0,0 +1,207 @@
+"""
+Catalog Delta
+
+Products changed and deleted since a watermark, for incremental feeds.
+
+A watermark is the position of the last change a consumer has applied:
+the change timestamp and product ID of that change. Changes are read in
+(timestamp, ID) order with two keyset scans, one over products
+(``ix_products_updated_at_id``) and one over tombstones
+(``ix_product_tombstones_deleted_at_id``), merged into a single stream.
+Each scan reads a batch at a time with a bounded query continuing from its
+last (timestamp, ID), on a short-lived connection, so no read transaction
+(and no SQLite shared lock) is held while a response is being streamed.
+
+Timestamps are compared as the database stores them, so a watermark taken
+from a change resumes exactly after it, including among changes made in the
+same second.
+
+Changes newer than ``settings.catalog_delta_settle_seconds`` are held back:
+a write is stamped when its statement runs but becomes visible only when it
+commits, and timestamps have one-second resolution. Holding back the most
+recent changes keeps a consumer's watermark from passing a change that has
+not been committed yet. A transaction committing later than that after its
+write can still be missed.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from sqlalchemy import String, select, tuple_, type_coerce
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.product import Product
+from app.models.product_record import ProductRecord
+from app.models.product_tombstone import ProductTombstone
+
+
+CHANGE_UPSERT = "upsert"
+CHANGE_DELETE = "delete"
+
+# How SQLite's CURRENT_TIMESTAMP (the default for product timestamps) is stored
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_timestamp(moment: datetime) -> str:
+    """Stored form of a timestamp (UTC, microseconds only when present)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    text = moment.strftime(_TIMESTAMP_FORMAT)
+    if moment.microsecond:
+        text += f".{moment.microsecond:06d}"
+    return text
+
+
+@dataclass(frozen=True, slots=True)
+class Watermark:
+    """
+    Position in the catalog change stream.
+
+    Attributes:
+        updated_at: Change timestamp as stored in the database
+        id: Product ID of the change ("" for the start of updated_at)
+    """
+
+    updated_at: str
+    id: str = ""
+
+    @classmethod
+    def parse(cls, updated_at: str, product_id: Optional[str] = None) -> "Watermark":
+        """
+        Watermark from request parameters.
+
+        Args:
+            updated_at: ISO 8601 timestamp; naive timestamps are UTC.
+                Watermarks returned by the feed round-trip unchanged.
+            product_id: Last product ID applied at that timestamp
+
+        Raises:
+            ValueError: If updated_at is not a valid timestamp
+        """
+        try:
+            moment = datetime.fromisoformat(updated_at.strip())
+        except ValueError:
+            raise ValueError(f"Invalid watermark timestamp: {updated_at!r}")
+        return cls(format_timestamp(moment), product_id or "")
+
+    def to_dict(self):
+        """Convert watermark to dictionary."""
+        return {"updated_at": self.updated_at, "id": self.id}
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDeltaEntry:
+    """
+    One changed or deleted product.
+
+    Attributes:
+        op: "upsert" or "delete"
+        id: Product ID
+        changed_at: Stored timestamp of the change
+        gtin: Product GTIN (the last known one, for deletions)
+        record: Current product, for upserts
+    """
+
+    op: str
+    id: str
+    changed_at: str
+    gtin: Optional[str]
+    record: Optional[ProductRecord] = None
+
+    @property
+    def watermark(self) -> Watermark:
+        """Watermark that resumes after this change."""
+        return Watermark(self.changed_at, self.id)
+
+
+class CatalogDelta:
+    """
+    Changes after a watermark, in change order.
+
+    Iterate once; afterwards ``watermark`` is the position to resume from
+    and ``has_more`` tells whether ``limit`` cut the delta short.
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        since: Optional[Watermark] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 1000
+    ):
+        """
+        Args:
+            bind: Database to read from (a connection per batch)
+            since: Last change already applied; None for every change
+            limit: Maximum number of changes; None for all settled changes
+            batch_size: Rows fetched per round trip
+
+        Raises:
+            ValueError: If limit or batch_size is not positive
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be positive")
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+
+        self.bind = bind
+        self.since = since
+        self.limit = limit
+        self.batch_size = batch_size
+        self.watermark = since
+        self.has_more = False
+
+    def __iter__(self) -> Iterator[CatalogDeltaEntry]:
+        # Whole seconds: a second is included only once all of it has settled
+        settled = datetime.now(timezone.utc) - timedelta(seconds=settings.catalog_delta_settle_seconds)
+        horizon = format_timestamp(settled.replace(microsecond=0))
+        changes = heapq.merge(
+            self._upserts(horizon), self._deletes(horizon),
+            key=lambda entry: (entry.changed_at, entry.id)
+        )
+        if self.limit is not None:
+            changes = itertools.islice(changes, self.limit + 1)
+
+        for count, entry in enumerate(changes):
+            if count == self.limit:
+                self.has_more = True
+                break
+            self.watermark = entry.watermark
+            yield entry
+
+    def _scan(self, changed_at, product_id, horizon: str, *columns):
+        # Stored strings, so ties within a second order by ID as the index does
+        changed_at = type_coerce(changed_at, String)
+        statement = (
+            select(changed_at.label("changed_at"), product_id.label("_key_id"), *columns)
+            .where(changed_at < horizon)
+            .order_by(changed_at, product_id)
+            .limit(self.batch_size)
+        )
+        last = (self.since.updated_at, self.since.id) if self.since is not None else None
+
+        while True:
+            batch = statement if last is None else statement.where(tuple_(changed_at, product_id) > tuple_(*last))
+            with self.bind.connect() as connection:
+                rows = connection.execute(batch).mappings().all()
+
+            yield from rows
+            if len(rows) < self.batch_size:
+                return
+            last = (rows[-1]["changed_at"], rows[-1]["_key_id"])
+
+    def _upserts(self, horizon: str) -> Iterator[CatalogDeltaEntry]:
+        table = Product.__table__
+        for row in self._scan(table.c.updated_at, table.c.id, horizon, *ProductRecord.columns()):
+            yield CatalogDeltaEntry(
+                CHANGE_UPSERT, row["id"], row["changed_at"], row["gtin"], ProductRecord.from_row(row)
+            )
+
+    def _deletes(self, horizon: str) -> Iterator[CatalogDeltaEntry]:
+        table = ProductTombstone.__table__
+        for row in self._scan(table.c.deleted_at, table.c.product_id, horizon, table.c.product_id, table.c.gtin):
+            yield CatalogDeltaEntry(CHANGE_DELETE, row["product_id"], row["changed_at"], row["gtin"])
@@ -0,0 +1,151 @@
+"""
+Catalog Change Events
+
+Process-local notifications for product catalog writes.
+
+Product writes made through any ORM session are collected at flush time and
+published to subscribers after the flush and again when the transaction
+commits or rolls back, so in-memory structures derived from the catalog
+(caches, snapshots, indexes) can invalidate themselves without polling.
+
+Writers that bypass the ORM (bulk loads, raw SQL) must call
+publish_catalog_change() themselves.
+"""
+
+import logging
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogChange:
+    """
+    A set of changed products.
+
+    Attributes:
+        product_ids: IDs of changed products, or None for "anything may have changed"
+        gtins: Product and variant GTINs touched by the change (old and new values)
+        committed: True once the change is durable; False for flushes inside an
+            open transaction and for rollbacks
+    """
+
+    product_ids: Optional[FrozenSet[str]] = None
+    gtins: FrozenSet[str] = frozenset()
+    committed: bool = True
+
+    @property
+    def is_full(self) -> bool:
+        """True when subscribers should drop everything they derived."""
+        return self.product_ids is None
+
+
+CatalogListener = Callable[[Engine, CatalogChange], None]
+
+_listeners: List[CatalogListener] = []
+
+_PENDING_KEY = "catalog_changes"
+
+
+def subscribe(listener: CatalogListener) -> CatalogListener:
+    """Register a listener (usable as a decorator)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def unsubscribe(listener: CatalogListener) -> None:
+    """Remove a previously registered listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def publish_catalog_change(
+    bind: Engine,
+    product_ids: Optional[Iterable[str]] = None,
+    gtins: Iterable[str] = (),
+    committed: bool = True
+) -> None:
+    """
+    Notify listeners that products changed in the database behind ``bind``.
+
+    Args:
+        bind: Engine the write went to
+        product_ids: Changed product IDs; None means the whole catalog
+        gtins: GTINs affected by the change
+        committed: Whether the change is committed
+    """
+    change = CatalogChange(
+        product_ids=frozenset(product_ids) if product_ids is not None else None,
+        gtins=frozenset(gtins),
+        committed=committed
+    )
+    for listener in list(_listeners):
+        try:
+            listener(bind, change)
+        except Exception:
+            logger.exception("Catalog change listener %r failed", listener)
+
+
+# ============================================================================
+# ORM Session Hooks
+# ============================================================================
+
+def _product_gtins(product: Product) -> List[str]:
+    """Current and previous product and variant GTINs of a product."""
+    gtins = []
+    for attribute in ("gtin", "variants"):
+        history = get_history(product, attribute)
+        for value in chain(history.added or (), history.unchanged or (), history.deleted or ()):
+            if attribute == "gtin":
+                gtins.append(value)
+            elif isinstance(value, list):
+                gtins.extend(v["gtin"] for v in value if isinstance(v, dict) and v.get("gtin"))
+    return [str(gtin) for gtin in gtins if gtin]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_product_changes(session, flush_context):
+    product_ids = set()
+    gtins = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Product):
+            product_ids.add(obj.id)
+            gtins.update(_product_gtins(obj))
+
+    if not product_ids:
+        return
+
+    bind = session.get_bind()
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    pending_ids, pending_gtins = pending.setdefault(bind, (set(), set()))
+    pending_ids.update(product_ids)
+    pending_gtins.update(gtins)
+
+    publish_catalog_change(bind, product_ids, gtins, committed=False)
+
+
+def _publish_pending(session, committed: bool):
+    pending = session.info.pop(_PENDING_KEY, None)
+    for bind, (product_ids, gtins) in (pending or {}).items():
+        publish_catalog_change(bind, product_ids, gtins, committed=committed)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session):
+    _publish_pending(session, committed=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _publish_rolled_back_changes(session):
+    # Listeners may have re-read rows written by this transaction
+    _publish_pending(session, committed=False)
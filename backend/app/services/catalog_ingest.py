@@ -0,0 +1,449 @@
+"""
+Catalog Ingestion
+
+Bulk loads products from JSONL or CSV files.
+
+Rows are streamed from the input in batches, validated and normalized in
+worker processes, and written with ``executemany`` upserts keyed on GTIN
+(the canonical GTIN-14 where the check digit is valid): new GTINs are
+inserted, known ones updated in place (the product keeps its ID), and rows
+identical to what is stored are left untouched so they do not show up in
+the delta feed.
+
+The load is one transaction. Derived data is rebuilt once at the end rather
+than per row, and only if the load changed anything: the FTS5 sync
+triggers are suspended during the load and the search index is rebuilt
+afterwards, and the variant index and category tree are rebuilt from
+``products`` (Core inserts bypass the ORM events that keep them up to
+date). Buyability is evaluated during validation. A failed load rolls back
+completely.
+"""
+
+import csv
+import gzip
+import io
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import String, bindparam, func, or_, type_coerce, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.models.buyability import evaluate_buyability
+from app.models.category import rebuild_categories
+from app.models.gtin import canonical_gtin
+from app.models.product import Product
+from app.models.product_search import (
+    create_product_search_index,
+    drop_product_search_triggers,
+    rebuild_product_search_index,
+)
+from app.models.product_variant import rebuild_product_variants
+from app.services.catalog_delta import format_timestamp
+from app.services.catalog_events import publish_catalog_change
+
+
+INGEST_FORMAT_JSONL = "jsonl"
+INGEST_FORMAT_CSV = "csv"
+
+AVAILABILITY_VALUES = ("in_stock", "out_of_stock", "preorder")
+
+# Columns written by the upsert, in the order of the normalized rows
+PRODUCT_COLUMNS = (
+    "id", "gtin", "mpn", "title", "description", "brand", "category", "price", "currency",
+    "images", "availability", "variants", "product_metadata", "is_buyable", "buyability_reason",
+)
+_GTIN = PRODUCT_COLUMNS.index("gtin")
+
+# Rejected rows kept in the report (all of them are counted)
+MAX_REPORTED_ERRORS = 100
+
+
+# ============================================================================
+# Input
+# ============================================================================
+
+def detect_format(path: str) -> str:
+    """Input format from a file name (``.jsonl``, ``.ndjson``, ``.csv``, optionally ``.gz``)."""
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return INGEST_FORMAT_CSV
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return INGEST_FORMAT_JSONL
+    raise ValueError(f"Cannot tell the format of {path}; use .jsonl or .csv")
+
+
+def read_product_rows(path: str, input_format: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Stream raw rows from a JSONL or CSV file (gzipped if it ends in ``.gz``).
+
+    JSONL lines are yielded unparsed so that parsing happens in the workers.
+
+    Yields:
+        (line number, JSON text or CSV row dict)
+    """
+    input_format = input_format or detect_format(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as stream:
+        yield from iter_product_rows(stream, input_format)
+
+
+def iter_product_rows(stream: io.TextIOBase, input_format: str) -> Iterator[Tuple[int, Any]]:
+    """Stream raw rows from an open text stream (see read_product_rows)."""
+    if input_format == INGEST_FORMAT_JSONL:
+        for number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield number, line
+    elif input_format == INGEST_FORMAT_CSV:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        raise ValueError(f"Unsupported input format: {input_format}")
+
+
+# ============================================================================
+# Validation (runs in worker processes)
+# ============================================================================
+
+def _text(data: Dict[str, Any], name: str, max_length: int, default: Optional[str] = None) -> Optional[str]:
+    value = data.get(name)
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        return default
+    if len(value) > max_length:
+        raise ValueError(f"{name} is longer than {max_length} characters")
+    return value
+
+
+def _json(data: Dict[str, Any], name: str, expected: type):
+    value = data.get(name)
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        if name == "images" and not value.startswith("["):
+            return [value]  # A single URL in a CSV cell
+        try:
+            value = json.loads(value)
+        except ValueError:
+            raise ValueError(f"{name} is not valid JSON")
+    if value is not None and not isinstance(value, expected):
+        raise ValueError(f"{name} must be a {expected.__name__}")
+    return value
+
+
+def normalize_product_row(raw: Any) -> Dict[str, Any]:
+    """
+    Validate one input row and convert it to a ``products`` row.
+
+    Args:
+        raw: JSON text or a dict (e.g., a CSV row, where images, variants and
+            product_metadata are JSON cells)
+
+    Returns:
+        Dict with a value for each of PRODUCT_COLUMNS
+
+    Raises:
+        ValueError: If the row is invalid
+    """
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+    data = raw
+    if not isinstance(data, dict):
+        raise ValueError("Row must be a JSON object")
+
+    gtin = _text(data, "gtin", 14)
+    if not gtin or not gtin.isdigit() or len(gtin) < 8:
+        raise ValueError(f"GTIN must be 8-14 digits, got: {gtin}")
+
+    title = _text(data, "title", 150)
+    if not title:
+        raise ValueError("title is required")
+
+    try:
+        price = Decimal(str(data.get("price"))).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid price: {data.get('price')!r}")
+    if not price.is_finite() or price < 0 or price >= Decimal("100000000"):
+        raise ValueError(f"Invalid price: {data.get('price')!r}")
+
+    currency = _text(data, "currency", 3, "USD").upper()
+    if len(currency) != 3 or not currency.isalpha():
+        raise ValueError(f"Invalid currency: {currency}")
+
+    availability = _text(data, "availability", 20, "in_stock").lower()
+    if availability not in AVAILABILITY_VALUES:
+        raise ValueError(f"Invalid availability: {availability}")
+
+    metadata_name = "product_metadata" if "product_metadata" in data else "metadata"
+    row = {
+        "id": _text(data, "id", 100, gtin),
+        "gtin": gtin,
+        "mpn": _text(data, "mpn", 50),
+        "title": title,
+        "description": _text(data, "description", 5000),
+        "brand": _text(data, "brand", 70, "Nike"),
+        "category": _text(data, "category", 200),
+        "price": price,
+        "currency": currency,
+        "images": _json(data, "images", list),
+        "availability": availability,
+        "variants": _json(data, "variants", list),
+        "product_metadata": _json(data, metadata_name, dict),
+    }
+
+    reason = evaluate_buyability(row["availability"], row["title"], row["category"], row["product_metadata"])
+    row["is_buyable"] = reason is None
+    row["buyability_reason"] = reason
+    return row
+
+
+def _parameters(row: Dict[str, Any]) -> tuple:
+    """Database values of a normalized row, in PRODUCT_COLUMNS order."""
+    values = dict(row)
+    for name in ("images", "variants", "product_metadata"):
+        if values[name] is not None:
+            values[name] = json.dumps(values[name])
+    values["price"] = str(values["price"])
+    values["is_buyable"] = int(values["is_buyable"])
+    return tuple(values[name] for name in PRODUCT_COLUMNS)
+
+
+def validate_batch(batch: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, tuple]], List[Tuple[int, str]]]:
+    """
+    Normalize a batch of raw rows.
+
+    Valid rows are returned as database parameters (JSON serialized), so
+    that work happens in the workers too.
+
+    Returns:
+        (line number, parameters) per valid row, (line number, error) per
+        invalid row
+    """
+    rows, errors = [], []
+    for number, raw in batch:
+        try:
+            rows.append((number, _parameters(normalize_product_row(raw))))
+        except ValueError as e:
+            errors.append((number, str(e)))
+    return rows, errors
+
+
+def _batches(rows: Iterable[Tuple[int, Any]], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _validated_batches(batches: Iterator[list], workers: int) -> Iterator[tuple]:
+    """Validate batches in input order, at most two per worker in flight."""
+    if workers < 2:
+        for batch in batches:
+            yield validate_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+@dataclass
+class IngestReport:
+    """
+    Outcome of a bulk load.
+
+    Attributes:
+        read: Input rows read
+        written: Products inserted or changed
+        unchanged: Valid rows identical to the stored product
+        rejected: Invalid rows and rows that conflict with another product's ID
+        errors: (line number, message) of the first MAX_REPORTED_ERRORS rejected rows
+        seconds: Wall time, including the rebuild of derived data
+    """
+
+    read: int = 0
+    written: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Input rows processed per second."""
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def reject(self, number: int, message: str) -> None:
+        """Count a rejected row."""
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, message))
+
+
+class _Upsert:
+    """
+    The GTIN-keyed upsert, compiled once and executed with driver-level executemany.
+
+    GTINs with a valid check digit are keyed on their canonical GTIN-14, so
+    the UPC-A and EAN-13 spellings of an item update the same product; other
+    GTINs are keyed on the string as given.
+    """
+
+    def __init__(self, connection: Connection):
+        table = Product.__table__
+        self.connection = connection
+        self.by_gtin14 = self._compile(
+            connection, index_elements=[table.c.gtin14], index_where=table.c.gtin14.is_not(None)
+        )
+        self.by_gtin = self._compile(connection, index_elements=[table.c.gtin])
+
+    @staticmethod
+    def _compile(connection: Connection, **target) -> Tuple[str, List[int]]:
+        table = Product.__table__
+        statement = sqlite_insert(table).values({name: bindparam(name) for name in PRODUCT_COLUMNS})
+        changing = [name for name in PRODUCT_COLUMNS if name not in ("id", "gtin")]
+        statement = statement.on_conflict_do_update(
+            **target,
+            set_={**{name: statement.excluded[name] for name in changing}, "updated_at": func.now()},
+            # Identical rows are skipped: no write, no new updated_at
+            where=or_(*(table.c[name].is_not(statement.excluded[name]) for name in changing))
+        )
+        compiled = statement.compile(dialect=connection.dialect)
+        return str(compiled), [PRODUCT_COLUMNS.index(name) for name in compiled.positiontup]
+
+    def execute(self, rows: List[tuple]) -> int:
+        """Upsert rows (PRODUCT_COLUMNS order); returns the number written."""
+        canonical, other = [], []
+        for row in rows:
+            (canonical if canonical_gtin(row[_GTIN]) else other).append(row)
+
+        written = 0
+        for (sql, positions), batch in ((self.by_gtin14, canonical), (self.by_gtin, other)):
+            if batch:
+                parameters = [tuple(row[position] for position in positions) for row in batch]
+                written += self.connection.exec_driver_sql(sql, parameters).rowcount
+        return written
+
+
+def _write_batch(upsert: _Upsert, rows: List[Tuple[int, tuple]], report: IngestReport) -> None:
+    """Upsert one batch; rows rejected by constraints are retried one by one and reported."""
+    connection = upsert.connection
+    conflicts = 0
+    try:
+        with connection.begin_nested():
+            written = upsert.execute([row for _, row in rows])
+    except IntegrityError:
+        # e.g., a new GTIN with the ID of another product
+        written = 0
+        for number, row in rows:
+            try:
+                with connection.begin_nested():
+                    written += upsert.execute([row])
+            except IntegrityError as e:
+                conflicts += 1
+                report.reject(number, f"Conflicts with an existing product: {e.orig}")
+
+    report.written += written
+    report.unchanged += len(rows) - written - conflicts
+
+
+def _rebuild_derived_data(connection: Connection, started_at: str, search_index: bool) -> None:
+    """Rebuild what per-row writes would have maintained, then stamp the load."""
+    rebuild_product_variants(connection)
+    rebuild_categories(connection)
+    if search_index:
+        rebuild_product_search_index(connection)
+
+    # Stamp the written rows at commit time so the delta feed, which holds
+    # back only recent changes, cannot pass them while the load is running
+    table = Product.__table__
+    connection.execute(
+        update(table)
+        .where(type_coerce(table.c.updated_at, String) >= started_at)
+        .values(updated_at=func.now())
+    )
+
+
+def ingest_products(
+    bind: Engine,
+    rows: Iterable[Tuple[int, Any]],
+    batch_size: int = 5000,
+    workers: int = 0,
+    on_progress: Optional[Callable[[IngestReport], None]] = None
+) -> IngestReport:
+    """
+    Bulk upsert products.
+
+    Args:
+        bind: Database engine
+        rows: (line number, raw row) pairs, e.g., from read_product_rows()
+        batch_size: Rows per validation batch and per executemany
+        workers: Validation processes; 0 or 1 validates in this process
+        on_progress: Called with the running report after each batch
+
+    Returns:
+        IngestReport
+
+    Raises:
+        ValueError: If batch_size is not positive
+
+    Example:
+        >>> report = ingest_products(engine, read_product_rows("catalog.jsonl.gz"), workers=4)
+        >>> print(f"{report.rows_per_second:,.0f} rows/s")
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+
+    report = IngestReport()
+    started = time.perf_counter()
+    started_at = format_timestamp(datetime.now(timezone.utc).replace(microsecond=0))
+
+    with bind.begin() as connection:
+        # The search index is rebuilt once at the end instead of per row
+        search_index = create_product_search_index(connection)
+        drop_product_search_triggers(connection)
+        upsert = _Upsert(connection)
+
+        for valid, errors in _validated_batches(_batches(rows, batch_size), workers):
+            report.read += len(valid) + len(errors)
+            for number, message in errors:
+                report.reject(number, message)
+            if valid:
+                _write_batch(upsert, valid, report)
+            if on_progress:
+                report.seconds = time.perf_counter() - started
+                on_progress(report)
+
+        create_product_search_index(connection)
+        if report.written:
+            _rebuild_derived_data(connection, started_at, search_index)
+
+    if report.written:
+        publish_catalog_change(bind)
+    report.seconds = time.perf_counter() - started
+    return report
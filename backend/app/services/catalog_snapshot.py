@@ -0,0 +1,372 @@
+"""
+Columnar Catalog Engine
+
+Optional in-memory search engine for ProductService.search_products.
+
+Loads ``products`` into an immutable, column-oriented CatalogSnapshot:
+NumPy arrays for price, availability code, category id, color and gender
+codes and popularity, interned strings for low-cardinality text, and a token index for keyword
+matching. Filters are evaluated as vectorized boolean masks over rows kept
+in popularity order, so top-k selection is a slice and a search costs no
+SQL round trip and no ORM hydration.
+
+Snapshots never change once built. When the catalog changes, a new snapshot
+is built in a background thread and swapped in with a single reference
+assignment; searches running meanwhile keep using the previous one.
+
+Enable with ``CATALOG_ENGINE=columnar``. Requires NumPy.
+"""
+
+import bisect
+import logging
+import sys
+import threading
+import time
+import weakref
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from app.config import settings
+from app.models.category import category_matches
+from app.models.product import Product
+from app.models.product_record import ProductRecord
+from app.models.product_search import tokenize
+from app.services import catalog_events
+from app.services.search_facets import FacetCounts, PRICE_BUCKET_EDGES, PRICE_BUCKET_LABELS
+from app.services.snapshot_refresh import RefreshingSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def columnar_engine_available() -> bool:
+    """Return whether NumPy is installed."""
+    return np is not None
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _price_cents(price) -> int:
+    return int((Decimal(price) * 100).to_integral_value())
+
+
+def _encode_labels(values: Iterable, count: int):
+    """
+    Dictionary-encode case-insensitive labels (like the NOCASE gender and
+    color columns).
+
+    Returns:
+        (int32 codes, label per code as first spelled, code per lowercase label)
+    """
+    codes_by_key: Dict[Optional[str], int] = {}
+    labels: List[Optional[str]] = []
+
+    def encode(value):
+        label = _intern(str(value)) if value is not None else None
+        key = label.lower() if label is not None else None
+        if key not in codes_by_key:
+            codes_by_key[key] = len(labels)
+            labels.append(label)
+        return codes_by_key[key]
+
+    codes = np.fromiter((encode(value) for value in values), dtype=np.int32, count=count)
+    return codes, tuple(labels), codes_by_key
+
+
+def popularity_score(record: ProductRecord) -> float:
+    """Popularity of a record (the generated ``popularity_score`` column)."""
+    return float(record.popularity_score or 0)
+
+
+# ============================================================================
+# Snapshot
+# ============================================================================
+
+class CatalogSnapshot:
+    """
+    Immutable column-oriented copy of the catalog.
+
+    Row ``i`` of every column describes ``records[i]``. Rows are stored in
+    result order (popularity descending, then product ID), so the top-k
+    matches of any filter are simply its first k matching rows.
+    """
+
+    def __init__(self, records: Sequence[ProductRecord]):
+        """
+        Build the columns for a list of records.
+
+        Args:
+            records: Product records (any order)
+        """
+        if np is None:
+            raise RuntimeError("The columnar catalog engine requires NumPy")
+
+        records = sorted(records, key=lambda r: (-popularity_score(r), r.id))
+        self.records = tuple(records)
+        # Row sort keys, for seeking to a pagination cursor by bisection
+        self._sort_keys = [(-popularity_score(r), r.id) for r in records]
+        self.built_at = time.time()
+        count = len(records)
+
+        availability_codes: Dict[str, int] = {}
+        category_codes: Dict[Optional[str], int] = {}
+
+        self.price_cents = np.fromiter(
+            (_price_cents(r.price) for r in records), dtype=np.int64, count=count
+        )
+        self.availability = np.fromiter(
+            (availability_codes.setdefault(_intern(r.availability), len(availability_codes)) for r in records),
+            dtype=np.int16, count=count
+        )
+        self.category_ids = np.fromiter(
+            (category_codes.setdefault(_intern(r.category), len(category_codes)) for r in records),
+            dtype=np.int32, count=count
+        )
+        self.color_ids, self.colors, self._color_codes = _encode_labels((r.color for r in records), count)
+        self.gender_ids, self.genders, self._gender_codes = _encode_labels((r.gender for r in records), count)
+        self.popularity = np.fromiter(
+            (popularity_score(r) for r in records), dtype=np.float32, count=count
+        )
+        self.is_buyable = np.fromiter(
+            (bool(r.is_buyable) for r in records), dtype=bool, count=count
+        )
+
+        self.availability_codes = availability_codes
+        self.categories = tuple(category_codes)
+
+        # Token -> sorted row numbers, plus a sorted vocabulary for prefix lookups
+        postings: Dict[str, List[int]] = {}
+        for row, record in enumerate(records):
+            text = " ".join(filter(None, (record.title, record.description, record.brand, record.category)))
+            for token in set(tokenize(text)):
+                postings.setdefault(sys.intern(token), []).append(row)
+        self._postings = {token: np.asarray(rows, dtype=np.int64) for token, rows in postings.items()}
+        self._vocabulary = sorted(self._postings)
+
+        for column in (
+            self.price_cents, self.availability, self.category_ids,
+            self.color_ids, self.gender_ids, self.popularity, self.is_buyable
+        ):
+            column.setflags(write=False)
+
+    @classmethod
+    def load(cls, db: Session, batch_size: int = 1000) -> "CatalogSnapshot":
+        """Read the whole catalog in batches and build a snapshot."""
+        products = db.scalars(select(Product).execution_options(yield_per=batch_size))
+        return cls([ProductRecord.from_product(product) for product in products])
+
+    def __len__(self):
+        return len(self.records)
+
+    # ========================================================================
+    # Vectorized Filters
+    # ========================================================================
+
+    def _match_query(self, query: str) -> "np.ndarray":
+        """Rows containing every query word as a word prefix."""
+        mask = np.ones(len(self.records), dtype=bool)
+        for token in tokenize(query):
+            start = bisect.bisect_left(self._vocabulary, token)
+            end = bisect.bisect_left(self._vocabulary, token + "\uffff")
+            token_mask = np.zeros(len(self.records), dtype=bool)
+            for vocabulary_token in self._vocabulary[start:end]:
+                token_mask[self._postings[vocabulary_token]] = True
+            mask &= token_mask
+        return mask
+
+    def _match_category(self, category: str) -> "np.ndarray":
+        """Rows in a category or any of its descendants (see category_filter)."""
+        matching = [
+            category_id for category_id, path in enumerate(self.categories)
+            if category_matches(path, category)
+        ]
+        return np.isin(self.category_ids, matching)
+
+    def _filter_mask(
+        self,
+        query: str = "",
+        category: Optional[str] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        availability: Optional[str] = None,
+        gender: Optional[str] = None,
+        color: Optional[str] = None,
+        buyable_only: Optional[bool] = None
+    ) -> "np.ndarray":
+        """Boolean mask of the rows matching every filter."""
+        mask = np.ones(len(self.records), dtype=bool)
+
+        if query and tokenize(query):
+            mask &= self._match_query(query)
+
+        if category:
+            mask &= self._match_category(category)
+
+        if price_min is not None:
+            mask &= self.price_cents >= _price_cents(price_min)
+
+        if price_max is not None:
+            mask &= self.price_cents <= _price_cents(price_max)
+
+        if availability:
+            code = self.availability_codes.get(availability)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.availability == code
+
+        for value, codes_by_key, column in (
+            (gender, self._gender_codes, self.gender_ids),
+            (color, self._color_codes, self.color_ids),
+        ):
+            if value:
+                code = codes_by_key.get(value.lower())
+                if code is None:
+                    mask[:] = False
+                else:
+                    mask &= column == code
+
+        if buyable_only:
+            mask &= self.is_buyable
+
+        return mask
+
+    def search(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[float, str]] = None,
+        **filters
+    ) -> List[ProductRecord]:
+        """
+        Filter the snapshot and return the top ``limit`` records by popularity.
+
+        Same filters as ProductService.search_products. ``after`` is the
+        (popularity, product ID) of the last record of the previous page;
+        only records sorting strictly after it are returned.
+        """
+        mask = self._filter_mask(**filters)
+
+        if after is not None:
+            popularity, product_id = after
+            mask[:bisect.bisect_right(self._sort_keys, (-popularity, product_id))] = False
+
+        rows = np.flatnonzero(mask)[:limit]
+        return [self.records[row] for row in rows]
+
+    def facet_counts(self, **filters) -> Dict[str, Dict[str, int]]:
+        """
+        Facet counts of all records matching the filters.
+
+        One ``bincount`` per facet column over the matching rows, in the
+        same shape as the SQL search path (see search_facets.FacetCounts).
+        """
+        mask = self._filter_mask(**filters)
+        facets = FacetCounts()
+
+        columns = (
+            ("category", self.category_ids, self.categories),
+            ("availability", self.availability, tuple(self.availability_codes)),
+            ("color", self.color_ids, self.colors),
+            ("gender", self.gender_ids, self.genders),
+        )
+        for facet, codes, values in columns:
+            counts = np.bincount(codes[mask], minlength=len(values))
+            facets.add_counts(facet, {value: int(n) for value, n in zip(values, counts) if n})
+
+        # Bucket i holds prices below PRICE_BUCKET_EDGES[i] (and at least the previous edge)
+        edges = np.asarray([edge * 100 for edge in PRICE_BUCKET_EDGES], dtype=np.int64)
+        buckets = np.searchsorted(edges, self.price_cents[mask], side="right")
+        counts = np.bincount(buckets, minlength=len(PRICE_BUCKET_LABELS))
+        facets.add_counts("price", {label: int(n) for label, n in zip(PRICE_BUCKET_LABELS, counts) if n})
+
+        return facets.to_dict()
+
+
+# ============================================================================
+# Engine (snapshot lifecycle)
+# ============================================================================
+
+class ColumnarCatalogEngine(RefreshingSnapshot[CatalogSnapshot]):
+    """
+    Owns the current snapshot of one database and rebuilds it on change.
+    """
+
+    thread_name = "catalog-snapshot-refresh"
+
+    def build(self) -> CatalogSnapshot:
+        """Load a new snapshot from the database."""
+        with Session(self.bind) as db:
+            return CatalogSnapshot.load(db)
+
+    def search(self, **filters) -> List[ProductRecord]:
+        """Search the current snapshot (see CatalogSnapshot.search)."""
+        return self.snapshot.search(**filters)
+
+    def facet_counts(self, **filters) -> Dict[str, Dict[str, int]]:
+        """Facet counts from the current snapshot (see CatalogSnapshot.facet_counts)."""
+        return self.snapshot.facet_counts(**filters)
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot size and rebuild metrics."""
+        snapshot = self._snapshot
+        return {
+            "products": len(snapshot) if snapshot else 0,
+            "built_at": snapshot.built_at if snapshot else None,
+            "rebuilds": self.rebuilds,
+            "last_build_seconds": round(self.last_build_seconds, 4),
+        }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_engines: "weakref.WeakKeyDictionary[Engine, ColumnarCatalogEngine]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+_warned_missing_numpy = False
+
+
+def get_catalog_engine(bind: Engine) -> Optional[ColumnarCatalogEngine]:
+    """
+    Return the columnar engine for a database if settings select it.
+
+    Returns:
+        ColumnarCatalogEngine, or None to use the SQL search path
+    """
+    global _warned_missing_numpy
+
+    if settings.catalog_engine != "columnar":
+        return None
+
+    if np is None:
+        if not _warned_missing_numpy:
+            logger.warning("CATALOG_ENGINE=columnar requires NumPy; falling back to SQL search")
+            _warned_missing_numpy = True
+        return None
+
+    with _registry_lock:
+        engine = _engines.get(bind)
+        if engine is None:
+            engine = ColumnarCatalogEngine(
+                bind, background_refresh=settings.catalog_snapshot_background_refresh
+            )
+            _engines[bind] = engine
+        return engine
+
+
+@catalog_events.subscribe
+def _refresh_on_catalog_change(bind: Engine, change: catalog_events.CatalogChange) -> None:
+    # Rebuild only from committed data
+    engine = _engines.get(bind)
+    if engine is not None and change.committed:
+        engine.mark_stale()
@@ -6,15 +6,27 @@ TODO: Add comprehensive tests (90% coverage target)
 """
 
 import uuid
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from app.models.checkout_session import CheckoutSession
-from app.services.product_service import ProductService
+from app.models.buyability import buyability_message
+from app.services.product_service import ProductService, ProductNotFoundError
 from app.services.inventory_service import InventoryService
 from app.services.shipping_service import ShippingService
+from app.services.pricing_engine import MINOR_UNITS, PricingEngine, from_minor, to_minor
+from app.services.session_store import SessionStore, get_session_store
+
+
+def _cart_lines(line_items: List[Dict]) -> List[Tuple[int, int]]:
+    """(unit price in minor units, quantity) per stored line item."""
+    return [
+        # Sessions created before unit_amount was stored only carry unit_price
+        (item["unit_amount"] if "unit_amount" in item else to_minor(item["unit_price"]), item["quantity"])
+        for item in line_items
+    ]
 
 
 class CheckoutService:
@@ -23,11 +35,13 @@ class CheckoutService:
     # POC: Flat tax rate
     TAX_RATE = Decimal("0.08")  # 8%
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, session_store: Optional[SessionStore] = None):
         self.db = db
+        self.session_store = session_store or get_session_store(db.get_bind())
         self.product_service = ProductService(db)
         self.inventory_service = InventoryService(db)
         self.shipping_service = ShippingService()
+        self.pricing_engine = PricingEngine(self.TAX_RATE)
     
     def create_session(
         self,
@@ -39,67 +53,70 @@ class CheckoutService:
         Create a new checkout session.
         
         Args:
-            items: List of {product_id, quantity}
+            items: List of {product_id, quantity, variant}; variant is the
+                optional variant entry (size, gtin, ...) chosen by the buyer
             address: Optional shipping address
             buyer_info: Optional buyer information
         """
         session_id = f"cs_{uuid.uuid4().hex[:16]}"
         
-        # Build line items with pricing
-        line_items = []
-        items_total = Decimal("0.00")
+        # Resolve the whole cart with one query
+        products = self.product_service.get_many_by_id(item["product_id"] for item in items)
         
+        line_items = []
+        lines = []
         for item in items:
-            product = self.product_service.get_by_id(item["product_id"])
+            product = products.get(item["product_id"])
+            if product is None:
+                raise ProductNotFoundError(f"Product with ID '{item['product_id']}' not found")
+            
+            # Restricted or unavailable products (evaluated when the product was written)
+            if not product.is_buyable:
+                raise ValueError(
+                    f"Product {product.id} cannot be purchased: {buyability_message(product.buyability_reason)}"
+                )
             
             # Check availability
-            if not self.inventory_service.check_availability(product.id, item["quantity"]):
+            if not self.inventory_service.is_available(product, item["quantity"]):
                 raise ValueError(f"Product {product.id} not available in requested quantity")
             
-            unit_price = product.price
-            quantity = item["quantity"]
-            item_total = unit_price * quantity
+            # Minor units from here on; see app.services.pricing_engine
+            unit_amount = to_minor(product.price)
+            lines.append((unit_amount, item["quantity"]))
             
-            line_items.append({
+            line_item = {
                 "gtin": product.gtin,
                 "product_id": product.id,
                 "title": product.title,
-                "quantity": quantity,
-                "unit_price": float(unit_price),
-                "total": float(item_total)
-            })
+                "quantity": item["quantity"],
+                "unit_price": unit_amount / MINOR_UNITS,
+                "unit_amount": unit_amount
+            }
+            
+            variant = item.get("variant")
+            if variant:
+                line_item["gtin"] = variant["gtin"]
+                line_item["variant"] = variant
             
-            items_total += item_total
+            line_items.append(line_item)
+        
+        pricing = self.pricing_engine.price_cart(lines)
+        for line_item, line_total in zip(line_items, pricing.line_totals):
+            line_item["total"] = line_total / MINOR_UNITS
         
         # Calculate shipping if address provided
         fulfillment_options = None
-        shipping_cost = Decimal("0.00")
-        selected_option_id = None
+        selected_option = None
         
         if address:
             is_valid, error = self.shipping_service.validate_address(address)
             if not is_valid:
                 raise ValueError(f"Invalid address: {error}")
             
-            fulfillment_options = self.shipping_service.calculate_options(address, items_total)
+            fulfillment_options = self.shipping_service.calculate_options(address, from_minor(pricing.items_total))
             # Default to standard shipping
-            shipping_cost = Decimal(fulfillment_options[0]["cost"])
-            selected_option_id = fulfillment_options[0]["id"]
-        
-        # Calculate totals
-        subtotal = items_total
-        tax = subtotal * self.TAX_RATE
-        total = subtotal + shipping_cost + tax
-        
-        totals = {
-            "items_total": {"value": str(items_total), "currency": "USD"},
-            "discounts": {"value": "0.00", "currency": "USD"},
-            "subtotal": {"value": str(subtotal), "currency": "USD"},
-            "fulfillment": {"value": str(shipping_cost), "currency": "USD"},
-            "taxes": {"value": str(tax), "currency": "USD"},
-            "fees": {"value": "0.00", "currency": "USD"},
-            "total": {"value": str(total), "currency": "USD"}
-        }
+            selected_option = fulfillment_options[0]
+            pricing = self.pricing_engine.with_fulfillment(pricing, selected_option)
         
         # Determine status
         status = "ready_for_payment" if address else "not_ready_for_payment"
@@ -112,23 +129,19 @@ class CheckoutService:
             line_items=line_items,
             fulfillment_address=address,
             fulfillment_options=fulfillment_options,
-            selected_fulfillment_option_id=selected_option_id,
-            totals=totals,
+            selected_fulfillment_option_id=selected_option["id"] if selected_option else None,
+            totals=pricing.to_totals(),
             buyer_info=buyer_info,
             expires_at=datetime.utcnow() + timedelta(hours=24)
         )
         
-        self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        self.session_store.add(self.db, session)
         
         return session
     
     def get_session(self, session_id: str) -> CheckoutSession:
         """Get checkout session by ID."""
-        session = self.db.query(CheckoutSession).filter(
-            CheckoutSession.id == session_id
-        ).first()
+        session = self.session_store.get(self.db, session_id)
         
         if not session:
             raise ValueError(f"Session {session_id} not found")
@@ -156,52 +169,62 @@ class CheckoutService:
             session.fulfillment_address = address
             
             # Recalculate shipping
-            items_total = Decimal(session.totals["items_total"]["value"])
-            fulfillment_options = self.shipping_service.calculate_options(address, items_total)
+            pricing = self.pricing_engine.price_cart(_cart_lines(session.line_items))
+            fulfillment_options = self.shipping_service.calculate_options(address, from_minor(pricing.items_total))
             session.fulfillment_options = fulfillment_options
             
             # Use provided option or default to first
-            if fulfillment_option_id:
-                session.selected_fulfillment_option_id = fulfillment_option_id
-            else:
-                session.selected_fulfillment_option_id = fulfillment_options[0]["id"]
-            
-            # Recalculate totals
             selected_option = next(
-                (opt for opt in fulfillment_options if opt["id"] == session.selected_fulfillment_option_id),
+                (opt for opt in fulfillment_options if opt["id"] == fulfillment_option_id),
                 fulfillment_options[0]
             )
-            shipping_cost = Decimal(selected_option["cost"])
-            tax = items_total * self.TAX_RATE
-            total = items_total + shipping_cost + tax
-            
-            session.totals["fulfillment"] = {"value": str(shipping_cost), "currency": "USD"}
-            session.totals["taxes"] = {"value": str(tax), "currency": "USD"}
-            session.totals["total"] = {"value": str(total), "currency": "USD"}
+            session.selected_fulfillment_option_id = selected_option["id"]
+            session.totals = self.pricing_engine.with_fulfillment(pricing, selected_option).to_totals()
             
             # Update status
             session.status = "ready_for_payment"
         
         # Update fulfillment option if provided
         elif fulfillment_option_id and session.fulfillment_options:
-            session.selected_fulfillment_option_id = fulfillment_option_id
-            
-            # Recalculate totals
             selected_option = next(
-                opt for opt in session.fulfillment_options 
-                if opt["id"] == fulfillment_option_id
+                (opt for opt in session.fulfillment_options if opt["id"] == fulfillment_option_id),
+                None
             )
-            items_total = Decimal(session.totals["items_total"]["value"])
-            shipping_cost = Decimal(selected_option["cost"])
-            tax = items_total * self.TAX_RATE
-            total = items_total + shipping_cost + tax
+            if selected_option is None:
+                raise ValueError(f"Unknown fulfillment option: {fulfillment_option_id}")
             
-            session.totals["fulfillment"] = {"value": str(shipping_cost), "currency": "USD"}
-            session.totals["total"] = {"value": str(total), "currency": "USD"}
+            session.selected_fulfillment_option_id = fulfillment_option_id
+            session.totals = self.pricing_engine.price_cart(
+                _cart_lines(session.line_items), selected_option
+            ).to_totals()
+        
+        session.updated_at = datetime.utcnow()
+        self.session_store.save(self.db, session)
+        
+        return session
+    
+    def complete_session(self, session: CheckoutSession, payment_token_id: str, order_id: str) -> CheckoutSession:
+        """
+        Mark a session completed by an order.
+        
+        Always written synchronously; call inside the unit_of_work() that
+        creates the order so both commit together.
+        """
+        session.status = "completed"
+        session.payment_token_id = payment_token_id
+        session.order_id = order_id
+        session.updated_at = datetime.utcnow()
+        self.session_store.persist(self.db, session)
+        
+        return session
+    
+    def cancel_session(self, session_id: str) -> CheckoutSession:
+        """Cancel a checkout session (written synchronously)."""
+        session = self.get_session(session_id)
         
+        session.status = "canceled"
         session.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(session)
+        self.session_store.persist(self.db, session)
         
         return session
 
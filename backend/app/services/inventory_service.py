@@ -27,6 +27,15 @@ class InventoryService:
         if not product:
             return False
         
+        return self.is_available(product, quantity)
+    
+    def is_available(self, product: Product, quantity: int) -> bool:
+        """
+        Check availability of an already-loaded product.
+        
+        Lets callers that resolved a whole cart up front skip the per-item
+        query made by check_availability().
+        """
         # For POC: in_stock = available for any reasonable quantity
         return product.availability == "in_stock" and quantity <= 10
     
@@ -10,6 +10,7 @@ from typing import Dict
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.database import commit
 from app.models.order import Order
 from app.models.order_event import OrderEvent
 from app.models.checkout_session import CheckoutSession
@@ -73,8 +74,7 @@ class OrderService:
         )
         
         self.db.add(event)
-        self.db.commit()
-        self.db.refresh(order)
+        commit(self.db, expire=False)
         
         return order
     
@@ -107,8 +107,7 @@ class OrderService:
         )
         
         self.db.add(event)
-        self.db.commit()
-        self.db.refresh(order)
+        commit(self.db, expire=False)
         
         return order
 
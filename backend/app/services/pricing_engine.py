@@ -0,0 +1,164 @@
+"""
+Pricing Engine
+
+Prices a resolved cart in one pass, in integer minor units (cents).
+
+Amounts are converted to minor units once, where they enter (product
+prices, shipping option costs), and everything after that is integer
+arithmetic: line totals, tax, fees and the grand total. Only the final
+breakdown is formatted back to the decimal strings stored in
+``CheckoutSession.totals``, so large carts cost one multiplication and one
+addition per line.
+"""
+
+from dataclasses import dataclass, field, replace
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+# Minor units per major unit (all supported currencies have two decimals)
+MINOR_UNITS = 100
+
+_TOTALS_ORDER = ("items_total", "discounts", "subtotal", "fulfillment", "taxes", "fees", "total")
+
+
+def to_minor(amount: Any) -> int:
+    """
+    Convert a decimal amount (Decimal, str, int or float) to minor units.
+
+    Half-cents round away from zero.
+
+    Example:
+        >>> to_minor("19.99")
+        1999
+    """
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int((amount * MINOR_UNITS).to_integral_value(ROUND_HALF_UP))
+
+
+def from_minor(minor: int) -> Decimal:
+    """Convert minor units back to a Decimal amount (exact)."""
+    return Decimal(minor) / MINOR_UNITS
+
+
+def format_minor(minor: int) -> str:
+    """
+    Format minor units as a decimal string with two places.
+
+    Example:
+        >>> format_minor(1999)
+        '19.99'
+    """
+    sign = "-" if minor < 0 else ""
+    units, cents = divmod(abs(minor), MINOR_UNITS)
+    return f"{sign}{units}.{cents:02d}"
+
+
+@dataclass
+class CartPricing:
+    """
+    Price breakdown of a cart, in minor units.
+
+    Attributes:
+        line_totals: Unit price times quantity, per cart line
+        items_total: Sum of the line totals
+        discounts: Discounts applied to the items
+        fulfillment: Shipping cost
+        taxes: Tax on the discounted items total
+        fees: Additional fees
+        currency: ISO 4217 code
+    """
+
+    line_totals: List[int] = field(default_factory=list)
+    items_total: int = 0
+    discounts: int = 0
+    fulfillment: int = 0
+    taxes: int = 0
+    fees: int = 0
+    currency: str = "USD"
+
+    @property
+    def subtotal(self) -> int:
+        return self.items_total - self.discounts
+
+    @property
+    def total(self) -> int:
+        return self.subtotal + self.fulfillment + self.taxes + self.fees
+
+    def to_totals(self) -> Dict[str, Dict[str, str]]:
+        """Breakdown as stored in ``CheckoutSession.totals`` ({"value": "12.34", "currency": "USD"} each)."""
+        return {
+            name: {"value": format_minor(getattr(self, name)), "currency": self.currency}
+            for name in _TOTALS_ORDER
+        }
+
+
+class PricingEngine:
+    """
+    Prices carts with a flat tax rate.
+
+    Example:
+        >>> engine = PricingEngine(Decimal("0.08"))
+        >>> pricing = engine.price_cart([(12000, 2)], fulfillment_option={"cost": "5.00"})
+        >>> pricing.to_totals()["total"]["value"]
+        '264.20'
+    """
+
+    def __init__(self, tax_rate: Decimal, currency: str = "USD"):
+        """
+        Initialize the engine.
+
+        Args:
+            tax_rate: Tax rate as a fraction (e.g., Decimal("0.08"))
+            currency: Currency of every cart priced
+        """
+        # Rate in hundredths of a basis point, so tax stays integer math
+        self._rate_numerator = int(Decimal(tax_rate) * 1_000_000)
+        self._rate_denominator = 1_000_000
+        self.currency = currency
+
+    def price_cart(
+        self,
+        lines: Iterable[Tuple[int, int]],
+        fulfillment_option: Optional[Mapping[str, Any]] = None
+    ) -> CartPricing:
+        """
+        Price a cart.
+
+        Args:
+            lines: (unit price in minor units, quantity) per cart line
+            fulfillment_option: Chosen shipping option (its "cost" is
+                charged), or None before an address is known
+
+        Returns:
+            CartPricing with line totals and the full breakdown
+        """
+        line_totals = [unit_amount * quantity for unit_amount, quantity in lines]
+        pricing = CartPricing(line_totals=line_totals, items_total=sum(line_totals), currency=self.currency)
+        return self.with_fulfillment(pricing, fulfillment_option)
+
+    def with_fulfillment(
+        self,
+        pricing: CartPricing,
+        fulfillment_option: Optional[Mapping[str, Any]]
+    ) -> CartPricing:
+        """
+        Reprice a cart for another shipping option without revisiting its lines.
+
+        Args:
+            pricing: Result of price_cart()
+            fulfillment_option: Chosen shipping option, or None
+
+        Returns:
+            New CartPricing with fulfillment and taxes updated
+        """
+        fulfillment = to_minor(fulfillment_option["cost"]) if fulfillment_option is not None else 0
+        return replace(pricing, fulfillment=fulfillment, taxes=self._tax(pricing.subtotal))
+
+    def _tax(self, taxable: int) -> int:
+        """Tax on an amount, half-cents rounded up."""
+        quotient, remainder = divmod(taxable * self._rate_numerator, self._rate_denominator)
+        return quotient + (1 if 2 * remainder >= self._rate_denominator else 0)
@@ -0,0 +1,242 @@
+"""
+Product Cache
+
+Process-local, read-through cache of product records keyed by ID and GTIN.
+
+Catalog rows change a few times a day at most, while get_by_id/get_by_gtin
+are the hottest reads in both the ACP and MCP flows. Entries are immutable
+ProductRecord snapshots, bounded by LRU eviction and a TTL, and are dropped:
+- when a product write goes through any ORM session (catalog change events)
+- when a newer ``updated_at`` is observed for a cached product
+- when their TTL expires (bounds staleness from writers in other processes)
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.gtin import canonical_gtin
+from app.models.product_record import ProductRecord
+from app.services import catalog_events
+
+
+def _gtin_key(gtin: str) -> str:
+    """Index GTINs by canonical form, so UPC-A, EAN-13 and GTIN-14 share an entry."""
+    return canonical_gtin(gtin) or gtin
+
+
+class ProductCache:
+    """
+    Size-bounded LRU cache with TTL for ProductRecord instances.
+
+    Records are stored once per product ID; GTINs (product and variant) are
+    aliases pointing at the product ID. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize Product Cache.
+
+        Args:
+            max_size: Maximum number of products held
+            ttl_seconds: Time-to-live of each entry
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # product_id -> (record, expires_at, gtin aliases)
+        self._entries: "OrderedDict[str, Tuple[ProductRecord, float, Tuple[str, ...]]]" = OrderedDict()
+        self._gtin_index: Dict[str, str] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # ========================================================================
+    # Reads
+    # ========================================================================
+
+    def get_by_id(self, product_id: str) -> Optional[ProductRecord]:
+        """Return the cached record for a product ID, or None on a miss."""
+        with self._lock:
+            return self._get(product_id)
+
+    def get_by_gtin(self, gtin: str) -> Optional[ProductRecord]:
+        """Return the cached record for a product or variant GTIN (in any equivalent form), or None on a miss."""
+        with self._lock:
+            product_id = self._gtin_index.get(_gtin_key(gtin))
+            if product_id is None:
+                self.misses += 1
+                return None
+            return self._get(product_id)
+
+    def _get(self, product_id: str) -> Optional[ProductRecord]:
+        entry = self._entries.get(product_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        record, expires_at, _ = entry
+        if self._clock() >= expires_at:
+            self._remove(product_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(product_id)
+        self.hits += 1
+        return record
+
+    # ========================================================================
+    # Writes
+    # ========================================================================
+
+    def put(self, record: ProductRecord, gtins: Iterable[str] = ()) -> ProductRecord:
+        """
+        Cache a record.
+
+        Args:
+            record: Product snapshot
+            gtins: Extra GTINs (e.g., a variant GTIN) that should resolve to it
+
+        Returns:
+            The cached record
+        """
+        aliases = tuple(dict.fromkeys(_gtin_key(gtin) for gtin in [record.gtin, *gtins]))
+
+        with self._lock:
+            if record.id in self._entries:
+                self._remove(record.id)
+
+            self._entries[record.id] = (record, self._clock() + self.ttl_seconds, aliases)
+            for gtin in aliases:
+                self._gtin_index[gtin] = record.id
+
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._remove(oldest_id)
+                self.evictions += 1
+
+        return record
+
+    def invalidate(
+        self,
+        product_ids: Optional[Iterable[str]] = None,
+        gtins: Iterable[str] = ()
+    ) -> None:
+        """
+        Drop entries by product ID and/or GTIN.
+
+        Args:
+            product_ids: Products to drop; None drops everything
+            gtins: GTINs whose products should be dropped
+        """
+        with self._lock:
+            if product_ids is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._gtin_index.clear()
+                return
+
+            targets = set(product_ids)
+            keys = {_gtin_key(gtin) for gtin in gtins}
+            targets.update(
+                self._gtin_index[key] for key in keys if key in self._gtin_index
+            )
+            for product_id in targets:
+                if product_id in self._entries:
+                    self._remove(product_id)
+                    self.invalidations += 1
+
+    def discard_if_stale(self, product_id: str, updated_at: Optional[datetime]) -> None:
+        """Drop a cached product if the database holds a newer version."""
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is None:
+                return
+            cached_updated_at = entry[0].updated_at
+            if updated_at != cached_updated_at:
+                self._remove(product_id)
+                self.invalidations += 1
+
+    def _remove(self, product_id: str) -> None:
+        _, _, aliases = self._entries.pop(product_id)
+        for gtin in aliases:
+            if self._gtin_index.get(gtin) == product_id:
+                del self._gtin_index[gtin]
+
+    # ========================================================================
+    # Metrics
+    # ========================================================================
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss/eviction counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_caches: "weakref.WeakKeyDictionary[Engine, ProductCache]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_product_cache(bind: Engine) -> Optional[ProductCache]:
+    """
+    Return the product cache for a database, creating it on first use.
+
+    Returns:
+        ProductCache, or None when caching is disabled in settings
+    """
+    if not settings.product_cache_enabled:
+        return None
+
+    with _registry_lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = ProductCache(
+                max_size=settings.product_cache_max_size,
+                ttl_seconds=settings.product_cache_ttl_seconds
+            )
+            _caches[bind] = cache
+        return cache
+
+
+@catalog_events.subscribe
+def _invalidate_on_catalog_change(bind: Engine, change: catalog_events.CatalogChange) -> None:
+    cache = _caches.get(bind)
+    if cache is None:
+        return
+    if change.is_full:
+        cache.invalidate()
+    else:
+        cache.invalidate(change.product_ids, change.gtins)
@@ -5,12 +5,34 @@ Protocol-agnostic service for product catalog operations.
 This service has NO knowledge of ACP, MCP, or any external protocols.
 """
 
-from typing import List, Optional, Tuple
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select, literal_column, func
 
 from app.models.product import Product
+from app.models.product_record import ProductRecord, freeze
+from app.models.product_variant import ProductVariant
+from app.models.category import Category, category_filter, category_key
+from app.models.buyability import buyability_message
+from app.models.gtin import canonical_gtin
+from app.models.product_search import (
+    products_fts,
+    build_match_expression,
+    search_index_available,
+)
+from app.services.product_cache import get_product_cache
+from app.services.catalog_snapshot import get_catalog_engine, popularity_score
+from app.services.search_cache import get_search_cache, search_cache_key
+from app.services.trigram_index import get_trigram_index
+from app.services.autocomplete import Completion, MAX_COMPLETIONS, get_autocomplete_engine
+from app.services.catalog_delta import CatalogDelta, Watermark
+from app.services.search_facets import FacetCounts, price_bucket_expression
 
 
 # ============================================================================
@@ -27,6 +49,96 @@ class InvalidGTINError(Exception):
     pass
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a search continuation token is malformed or was issued for a different search."""
+    pass
+
+
+# ============================================================================
+# Search Pagination
+# ============================================================================
+
+SORT_RELEVANCE = "relevance"
+SORT_POPULARITY = "popularity"
+SEARCH_SORTS = (SORT_RELEVANCE, SORT_POPULARITY)
+
+_CURSOR_VERSION = 1
+
+
+@dataclass
+class SearchPage:
+    """
+    One page of search results.
+    
+    Attributes:
+        items: Products on this page
+        next_cursor: Opaque token for the next page, or None on the last page
+        sort: Sort order actually applied ("relevance" or "popularity")
+        facets: Counts per facet value over all matching products (not
+            just this page), when requested
+        corrected_query: Typo-corrected query the results are for, when
+            the query as given matched nothing
+    """
+    
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    sort: str = SORT_POPULARITY
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+    corrected_query: Optional[str] = None
+
+
+def _search_fingerprint(sort: str, **filters) -> str:
+    """
+    Short digest of the search parameters a cursor is valid for.
+    
+    Normalized like search cache keys, so a cursor from a cached page stays
+    valid for every spelling of the search that shares the page.
+    """
+    payload = json.dumps(search_cache_key("cursor", sort=sort, **filters))
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def encode_cursor(sort: str, key: float, product_id: str, fingerprint: str) -> str:
+    """Encode the sort position of the last product on a page."""
+    payload = json.dumps(
+        {"v": _CURSOR_VERSION, "s": sort, "k": key, "id": product_id, "f": fingerprint},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, fingerprint: str) -> Tuple[float, str]:
+    """
+    Decode a cursor issued by encode_cursor.
+    
+    Returns:
+        (sort key, product ID) of the last product of the previous page
+        
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another search
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        version, cursor_sort, key, product_id, cursor_fingerprint = (
+            payload["v"], payload["s"], payload["k"], payload["id"], payload["f"]
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError):
+        raise InvalidCursorError("Malformed search cursor")
+    
+    if (
+        version != _CURSOR_VERSION
+        or not isinstance(key, (int, float))
+        or not isinstance(product_id, str)
+    ):
+        raise InvalidCursorError("Malformed search cursor")
+    
+    if cursor_sort != sort or cursor_fingerprint != fingerprint:
+        raise InvalidCursorError("Search cursor does not match the search parameters")
+    
+    return float(key), product_id
+
+
 # ============================================================================
 # Product Service
 # ============================================================================
@@ -47,6 +159,11 @@ class ProductService:
             db: Database session
         """
         self.db = db
+        self.cache = get_product_cache(db.get_bind())
+        self.catalog_engine = get_catalog_engine(db.get_bind())
+        self.search_cache = get_search_cache(db.get_bind())
+        self.trigram_index = get_trigram_index(db.get_bind())
+        self.autocomplete_engine = get_autocomplete_engine(db.get_bind())
     
     def search_products(
         self,
@@ -55,18 +172,42 @@ class ProductService:
         price_min: Optional[Decimal] = None,
         price_max: Optional[Decimal] = None,
         availability: Optional[str] = None,
-        limit: int = 100
-    ) -> List[Product]:
+        limit: int = 100,
+        gender: Optional[str] = None,
+        color: Optional[str] = None,
+        buyable_only: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> List[Product | ProductRecord]:
         """
         Search products with filters.
         
+        Text queries use the FTS5 index (title, description, brand and
+        category) and return matches ranked by relevance. Databases without
+        FTS5 fall back to an ILIKE scan of title and description. Searches
+        without a text query are ordered by popularity. Ties are broken by
+        product ID, so the order is stable across calls.
+        
+        A text query that matches nothing is retried with misspelled words
+        corrected against the words of product titles and brands ("air maxx"
+        finds "Nike Air Max 90").
+        
+        With ``catalog_engine = "columnar"`` in settings, the search runs
+        against the in-memory catalog snapshot instead and returns read-only
+        records ordered by popularity.
+        
         Args:
-            query: Search query (searches title and description)
-            category: Filter by category (partial match)
+            query: Search query
+            category: Filter by category path or node name, including
+                descendants (e.g., "Shoes > Running" or "Running")
             price_min: Minimum price filter
             price_max: Maximum price filter
             availability: Filter by availability status
             limit: Maximum number of results
+            gender: Filter by metadata gender (case-insensitive)
+            color: Filter by metadata color (case-insensitive)
+            buyable_only: Exclude products that cannot be purchased
+            fields: Product attributes the caller reads (see
+                search_products_page); None for whole products
             
         Returns:
             List of matching products
@@ -79,22 +220,277 @@ class ProductService:
             ...     availability="in_stock"
             ... )
         """
+        return self.search_products_page(
+            query=query,
+            category=category,
+            price_min=price_min,
+            price_max=price_max,
+            availability=availability,
+            limit=limit,
+            gender=gender,
+            color=color,
+            buyable_only=buyable_only,
+            fields=fields
+        ).items
+    
+    def search_products_page(
+        self,
+        query: str = "",
+        category: Optional[str] = None,
+        price_min: Optional[Decimal] = None,
+        price_max: Optional[Decimal] = None,
+        availability: Optional[str] = None,
+        limit: int = 20,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        facets: bool = False,
+        gender: Optional[str] = None,
+        color: Optional[str] = None,
+        buyable_only: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> SearchPage:
+        """
+        Search products one page at a time.
+        
+        Pages use keyset pagination: the cursor carries the sort key and ID
+        of the last product returned, and the next page starts strictly
+        after it. No rows are skipped with OFFSET, and products inserted or
+        deleted between requests never shift results between pages.
+        
+        Pages are cached per normalized search parameters (see
+        app.services.search_cache) and returned as read-only records. Any
+        catalog write invalidates the cache.
+        
+        If a text query matches nothing, the page is for the typo-corrected
+        query instead and ``corrected_query`` says so. Its cursors continue
+        with either query.
+        
+        List views that show a few attributes per product should name them
+        in ``fields``: only those columns are read (plus ``id`` and
+        ``updated_at``), skipping long descriptions and the variant and
+        metadata JSON. Items are then read-only records on which any other
+        attribute raises AttributeError. Detail lookups (get_by_id(),
+        get_by_gtin()) always load whole products.
+        
+        Args:
+            query: Search query
+            category: Filter by category path or node name, including
+                descendants (e.g., "Shoes > Running" or "Running")
+            price_min: Minimum price filter
+            price_max: Maximum price filter
+            availability: Filter by availability status
+            limit: Page size
+            sort: "relevance" (default with a text query) or "popularity"
+                (default otherwise). Relevance needs a text query and the
+                FTS5 index, and falls back to popularity without them.
+            cursor: ``next_cursor`` of the previous page
+            facets: Also count all matching products per category,
+                availability, price bucket, color and gender
+            gender: Filter by metadata gender (case-insensitive)
+            color: Filter by metadata color (case-insensitive)
+            buyable_only: Exclude products that cannot be purchased
+            fields: Product attributes to load; None for whole products
+            
+        Returns:
+            SearchPage with the products and the cursor of the next page
+            
+        Raises:
+            ValueError: If sort is not supported, limit is not positive or
+                fields names an unknown attribute
+            InvalidCursorError: If the cursor is malformed or was issued for
+                different search parameters
+            
+        Example:
+            >>> page = service.search_products_page(query="running", limit=20)
+            >>> while page.next_cursor:
+            ...     page = service.search_products_page(
+            ...         query="running", limit=20, cursor=page.next_cursor
+            ...     )
+        """
+        if sort is not None and sort not in SEARCH_SORTS:
+            raise ValueError(f"Unsupported sort: {sort}")
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        projection = ProductRecord.projection(fields) if fields is not None else None
+        
+        filters = {
+            "query": query,
+            "category": category,
+            "price_min": price_min,
+            "price_max": price_max,
+            "availability": availability,
+            "gender": gender,
+            "color": color,
+            "buyable_only": buyable_only or None,
+        }
+        
+        if self.catalog_engine or not self.search_cache:
+            return self._search_page(filters, limit, sort, cursor, facets, projection)
+        
+        cache_key = search_cache_key(
+            "product_service.search_page",
+            limit=limit, sort=sort, cursor=cursor, facets=facets, fields=projection, **filters
+        )
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return replace(cached, items=list(cached.items))
+        
+        # Read before searching: a write landing mid-search discards the result
+        generation = self.search_cache.generation
+        page = self._search_page(filters, limit, sort, cursor, facets, projection)
+        if projection is None:
+            page.items = [ProductRecord.from_product(product) for product in page.items]
+        page.facets = freeze(page.facets)
+        
+        self.search_cache.put(cache_key, replace(page, items=tuple(page.items)), generation)
+        return page
+    
+    def _search_page(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        sort: Optional[str],
+        cursor: Optional[str],
+        facets: bool,
+        projection: Optional[Tuple[str, ...]] = None
+    ) -> SearchPage:
+        """Run a search, retrying with a typo-corrected query if nothing matches."""
+        search = self._search_snapshot_page if self.catalog_engine else self._search_sql_page
+        
+        try:
+            page = search(filters, limit, sort, cursor, facets, projection)
+        except InvalidCursorError:
+            # Later pages of a corrected search carry cursors of the corrected query
+            corrected = self._correct_query(filters["query"])
+            if corrected is None:
+                raise
+            page = search(dict(filters, query=corrected), limit, sort, cursor, facets, projection)
+            page.corrected_query = corrected
+            return page
+        
+        if page.items or cursor:
+            return page
+        
+        corrected = self._correct_query(filters["query"])
+        if corrected is None:
+            return page
+        
+        page = search(dict(filters, query=corrected), limit, sort, None, facets, projection)
+        page.corrected_query = corrected
+        return page
+    
+    def _correct_query(self, query: str) -> Optional[str]:
+        """Replace unknown words of a query with the closest title or brand words."""
+        if not query or not self.trigram_index:
+            return None
+        return self.trigram_index.correct(query)
+    
+    def _search_sql_page(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        sort: Optional[str],
+        cursor: Optional[str],
+        facets: bool,
+        projection: Optional[Tuple[str, ...]] = None
+    ) -> SearchPage:
+        """Page through the products table (FTS5 relevance or popularity order)."""
+        query_obj, rank = self._search_query(**filters)
+        facet_counts = self._facet_counts(query_obj) if facets else None
+        
+        applied_sort = sort or SORT_RELEVANCE
+        if applied_sort == SORT_RELEVANCE and rank is None:
+            applied_sort = SORT_POPULARITY
+        fingerprint = _search_fingerprint(sort or "", **filters)
+        
+        # (sort key, ascending) - ties always broken by ascending product ID
+        if applied_sort == SORT_RELEVANCE:
+            sort_key, ascending = rank, True  # bm25: lower is better
+        else:
+            sort_key, ascending = Product.popularity_score, False  # ix_products_popularity
+        
+        if cursor:
+            last_key, last_id = decode_cursor(cursor, applied_sort, fingerprint)
+            after_key = sort_key > last_key if ascending else sort_key < last_key
+            # The redundant bound gives SQLite a range to seek the sort index
+            # to; the OR alone is planned as a scan from the first row
+            seek = sort_key >= last_key if ascending else sort_key <= last_key
+            query_obj = query_obj.filter(
+                seek, or_(after_key, and_(sort_key == last_key, Product.id > last_id))
+            )
+        
+        if projection is not None:
+            # Plain rows of the projected columns: no ORM identities to fill in later
+            query_obj = query_obj.with_entities(*ProductRecord.columns(projection))
+        
+        rows = (
+            query_obj
+            .add_columns(sort_key)
+            .order_by(sort_key if ascending else sort_key.desc(), Product.id)
+            .limit(limit + 1)
+            .all()
+        )
+        
+        if projection is None:
+            products = [product for product, _ in rows[:limit]]
+        else:
+            products = [ProductRecord.from_row(row._mapping, projection) for row in rows[:limit]]
+        self._observe(products)
+        
+        next_cursor = None
+        if len(rows) > limit:
+            last_key = rows[limit - 1][-1]
+            next_cursor = encode_cursor(applied_sort, last_key, products[-1].id, fingerprint)
+        
+        return SearchPage(items=products, next_cursor=next_cursor, sort=applied_sort, facets=facet_counts)
+    
+    def _search_query(
+        self,
+        query: str,
+        category: Optional[str],
+        price_min: Optional[Decimal],
+        price_max: Optional[Decimal],
+        availability: Optional[str],
+        gender: Optional[str],
+        color: Optional[str],
+        buyable_only: Optional[bool]
+    ):
+        """
+        Build the filtered product query.
+        
+        Returns:
+            (query, rank column or None when the search is not ranked by FTS5)
+        """
         # Start with base query
         query_obj = self.db.query(Product)
+        rank = None
         
         # Apply search query (case-insensitive)
         if query:
-            search_term = f"%{query.lower()}%"
-            query_obj = query_obj.filter(
-                or_(
-                    Product.title.ilike(search_term),
-                    Product.description.ilike(search_term)
+            match_expression = build_match_expression(query)
+            
+            if match_expression and search_index_available(self.db.connection()):
+                matches = (
+                    select(products_fts.c.rowid, products_fts.c.rank)
+                    .where(products_fts.c.products_fts.match(match_expression))
+                    .subquery()
+                )
+                query_obj = query_obj.join(
+                    matches, matches.c.rowid == literal_column("products.rowid")
+                )
+                rank = matches.c.rank
+            else:
+                search_term = f"%{query.lower()}%"
+                query_obj = query_obj.filter(
+                    or_(
+                        Product.title.ilike(search_term),
+                        Product.description.ilike(search_term)
+                    )
                 )
-            )
         
         # Apply filters
         if category:
-            query_obj = query_obj.filter(Product.category.ilike(f"%{category}%"))
+            query_obj = query_obj.filter(Product.id.in_(category_filter(category)))
         
         if price_min is not None:
             query_obj = query_obj.filter(Product.price >= price_min)
@@ -105,18 +501,217 @@ class ProductService:
         if availability:
             query_obj = query_obj.filter(Product.availability == availability)
         
-        # Apply limit and execute
-        return query_obj.limit(limit).all()
+        # Generated columns with NOCASE collation: indexed, case-insensitive
+        if gender:
+            query_obj = query_obj.filter(Product.gender == gender)
+        
+        if color:
+            query_obj = query_obj.filter(Product.color == color)
+        
+        if buyable_only:
+            query_obj = query_obj.filter(Product.is_buyable.is_(True))
+        
+        return query_obj, rank
+    
+    def _facet_counts(self, query_obj) -> Dict[str, Dict[str, int]]:
+        """
+        Count the products matched by a search query per facet value.
+        
+        One GROUP BY over every facet dimension at once; the resulting cells
+        are rolled up per facet in Python.
+        """
+        dimensions = (
+            Product.category,
+            Product.availability,
+            price_bucket_expression(Product.price),
+            Product.color,
+            Product.gender,
+        )
+        cells = (
+            query_obj
+            .order_by(None)
+            .with_entities(*dimensions, func.count())
+            .group_by(*dimensions)
+        )
+        
+        counts = FacetCounts()
+        for category, availability, price, color, gender, count in cells:
+            counts.add(category, availability, price, color, gender, count)
+        return counts.to_dict()
+    
+    def _search_snapshot_page(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        sort: Optional[str],
+        cursor: Optional[str],
+        facets: bool,
+        projection: Optional[Tuple[str, ...]] = None
+    ) -> SearchPage:
+        """Page through the columnar snapshot (always popularity-ordered; records are already whole)."""
+        fingerprint = _search_fingerprint(sort or "", **filters)
+        after = decode_cursor(cursor, SORT_POPULARITY, fingerprint) if cursor else None
+        
+        snapshot = self.catalog_engine.snapshot  # One snapshot for results and facets
+        records = snapshot.search(limit=limit + 1, after=after, **filters)
+        facet_counts = snapshot.facet_counts(**filters) if facets else None
+        
+        next_cursor = None
+        if len(records) > limit:
+            last = records[limit - 1]
+            next_cursor = encode_cursor(SORT_POPULARITY, popularity_score(last), last.id, fingerprint)
+        
+        return SearchPage(
+            items=records[:limit],
+            next_cursor=next_cursor,
+            sort=SORT_POPULARITY,
+            facets=facet_counts
+        )
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """
+        Suggest product titles, brands and categories starting with a prefix.
+        
+        Served from an in-memory trie of the catalog (no database query),
+        most popular first. Titles also complete without their brand.
+        
+        Args:
+            prefix: Text typed so far (case-insensitive)
+            limit: Maximum number of suggestions (at most 20)
+            
+        Returns:
+            Completions, most popular first
+            
+        Raises:
+            ValueError: If limit is out of range
+            
+        Example:
+            >>> [c.text for c in service.autocomplete("air m", limit=2)]
+            ['Nike Air Max 270', 'Nike Air Max 90']
+        """
+        if limit < 1 or limit > MAX_COMPLETIONS:
+            raise ValueError(f"Limit must be between 1 and {MAX_COMPLETIONS}")
+        if not prefix.strip():
+            return []
+        
+        return self.autocomplete_engine.complete(prefix, limit)
+    
+    def iter_catalog(self, after: Optional[str] = None, batch_size: int = 1000) -> Iterator[ProductRecord]:
+        """
+        Walk the whole catalog in product ID order, for feeds and exports.
+        
+        Rows are read ``batch_size`` at a time and yielded as read-only
+        records without ORM identity tracking, so memory use does not grow
+        with the catalog. Each batch is its own keyset query on a short-lived
+        connection, so no read transaction (and no SQLite shared lock) is
+        held while the caller consumes the rows: a slow feed download never
+        blocks writers.
+        
+        Args:
+            after: Resume after this product ID (the last one received)
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            ProductRecord per product, ordered by ID
+            
+        Raises:
+            ValueError: If batch_size is not positive
+            
+        Example:
+            >>> for record in service.iter_catalog(after="nike-air-max-90"):
+            ...     write(record.to_dict())
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        
+        bind = self.db.get_bind()
+        table = Product.__table__
+        statement = select(*ProductRecord.columns()).order_by(table.c.id).limit(batch_size)
+        
+        while True:
+            batch = statement.where(table.c.id > after) if after else statement
+            with bind.connect() as connection:
+                rows = connection.execute(batch).mappings().all()
+            
+            for row in rows:
+                yield ProductRecord.from_row(row)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1]["id"]
     
-    def get_by_id(self, product_id: str) -> Product:
+    def changes_since(
+        self,
+        since: Optional[Watermark] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> CatalogDelta:
+        """
+        Products changed or deleted after a watermark, for incremental feeds.
+        
+        Changes are read in batches in (timestamp, product ID) order, like
+        iter_catalog(), without holding a read transaction in between.
+        Deleted products appear as "delete" entries (tombstones). After
+        iterating, ``watermark`` on the result is the position to request
+        next time.
+        
+        Args:
+            since: Last change already applied; None for every product
+            limit: Maximum number of changes; None for all of them
+            batch_size: Rows fetched per round trip
+            
+        Returns:
+            CatalogDelta to iterate once
+            
+        Raises:
+            ValueError: If limit or batch_size is not positive
+            
+        Example:
+            >>> delta = service.changes_since(Watermark("2026-01-01 00:00:00"))
+            >>> for change in delta:
+            ...     apply(change)
+            >>> save(delta.watermark)
+        """
+        return CatalogDelta(self.db.get_bind(), since, limit=limit, batch_size=batch_size)
+    
+    def get_category_counts(self, parent: Optional[str] = None) -> Dict[str, int]:
+        """
+        Product counts of the subcategories of a category.
+        
+        Counts are maintained on product writes, so this reads one row per
+        subcategory instead of counting products.
+        
+        Args:
+            parent: Category path; None for top-level categories
+        
+        Returns:
+            Dict mapping category path to the number of products in it or
+            any of its descendants (empty categories omitted)
+        
+        Example:
+            >>> service.get_category_counts("Shoes")
+            {'Shoes > Running': 12, 'Shoes > Basketball': 4}
+        """
+        query_obj = self.db.query(Category.path, Category.product_count).filter(Category.product_count > 0)
+        
+        if parent:
+            parent_id = select(Category.id).where(Category.path_key == category_key(parent)).scalar_subquery()
+            query_obj = query_obj.filter(Category.parent_id == parent_id)
+        else:
+            query_obj = query_obj.filter(Category.parent_id.is_(None))
+        
+        return dict(query_obj.order_by(Category.product_count.desc(), Category.path).all())
+    
+    def get_by_id(self, product_id: str) -> ProductRecord:
         """
         Get product by internal ID.
         
+        Served from the product cache when enabled.
+        
         Args:
             product_id: Internal product identifier
             
         Returns:
-            Product instance
+            Read-only product record
             
         Raises:
             ValueError: If product_id is None or empty
@@ -128,22 +723,52 @@ class ProductService:
         if not product_id:
             raise ValueError("Product ID cannot be None or empty")
         
+        if self.cache:
+            cached = self.cache.get_by_id(product_id)
+            if cached:
+                return cached
+        
         product = self.db.query(Product).filter(Product.id == product_id).first()
         
         if not product:
             raise ProductNotFoundError(f"Product with ID '{product_id}' not found")
         
-        return product
+        return self._remember(product)
     
-    def get_by_gtin(self, gtin: str) -> Product:
+    def get_many_by_id(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """
+        Get several products by internal ID with a single query.
+        
+        Args:
+            product_ids: Internal product identifiers (duplicates allowed)
+            
+        Returns:
+            Map of product ID to Product; unknown IDs are omitted
+            
+        Example:
+            >>> products = service.get_many_by_id(["nike-air-max-90", "nike-pegasus-40"])
+        """
+        wanted = {product_id for product_id in product_ids if product_id}
+        if not wanted:
+            return {}
+        
+        products = self.db.query(Product).filter(Product.id.in_(wanted)).all()
+        self._observe(products)
+        return {product.id: product for product in products}
+    
+    def get_by_gtin(self, gtin: str) -> ProductRecord:
         """
         Get product by GTIN (Global Trade Item Number).
         
+        Matches the product's own GTIN or the GTIN of any of its variants.
+        A UPC-A, EAN-13 or zero-padded GTIN-14 finds the same product (see
+        resolve_gtin()). Served from the product cache when enabled.
+        
         Args:
             gtin: GTIN identifier (8-14 digits)
             
         Returns:
-            Product instance
+            Read-only product record
             
         Raises:
             InvalidGTINError: If GTIN format is invalid
@@ -152,20 +777,188 @@ class ProductService:
         Example:
             >>> product = service.get_by_gtin("00883419552502")
         """
-        # Validate GTIN format
-        if not gtin or not gtin.isdigit():
-            raise InvalidGTINError(f"GTIN must be numeric, got: {gtin}")
+        self.validate_gtin(gtin)
         
-        if len(gtin) < 8 or len(gtin) > 14:
-            raise InvalidGTINError(f"GTIN must be 8-14 digits, got {len(gtin)} digits")
+        if self.cache:
+            cached = self.cache.get_by_gtin(gtin)
+            if cached:
+                return cached
+        
+        product, _ = self.resolve_gtin(gtin)
+        return self._remember(product, gtin)
+    
+    def resolve_gtin(self, gtin: str) -> Tuple[Product, Optional[ProductVariant]]:
+        """
+        Resolve a product or variant GTIN to its product and variant.
         
-        # Query by GTIN
-        product = self.db.query(Product).filter(Product.gtin == gtin).first()
+        GTINs with a valid check digit are normalized to GTIN-14 and
+        matched on the indexed ``gtin14`` columns of products and variants,
+        so every equivalent form (e.g., "012345678905" and
+        "00012345678905") resolves with the same single query. Other GTINs
+        are matched exactly on ``gtin``.
         
-        if not product:
+        Args:
+            gtin: GTIN identifier (8-14 digits)
+            
+        Returns:
+            Tuple of (product, variant); variant is None when the GTIN only
+            identifies the product itself
+            
+        Raises:
+            InvalidGTINError: If GTIN format is invalid
+            ProductNotFoundError: If no product or variant has this GTIN
+            
+        Example:
+            >>> product, variant = service.resolve_gtin("00883419552503")
+            >>> variant.size
+            '9'
+        """
+        self.validate_gtin(gtin)
+        
+        canonical = canonical_gtin(gtin)
+        if canonical:
+            product_match, variant_match = Product.gtin14 == canonical, ProductVariant.gtin14 == canonical
+        else:
+            product_match, variant_match = Product.gtin == gtin, ProductVariant.gtin == gtin
+        
+        variant_owner = (
+            select(ProductVariant.product_id)
+            .where(variant_match)
+            .limit(1)
+            .scalar_subquery()
+        )
+        row = (
+            self.db.query(Product, ProductVariant)
+            .outerjoin(
+                ProductVariant,
+                and_(ProductVariant.product_id == Product.id, variant_match)
+            )
+            .filter(or_(product_match, Product.id == variant_owner))
+            .order_by(product_match.desc(), (Product.gtin == gtin).desc(), Product.id)
+            .first()
+        )
+        
+        if not row:
             raise ProductNotFoundError(f"Product with GTIN '{gtin}' not found")
         
-        return product
+        self._observe([row[0]])
+        return row[0], row[1]
+    
+    def get_many_by_gtin(self, gtins: Iterable[str]) -> Dict[str, Product]:
+        """
+        Get several products by product or variant GTIN with a single query.
+        
+        Args:
+            gtins: GTIN identifiers (duplicates allowed)
+            
+        Returns:
+            Map of requested GTIN to Product; unknown GTINs are omitted
+            
+        Raises:
+            InvalidGTINError: If any GTIN format is invalid
+        """
+        return {gtin: product for gtin, (product, _) in self.resolve_gtins(gtins).items()}
+    
+    def resolve_gtins(self, gtins: Iterable[str]) -> Dict[str, Tuple[Product, Optional[ProductVariant]]]:
+        """
+        Resolve a whole cart of product or variant GTINs with a single query.
+        
+        Batched counterpart of resolve_gtin(): the query cost is fixed no
+        matter how many line items the cart has. Equivalent GTIN forms are
+        matched the same way.
+        
+        Args:
+            gtins: GTIN identifiers (duplicates allowed)
+            
+        Returns:
+            Map of requested GTIN to (product, variant); unknown GTINs are omitted
+            
+        Raises:
+            InvalidGTINError: If any GTIN format is invalid
+            
+        Example:
+            >>> resolved = service.resolve_gtins(["00883419552503", "00883419552510"])
+            >>> product, variant = resolved["00883419552503"]
+        """
+        wanted = set()
+        for gtin in gtins:
+            self.validate_gtin(gtin)
+            wanted.add(gtin)
+        if not wanted:
+            return {}
+        
+        canonical = {gtin: canonical_gtin(gtin) for gtin in wanted}
+        canonical_wanted = {key for key in canonical.values() if key}
+        exact_wanted = {gtin for gtin, key in canonical.items() if not key}
+        
+        product_match = or_(Product.gtin14.in_(canonical_wanted), Product.gtin.in_(exact_wanted))
+        variant_match = or_(ProductVariant.gtin14.in_(canonical_wanted), ProductVariant.gtin.in_(exact_wanted))
+        
+        variant_owners = select(ProductVariant.product_id).where(variant_match)
+        rows = (
+            self.db.query(Product, ProductVariant)
+            .outerjoin(
+                ProductVariant,
+                and_(ProductVariant.product_id == Product.id, variant_match)
+            )
+            .filter(or_(product_match, Product.id.in_(variant_owners)))
+            .order_by(Product.id)
+            .all()
+        )
+        
+        self._observe(product for product, _ in rows)
+        
+        # Keyed by canonical GTIN-14 where there is one, else by exact GTIN.
+        # An exact match is preferred when two products share a canonical
+        # form (e.g., "012345678905" and "0012345678905").
+        by_product_gtin = {}
+        by_variant_gtin = {}
+        for product, variant in rows:
+            if product.gtin14:
+                by_product_gtin.setdefault(product.gtin14, product)
+            by_product_gtin[product.gtin] = product
+            if variant is not None:
+                if variant.gtin14:
+                    by_variant_gtin.setdefault(variant.gtin14, (product, variant))
+                by_variant_gtin[variant.gtin] = (product, variant)
+        
+        # Same precedence as resolve_gtin(): a product's own GTIN wins over
+        # another product's variant
+        resolved = {}
+        for gtin in wanted:
+            keys = [gtin, canonical[gtin]] if canonical[gtin] else [gtin]
+            product = next((by_product_gtin[key] for key in keys if key in by_product_gtin), None)
+            product_variant = next((by_variant_gtin[key] for key in keys if key in by_variant_gtin), None)
+            if product is not None:
+                if product_variant and product_variant[0] is not product:
+                    product_variant = None
+                resolved[gtin] = (product, product_variant[1] if product_variant else None)
+            elif product_variant is not None:
+                resolved[gtin] = product_variant
+        
+        return resolved
+    
+    def _remember(self, product: Product, *gtins: str) -> ProductRecord:
+        """Snapshot a loaded product and add it to the cache."""
+        record = ProductRecord.from_product(product)
+        if self.cache:
+            self.cache.put(record, gtins)
+        return record
+    
+    def _observe(self, products: Iterable[Product]) -> None:
+        """Drop cached products for which a newer row was just loaded."""
+        if self.cache:
+            for product in products:
+                self.cache.discard_if_stale(product.id, product.updated_at)
+    
+    @staticmethod
+    def validate_gtin(gtin: str) -> None:
+        """Raise InvalidGTINError unless gtin is 8-14 digits."""
+        if not gtin or not gtin.isdigit():
+            raise InvalidGTINError(f"GTIN must be numeric, got: {gtin}")
+        
+        if len(gtin) < 8 or len(gtin) > 14:
+            raise InvalidGTINError(f"GTIN must be 8-14 digits, got {len(gtin)} digits")
     
     def check_buyability(self, product_id: str) -> Tuple[bool, Optional[str]]:
         """
@@ -177,6 +970,9 @@ class ProductService:
         - No Nike By You (customizable products)
         - No other restricted product types
         
+        The rules are evaluated when the product is written (see
+        app.models.buyability); this reads the stored outcome.
+        
         Args:
             product_id: Internal product identifier
             
@@ -191,28 +987,11 @@ class ProductService:
             >>> if not is_buyable:
             ...     print(f"Cannot buy: {reason}")
         """
-        # Get product
         product = self.get_by_id(product_id)
         
-        # Check availability
-        if product.availability != "in_stock":
-            return False, "Product is out of stock"
-        
-        # Check for gift cards
-        if product.category and "gift card" in product.category.lower():
-            return False, "Gift cards cannot be purchased through this channel"
-        
-        if product.title and "gift card" in product.title.lower():
-            return False, "Gift cards cannot be purchased through this channel"
-        
-        # Check for customizable products (Nike By You)
-        if product.category and "customizable" in product.category.lower():
-            return False, "Customizable products (Nike By You) cannot be purchased through this channel"
-        
-        if product.product_metadata and product.product_metadata.get("customizable"):
-            return False, "Customizable products (Nike By You) cannot be purchased through this channel"
+        if not product.is_buyable:
+            return False, buyability_message(product.buyability_reason)
         
-        # Product is buyable
         return True, None
     
     def get_variants(self, product_id: str) -> List[dict]:
@@ -0,0 +1,199 @@
+"""
+Search Result Cache
+
+Process-local cache of search results keyed by normalized search
+parameters ("Air  Max" and "air max" share an entry).
+
+Every catalog change bumps a per-database generation counter. Entries
+remember the generation they were computed in and are only served while it
+is current, so a result computed before a write is never returned after it,
+even if the write raced with the search that produced it. Size is bounded
+by LRU eviction; a TTL bounds staleness from writers in other processes.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.category import category_key
+from app.services import catalog_events
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if value is None or value is False or value == "":
+        return None
+    if name == "query":
+        return " ".join(str(value).lower().split())
+    if name == "category":
+        return category_key(value)
+    if name in ("gender", "color"):
+        return str(value).lower()  # NOCASE columns
+    if name.startswith("price"):
+        try:
+            return format(Decimal(str(value)).normalize(), "f")
+        except InvalidOperation:
+            return str(value)
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def search_cache_key(namespace: str, **params) -> Tuple[Hashable, ...]:
+    """
+    Build a cache key from search parameters.
+
+    Query text is lowercased with whitespace collapsed, categories and price
+    bounds are normalized, and unset parameters (None, False, "") are
+    dropped, so equivalent searches share a key.
+
+    Args:
+        namespace: Who is caching (e.g., "product_service.search")
+        **params: Search parameters
+
+    Example:
+        >>> search_cache_key("search", query=" Air  MAX", limit=10)
+        ('search', ('limit', 10), ('query', 'air max'))
+    """
+    normalized = (
+        (name, _normalize(name, value)) for name, value in sorted(params.items())
+    )
+    return (namespace,) + tuple(item for item in normalized if item[1] is not None)
+
+
+class SearchResultCache:
+    """
+    Size-bounded LRU cache of search results with generation-based invalidation.
+
+    Cached values must not be mutated by callers. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize Search Result Cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl_seconds: Time-to-live of each entry
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # key -> (value, generation, expires_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, generation, expires_at = entry
+            if generation != self.generation or self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Cache a value computed while ``generation`` was current.
+
+        Read ``generation`` before running the search. If the catalog
+        changed meanwhile the value is dropped instead of cached.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self._entries[key] = (value, generation, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump_generation(self) -> None:
+        """Invalidate every cached result."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss/eviction counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_caches: "weakref.WeakKeyDictionary[Engine, SearchResultCache]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_search_cache(bind: Engine) -> Optional[SearchResultCache]:
+    """
+    Return the search result cache for a database, creating it on first use.
+
+    Returns:
+        SearchResultCache, or None when caching is disabled in settings
+    """
+    if not settings.search_cache_enabled:
+        return None
+
+    with _registry_lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = SearchResultCache(
+                max_entries=settings.search_cache_max_entries,
+                ttl_seconds=settings.search_cache_ttl_seconds
+            )
+            _caches[bind] = cache
+        return cache
+
+
+@catalog_events.subscribe
+def _bump_on_catalog_change(bind: Engine, change: catalog_events.CatalogChange) -> None:
+    # Flushes, commits and rollbacks all bump: results read inside an open
+    # write transaction must not outlive it either
+    cache = _caches.get(bind)
+    if cache is not None:
+        cache.bump_generation()
@@ -0,0 +1,109 @@
+"""
+Search Facets
+
+Facet counts for product search results: category, availability, price
+bucket, and the ``color`` and ``gender`` product metadata fields.
+
+The SQL search path aggregates the matching products with a single GROUP BY
+over all facet dimensions and rolls the cells up here. The columnar engine
+counts its own columns and reports them in the same shape.
+"""
+
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import case
+
+from app.models.category import CATEGORY_SEPARATOR, split_category_path
+
+
+FACET_NAMES = ("category", "availability", "price", "color", "gender")
+
+# Upper bounds (exclusive) of the price buckets, in currency units
+PRICE_BUCKET_EDGES = (50, 100, 150, 200)
+
+PRICE_BUCKET_LABELS = tuple(
+    [f"{low}-{high}" for low, high in zip((0,) + PRICE_BUCKET_EDGES, PRICE_BUCKET_EDGES)]
+    + [f"{PRICE_BUCKET_EDGES[-1]}+"]
+)
+
+
+def price_bucket(price) -> str:
+    """
+    Label of the price bucket containing ``price``.
+
+    Example:
+        >>> price_bucket(Decimal("120.00"))
+        '100-150'
+    """
+    value = Decimal(price)
+    for edge, label in zip(PRICE_BUCKET_EDGES, PRICE_BUCKET_LABELS):
+        if value < edge:
+            return label
+    return PRICE_BUCKET_LABELS[-1]
+
+
+def price_bucket_expression(price_column):
+    """SQL CASE expression computing price_bucket() for a price column."""
+    return case(
+        *[(price_column < edge, label) for edge, label in zip(PRICE_BUCKET_EDGES, PRICE_BUCKET_LABELS)],
+        else_=PRICE_BUCKET_LABELS[-1]
+    )
+
+
+class FacetCounts:
+    """
+    Accumulator for facet counts.
+
+    Categories are rolled up: a product in "Shoes > Running" also counts
+    towards "Shoes". Missing values are not counted.
+    """
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {name: {} for name in FACET_NAMES}
+
+    def add(
+        self,
+        category: Optional[str],
+        availability: Optional[str],
+        price: Optional[str],
+        color: Optional[str],
+        gender: Optional[str],
+        count: int = 1
+    ) -> None:
+        """Count ``count`` products sharing the same facet values."""
+        self._add("category", category, count)
+        self._add("availability", availability, count)
+        self._add("price", price, count)
+        self._add("color", color, count)
+        self._add("gender", gender, count)
+
+    def add_counts(self, facet: str, counts: Dict[Optional[str], int]) -> None:
+        """Merge pre-aggregated counts for one facet."""
+        for value, count in counts.items():
+            self._add(facet, value, count)
+
+    def _add(self, facet: str, value: Optional[str], count: int) -> None:
+        if facet == "category":
+            segments = split_category_path(value)
+            for depth in range(len(segments)):
+                self._increment(facet, CATEGORY_SEPARATOR.join(segments[:depth + 1]), count)
+        elif value:
+            self._increment(facet, value, count)
+
+    def _increment(self, facet: str, value: str, count: int) -> None:
+        if count:
+            values = self._counts[facet]
+            values[value] = values.get(value, 0) + count
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        """Counts per facet, most frequent value first (price buckets in price order)."""
+        facets = {
+            name: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+            for name, values in self._counts.items()
+        }
+        facets["price"] = {
+            label: self._counts["price"][label]
+            for label in PRICE_BUCKET_LABELS if label in self._counts["price"]
+        }
+        return facets
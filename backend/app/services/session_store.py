@@ -0,0 +1,434 @@
+"""
+Checkout Session Store
+
+Where CheckoutService keeps checkout sessions between requests.
+
+A session is typically created, updated two or three times within a minute
+and then completed or abandoned. Two stores are available, selected with the
+``checkout_session_store`` setting:
+
+- ``sql`` (default): every change is committed to the database before the
+  request returns. Nothing is lost on a crash, and any number of processes
+  can serve the same session.
+- ``write_behind``: sessions live in process memory. Creates and updates
+  mark them dirty, and a background thread upserts all dirty sessions in one
+  transaction every ``checkout_session_flush_seconds``.
+
+Durability of the write-behind store:
+- Completion and cancellation are always written synchronously, in the
+  caller's transaction (so a completed session commits together with its
+  order), and are never overwritten by a later background flush.
+- Creates and updates not yet flushed are lost if the process dies without
+  a clean shutdown: at most ``checkout_session_flush_seconds`` of changes.
+  Shutdown flushes everything (close_session_stores()).
+- The in-memory copy is authoritative, so a session must be served by the
+  process holding it: run a single worker, or route by session ID.
+"""
+
+import copy
+import logging
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import commit
+from app.models.checkout_session import CheckoutSession
+
+logger = logging.getLogger(__name__)
+
+
+SESSION_STORE_SQL = "sql"
+SESSION_STORE_WRITE_BEHIND = "write_behind"
+SESSION_STORES = (SESSION_STORE_SQL, SESSION_STORE_WRITE_BEHIND)
+
+# Final statuses, written synchronously and never overwritten by a flush
+TERMINAL_STATUSES = ("completed", "canceled")
+
+_COLUMNS = tuple(column.key for column in CheckoutSession.__table__.columns)
+
+
+class SessionStore(ABC):
+    """
+    Loads and saves checkout sessions for CheckoutService.
+
+    Subclasses implement get(), add(), save() and persist().
+    """
+
+    name = ""
+
+    @abstractmethod
+    def get(self, db: Session, session_id: str) -> Optional[CheckoutSession]:
+        """Return the session, or None if it does not exist."""
+
+    @abstractmethod
+    def add(self, db: Session, session: CheckoutSession) -> None:
+        """Store a new session."""
+
+    @abstractmethod
+    def save(self, db: Session, session: CheckoutSession) -> None:
+        """Store changes to a session returned by get() or add()."""
+
+    @abstractmethod
+    def persist(self, db: Session, session: CheckoutSession) -> None:
+        """
+        Write a session to the database in the caller's transaction.
+
+        Used for completion and cancellation; inside a unit_of_work() the
+        write commits with the rest of the unit.
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for /metrics."""
+        return {"store": self.name}
+
+
+class SQLSessionStore(SessionStore):
+    """Sessions are rows; every change commits (or flushes inside a unit_of_work())."""
+
+    name = SESSION_STORE_SQL
+
+    def get(self, db: Session, session_id: str) -> Optional[CheckoutSession]:
+        return db.query(CheckoutSession).filter(CheckoutSession.id == session_id).first()
+
+    def add(self, db: Session, session: CheckoutSession) -> None:
+        db.add(session)
+        commit(db, expire=False)
+
+    def save(self, db: Session, session: CheckoutSession) -> None:
+        commit(db, expire=False)
+
+    def persist(self, db: Session, session: CheckoutSession) -> None:
+        commit(db, expire=False)
+
+
+@dataclass
+class _Entry:
+    """In-memory copy of one session."""
+
+    values: Dict[str, Any]
+    version: int = 0
+    dirty: bool = False
+    # Being persisted by a caller's transaction; the flusher skips it
+    pinned: bool = False
+
+
+class WriteBehindSessionStore(SessionStore):
+    """
+    Sessions held in memory, written to the database in batches.
+
+    Sessions are handed out as detached CheckoutSession objects; save()
+    copies their columns back into the store. See the module docstring for
+    durability. Thread-safe.
+    """
+
+    name = SESSION_STORE_WRITE_BEHIND
+
+    def __init__(
+        self,
+        bind: Engine,
+        flush_interval_seconds: Optional[float] = 1.0,
+        max_sessions: int = 10000
+    ):
+        """
+        Initialize Write-Behind Session Store.
+
+        Args:
+            bind: Database engine sessions are flushed to
+            flush_interval_seconds: Delay between background flushes (None
+                starts no thread; call flush() yourself)
+            max_sessions: Sessions kept in memory; beyond it the least
+                recently used flushed sessions are dropped (and reloaded
+                from the database on next use)
+        """
+        self.bind = bind
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_sessions = max_sessions
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self.flushes = 0
+        self.flushed_sessions = 0
+        self.flush_errors = 0
+        self.last_flush_seconds = 0.0
+        self.evictions = 0
+
+    # ========================================================================
+    # SessionStore
+    # ========================================================================
+
+    def get(self, db: Session, session_id: str) -> Optional[CheckoutSession]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                self._entries.move_to_end(session_id)
+                return _materialize(entry.values)
+
+        # Not in memory: flushed earlier (and evicted), or written by another process
+        row = db.query(CheckoutSession).filter(CheckoutSession.id == session_id).first()
+        if row is None:
+            return None
+        values = _snapshot(row)
+        with self._lock:
+            entry = self._entries.setdefault(session_id, _Entry(values))
+            self._evict()
+            return _materialize(entry.values)
+
+    def add(self, db: Session, session: CheckoutSession) -> None:
+        now = datetime.utcnow()
+        if session.created_at is None:
+            session.created_at = now
+        if session.updated_at is None:
+            session.updated_at = now
+        self.save(db, session)
+
+    def save(self, db: Session, session: CheckoutSession) -> None:
+        values = _snapshot(session)
+        with self._lock:
+            entry = self._entries.get(session.id)
+            if entry is None:
+                entry = self._entries[session.id] = _Entry(values)
+            else:
+                entry.values = values
+                self._entries.move_to_end(session.id)
+            entry.version += 1
+            entry.dirty = True
+            overflowing = not self._evict()
+        self._ensure_worker()
+        if overflowing:
+            self.flush()  # Every entry is dirty: apply backpressure
+
+    def persist(self, db: Session, session: CheckoutSession) -> None:
+        values = _snapshot(session)
+        with self._lock:
+            entry = self._entries.get(session.id)
+            if entry is not None:
+                entry.pinned = True
+        db.execute(_PERSIST_UPSERT, values)
+        db.info.setdefault(_PENDING, []).append((self, session.id, values))
+        commit(db, expire=False)
+
+    # ========================================================================
+    # Flushing
+    # ========================================================================
+
+    def flush(self) -> int:
+        """Write every dirty session in one transaction; returns the number written."""
+        with self._flush_lock:
+            started = time.perf_counter()
+            with self._lock:
+                self._drop_expired()
+                batch = [
+                    (session_id, entry.version, entry.values)
+                    for session_id, entry in self._entries.items()
+                    if entry.dirty and not entry.pinned
+                ]
+            if not batch:
+                return 0
+
+            try:
+                with self.bind.begin() as connection:
+                    connection.execute(_FLUSH_UPSERT, [values for _, _, values in batch])
+            except Exception:
+                self.flush_errors += 1
+                logger.exception("Checkout session flush failed; %d sessions stay dirty", len(batch))
+                return 0
+
+            with self._lock:
+                for session_id, version, _ in batch:
+                    entry = self._entries.get(session_id)
+                    if entry is not None and entry.version == version:
+                        entry.dirty = False  # Unless saved again meanwhile
+                self._evict()
+
+            self.flushes += 1
+            self.flushed_sessions += len(batch)
+            self.last_flush_seconds = time.perf_counter() - started
+            return len(batch)
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left."""
+        self._stop.set()
+        worker = self._worker
+        if worker is not None:
+            worker.join()
+        self.flush()
+        # Usable again (the next save starts a new thread)
+        self._worker = None
+        self._stop.clear()
+
+    def _ensure_worker(self) -> None:
+        if self.flush_interval_seconds is None or self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None and not self._stop.is_set():
+                self._worker = threading.Thread(target=self._run, name="session-store-flush", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def _committed(self, session_id: str, values: Dict[str, Any]) -> None:
+        """A persist() committed: its values are now the stored state."""
+        with self._lock:
+            self._entries[session_id] = _Entry(values)
+            self._evict()
+
+    def _rolled_back(self, session_id: str) -> None:
+        """A persist() rolled back: the in-memory state (dirty or not) stands."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.pinned = False
+
+    def _drop_expired(self) -> None:
+        """
+        Forget sessions past their expiry (called with the lock held).
+
+        Unflushed changes are dropped too: expired sessions can no longer be
+        used, and writing them would undo the expiry sweeper's deletes.
+        """
+        now = datetime.utcnow()
+        expired = [
+            session_id for session_id, entry in self._entries.items()
+            if not entry.pinned
+            and entry.values["expires_at"] is not None and entry.values["expires_at"] < now
+        ]
+        for session_id in expired:
+            del self._entries[session_id]
+
+    def _evict(self) -> bool:
+        """Drop least recently used flushed sessions over max_sessions; False if still over."""
+        if len(self._entries) <= self.max_sessions:
+            return True
+        for session_id in list(self._entries):
+            entry = self._entries[session_id]
+            if not entry.dirty and not entry.pinned:
+                del self._entries[session_id]
+                self.evictions += 1
+                if len(self._entries) <= self.max_sessions:
+                    return True
+        return False
+
+    # ========================================================================
+    # Statistics
+    # ========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Return session and flush counters."""
+        with self._lock:
+            dirty = sum(1 for entry in self._entries.values() if entry.dirty)
+            return {
+                "store": self.name,
+                "sessions": len(self._entries),
+                "dirty": dirty,
+                "max_sessions": self.max_sessions,
+                "flush_interval_seconds": self.flush_interval_seconds,
+                "flushes": self.flushes,
+                "flushed_sessions": self.flushed_sessions,
+                "flush_errors": self.flush_errors,
+                "last_flush_seconds": round(self.last_flush_seconds, 6),
+                "evictions": self.evictions,
+            }
+
+
+def _snapshot(session: CheckoutSession) -> Dict[str, Any]:
+    """Column values of a session (JSON values deep-copied)."""
+    return {name: copy.deepcopy(getattr(session, name)) for name in _COLUMNS}
+
+
+def _materialize(values: Dict[str, Any]) -> CheckoutSession:
+    """Detached CheckoutSession holding a copy of the values."""
+    return CheckoutSession(**copy.deepcopy(values))
+
+
+def _upsert(terminal_wins: bool):
+    """INSERT ... ON CONFLICT(id) DO UPDATE of every column."""
+    table = CheckoutSession.__table__
+    statement = sqlite_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={name: statement.excluded[name] for name in _COLUMNS if name != "id"},
+        # Background flushes never undo a completion or cancellation
+        where=None if terminal_wins else and_(*(table.c.status != status for status in TERMINAL_STATUSES))
+    )
+
+
+_PERSIST_UPSERT = _upsert(terminal_wins=True)
+_FLUSH_UPSERT = _upsert(terminal_wins=False)
+
+
+# ============================================================================
+# Persist Outcome
+# ============================================================================
+
+_PENDING = "session_store_pending"
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_persists(session):
+    for store, session_id, values in session.info.pop(_PENDING, ()):
+        store._committed(session_id, values)
+
+
+@event.listens_for(Session, "after_rollback")
+def _release_rolled_back_persists(session):
+    for store, session_id, _ in session.info.pop(_PENDING, ()):
+        store._rolled_back(session_id)
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_sql_store = SQLSessionStore()
+_stores: "weakref.WeakKeyDictionary[Engine, WriteBehindSessionStore]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_session_store(bind: Engine) -> SessionStore:
+    """
+    Return the session store configured in settings for a database.
+
+    Raises:
+        ValueError: If ``checkout_session_store`` names no known store
+    """
+    if settings.checkout_session_store == SESSION_STORE_SQL:
+        return _sql_store
+    if settings.checkout_session_store != SESSION_STORE_WRITE_BEHIND:
+        raise ValueError(
+            f"Unknown checkout_session_store {settings.checkout_session_store!r}; expected one of {SESSION_STORES}"
+        )
+
+    with _registry_lock:
+        store = _stores.get(bind)
+        if store is None:
+            store = WriteBehindSessionStore(
+                bind,
+                flush_interval_seconds=settings.checkout_session_flush_seconds,
+                max_sessions=settings.checkout_session_max_sessions
+            )
+            _stores[bind] = store
+        return store
+
+
+def close_session_stores() -> None:
+    """Flush and stop every write-behind store (application shutdown)."""
+    with _registry_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.close()
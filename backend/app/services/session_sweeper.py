@@ -0,0 +1,237 @@
+"""
+Checkout Session Sweeper
+
+Deletes expired checkout sessions in the background.
+
+Expiry is otherwise only enforced when a session is read
+(CheckoutService.get_session), so abandoned sessions would stay in the
+table forever. Every ``checkout_sweeper_interval_seconds`` the sweeper
+deletes sessions that expired without being completed (open or canceled),
+using ``ix_checkout_sessions_status_expires_at``. Completed sessions are
+kept: their orders refer to them.
+
+Deletes run in batches of ``checkout_sweeper_batch_size`` rows, each in its
+own short transaction, and at most ``checkout_sweeper_max_batches`` per run,
+so a large backlog never holds the SQLite write lock for long; it is worked
+off over several runs.
+
+When several app workers share the database, only the holder of the
+``checkout_session_sweeper`` lease (see MaintenanceLease) sweeps. The lease
+lasts three intervals and is renewed on every run, so another worker takes
+over after a leader stops.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+import weakref
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.checkout_session import CheckoutSession
+from app.models.maintenance_lease import MaintenanceLease
+
+logger = logging.getLogger(__name__)
+
+
+LEASE_NAME = "checkout_session_sweeper"
+
+# Statuses whose sessions are deleted once expired
+SWEPT_STATUSES = ("not_ready_for_payment", "ready_for_payment", "canceled")
+
+
+class SessionSweeper:
+    """
+    Deletes expired checkout sessions of one database in bounded batches.
+
+    run_forever() is the lifespan task; sweep() performs one run and can be
+    called directly.
+    """
+
+    def __init__(
+        self,
+        bind: Engine,
+        interval_seconds: float = 300.0,
+        batch_size: int = 500,
+        max_batches: int = 20,
+        holder: Optional[str] = None,
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        """
+        Initialize Session Sweeper.
+
+        Args:
+            bind: Database engine to sweep
+            interval_seconds: Delay between runs (the lease lasts three)
+            batch_size: Sessions deleted per transaction
+            max_batches: Transactions per run
+            holder: Name of this worker in the lease (default: host, PID
+                and a random suffix)
+            clock: Current UTC time (injectable for tests)
+        """
+        if batch_size < 1 or max_batches < 1:
+            raise ValueError("batch_size and max_batches must be positive")
+
+        self.bind = bind
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.is_leader = False
+        self.runs = 0
+        self.skipped_runs = 0
+        self.errors = 0
+        self.batches = 0
+        self.sessions_deleted = 0
+        self.last_deleted = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at: Optional[datetime] = None
+
+    # ========================================================================
+    # Sweeping
+    # ========================================================================
+
+    def sweep(self) -> int:
+        """
+        Delete expired sessions if this worker holds the lease.
+
+        Returns:
+            Number of sessions deleted (0 when another worker is leader)
+        """
+        with self._lock:
+            if not self.acquire_lease():
+                self.skipped_runs += 1
+                return 0
+
+            started = time.perf_counter()
+            table = CheckoutSession.__table__
+            expired = select(table.c.id).where(
+                table.c.status.in_(SWEPT_STATUSES),
+                table.c.expires_at < self._clock()
+            ).limit(self.batch_size)
+            statement = delete(table).where(table.c.id.in_(expired.scalar_subquery()))
+
+            deleted = 0
+            for _ in range(self.max_batches):
+                with self.bind.begin() as connection:
+                    count = connection.execute(statement).rowcount
+                deleted += count
+                self.batches += 1
+                if count < self.batch_size:
+                    break
+
+            self.runs += 1
+            self.sessions_deleted += deleted
+            self.last_deleted = deleted
+            self.last_run_seconds = time.perf_counter() - started
+            self.last_run_at = self._clock()
+            if deleted:
+                logger.info("Deleted %d expired checkout sessions", deleted)
+            return deleted
+
+    async def run_forever(self) -> None:
+        """Sweep every interval until cancelled (first run after one interval)."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception:
+                self.errors += 1
+                logger.exception("Checkout session sweep failed")
+
+    # ========================================================================
+    # Leader Lease
+    # ========================================================================
+
+    def acquire_lease(self) -> bool:
+        """Take or renew the lease; True if this worker is now the leader."""
+        now = self._clock()
+        table = MaintenanceLease.__table__
+        statement = sqlite_insert(table).values(
+            name=LEASE_NAME,
+            holder=self.holder,
+            expires_at=now + timedelta(seconds=3 * self.interval_seconds)
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={"holder": statement.excluded.holder, "expires_at": statement.excluded.expires_at},
+            # Only the holder renews; anyone takes a lapsed lease
+            where=(table.c.holder == statement.excluded.holder) | (table.c.expires_at < now)
+        )
+        with self.bind.begin() as connection:
+            self.is_leader = connection.execute(statement).rowcount == 1
+        return self.is_leader
+
+    def release_lease(self) -> None:
+        """Give up the lease so another worker can take over at once."""
+        if not self.is_leader:
+            return
+        table = MaintenanceLease.__table__
+        with self.bind.begin() as connection:
+            connection.execute(
+                delete(table).where(table.c.name == LEASE_NAME, table.c.holder == self.holder)
+            )
+        self.is_leader = False
+
+    # ========================================================================
+    # Statistics
+    # ========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Return run counters and rows reclaimed."""
+        return {
+            "leader": self.is_leader,
+            "interval_seconds": self.interval_seconds,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "skipped_runs": self.skipped_runs,
+            "errors": self.errors,
+            "batches": self.batches,
+            "sessions_deleted": self.sessions_deleted,
+            "last_deleted": self.last_deleted,
+            "last_run_seconds": round(self.last_run_seconds, 6),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_sweepers: "weakref.WeakKeyDictionary[Engine, SessionSweeper]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_session_sweeper(bind: Engine) -> Optional[SessionSweeper]:
+    """
+    Return the sweeper for a database, creating it on first use.
+
+    Returns:
+        SessionSweeper, or None when sweeping is disabled in settings
+    """
+    if not settings.checkout_sweeper_enabled:
+        return None
+
+    with _registry_lock:
+        sweeper = _sweepers.get(bind)
+        if sweeper is None:
+            sweeper = SessionSweeper(
+                bind,
+                interval_seconds=settings.checkout_sweeper_interval_seconds,
+                batch_size=settings.checkout_sweeper_batch_size,
+                max_batches=settings.checkout_sweeper_max_batches
+            )
+            _sweepers[bind] = sweeper
+        return sweeper
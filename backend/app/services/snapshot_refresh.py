@@ -0,0 +1,123 @@
+"""
+Snapshot Refresh
+
+Lifecycle shared by the in-memory structures built from the whole catalog
+(the columnar search snapshot, the autocomplete trie, the trigram index).
+
+Each holds one snapshot. It is built synchronously on first use, unless
+warm_up() already built it on a worker thread at startup. When the catalog
+changes, a replacement is built on a background thread and swapped in with
+a single reference assignment; readers running meanwhile keep using the
+previous snapshot.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Generic, Optional, TypeVar
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RefreshingSnapshot(ABC, Generic[T]):
+    """
+    Owns the current snapshot of one database and rebuilds it on change.
+
+    Subclasses implement build().
+    """
+
+    thread_name = "snapshot-refresh"
+
+    def __init__(self, bind: Engine, background_refresh: bool = True):
+        """
+        Initialize Refreshing Snapshot.
+
+        Args:
+            bind: Database engine to load the catalog from
+            background_refresh: Rebuild on a worker thread (False rebuilds
+                synchronously inside the change notification)
+        """
+        self.bind = bind
+        self.background_refresh = background_refresh
+        self._snapshot: Optional[T] = None
+        self._lock = threading.Lock()
+        self._stale = False
+        self._worker: Optional[threading.Thread] = None
+        self.rebuilds = 0
+        self.last_build_seconds = 0.0
+
+    @abstractmethod
+    def build(self) -> T:
+        """Load a new snapshot from the database."""
+
+    @property
+    def snapshot(self) -> T:
+        """Current snapshot (built synchronously on first use)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self) -> T:
+        """Build a new snapshot now and swap it in."""
+        started = time.perf_counter()
+        snapshot = self.build()
+
+        self._snapshot = snapshot  # Atomic reference swap
+        self.rebuilds += 1
+        self.last_build_seconds = time.perf_counter() - started
+        return snapshot
+
+    def mark_stale(self) -> None:
+        """Schedule a rebuild; concurrent requests coalesce into one."""
+        if self._snapshot is None:
+            return  # Nothing loaded yet; first use will build it
+
+        if not self.background_refresh:
+            self.refresh()
+            return
+
+        self._schedule_rebuild()
+
+    def warm_up(self) -> None:
+        """Build the first snapshot on a worker thread (at startup), so no request builds it."""
+        if self._snapshot is None:
+            self._schedule_rebuild()
+
+    def _schedule_rebuild(self) -> None:
+        with self._lock:
+            self._stale = True
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._rebuild_until_fresh,
+                    name=self.thread_name,
+                    daemon=True
+                )
+                self._worker.start()
+
+    def wait_until_fresh(self, timeout: float = 10.0) -> bool:
+        """Block until no rebuild is pending. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if self._worker is None:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _rebuild_until_fresh(self) -> None:
+        while True:
+            with self._lock:
+                if not self._stale:
+                    self._worker = None
+                    return
+                self._stale = False
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("%s rebuild failed", type(self).__name__)
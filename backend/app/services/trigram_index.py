@@ -0,0 +1,355 @@
+"""
+Trigram Index
+
+Typo-tolerant matching for product search.
+
+Indexes the words of product titles and brands by their trigrams (the
+three-character slices of the word padded as ``"  word "``, as in
+PostgreSQL's pg_trgm). When a search finds nothing, ProductService asks the
+index to correct the query: every word that appears in no title or brand is
+replaced by the most similar indexed word, and the search is run again
+("air maxx" becomes "air max", "pegassus" becomes "pegasus").
+
+The index covers the catalog vocabulary rather than whole titles, so its
+size depends on the number of distinct words, not on the number of
+products, and a lookup scores a handful of candidate words.
+
+The index is built on a worker thread at startup (see app.main) and kept
+current incrementally: when a catalog write commits, the changed products
+are re-read and re-indexed in the committing thread, outside the lookup
+path. Changes to the whole catalog (bulk ingests, schema upgrades) build a
+replacement on a background thread, as for the other in-memory structures
+(app.services.snapshot_refresh); lookups keep using the current index
+meanwhile. Lookups only read memory.
+"""
+
+import math
+import threading
+import weakref
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.models.product import Product
+from app.models.product_search import tokenize
+from app.services import catalog_events
+from app.services.snapshot_refresh import RefreshingSnapshot
+
+# Changed products re-read per query after a commit
+REFRESH_BATCH_SIZE = 500
+
+
+def word_trigrams(word: str) -> FrozenSet[str]:
+    """
+    Trigrams of a lowercase word.
+
+    Example:
+        >>> sorted(word_trigrams("max"))
+        ['  m', ' ma', 'ax ', 'max']
+    """
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Shared trigrams over distinct trigrams of two words (0.0 - 1.0)."""
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+class TrigramIndex:
+    """
+    Trigram index over the words of product titles and brands.
+
+    Thread-safe.
+    """
+
+    def __init__(self, min_similarity: float = 0.4):
+        """
+        Initialize Trigram Index.
+
+        Args:
+            min_similarity: Minimum trigram similarity for a correction
+        """
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+
+        self._words_by_product: Dict[str, FrozenSet[str]] = {}
+        self._frequency: Dict[str, int] = {}  # word -> number of products using it
+        self._trigrams: Dict[str, FrozenSet[str]] = {}  # word -> its trigrams
+        self._postings: Dict[str, Set[str]] = {}  # trigram -> words containing it
+
+        self.lookups = 0
+        self.corrections = 0
+
+    @classmethod
+    def load(cls, bind: Engine, min_similarity: float = 0.4) -> "TrigramIndex":
+        """Build an index of the whole catalog."""
+        index = cls(min_similarity)
+        table = Product.__table__
+        with bind.connect() as connection:
+            result = connection.execution_options(yield_per=1000).execute(
+                select(table.c.id, table.c.title, table.c.brand)
+            )
+            for product_id, title, brand in result:
+                index._index_product(product_id, title, brand)
+        return index
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add_product(self, product_id: str, *texts: Optional[str]) -> None:
+        """Index (or re-index) the words of a product's title and brand."""
+        with self._lock:
+            self._remove_product(product_id)
+            self._index_product(product_id, *texts)
+
+    def remove_product(self, product_id: str) -> None:
+        """Drop a product's words from the index."""
+        with self._lock:
+            self._remove_product(product_id)
+
+    def replace_products(self, product_ids: Iterable[str], rows: Iterable[Tuple[str, str, str]]) -> None:
+        """
+        Re-index changed products in one step.
+
+        Args:
+            product_ids: Changed products; those without a row were deleted
+            rows: Current (id, title, brand) of those that still exist
+        """
+        with self._lock:
+            for product_id in product_ids:
+                self._remove_product(product_id)
+            for product_id, title, brand in rows:
+                self._index_product(product_id, title, brand)
+
+    def _index_product(self, product_id: str, *texts: Optional[str]) -> None:
+        words = frozenset(word for text in texts for word in tokenize(text or ""))
+        self._words_by_product[product_id] = words
+        for word in words:
+            self._add_word(word)
+
+    def _remove_product(self, product_id: str) -> None:
+        for word in self._words_by_product.pop(product_id, ()):
+            self._remove_word(word)
+
+    def _add_word(self, word: str) -> None:
+        count = self._frequency.get(word, 0)
+        self._frequency[word] = count + 1
+        if count:
+            return
+
+        trigrams = word_trigrams(word)
+        self._trigrams[word] = trigrams
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(word)
+
+    def _remove_word(self, word: str) -> None:
+        count = self._frequency[word] - 1
+        if count:
+            self._frequency[word] = count
+            return
+
+        del self._frequency[word]
+        for trigram in self._trigrams.pop(word):
+            words = self._postings[trigram]
+            words.discard(word)
+            if not words:
+                del self._postings[trigram]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def suggest(self, word: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Indexed words most similar to ``word``.
+
+        Returns:
+            (word, similarity) pairs at or above min_similarity, most similar
+            first; ties go to the word used by more products
+        """
+        with self._lock:
+            return self._suggest(word.lower(), limit)
+
+    def _suggest(self, word: str, limit: int) -> List[Tuple[str, float]]:
+        query = word_trigrams(word)
+
+        # A match shares at least ceil(min_similarity * len(query)) trigrams
+        # with the query, so it contains at least one of the rarest
+        # len(query) - required + 1 query trigrams. Only their postings are
+        # scanned, which skips the long postings of common trigrams.
+        required = max(1, math.ceil(self.min_similarity * len(query)))
+        rarest = sorted(query, key=lambda trigram: len(self._postings.get(trigram, ())))
+        candidates = set()
+        for trigram in rarest[:len(query) - required + 1]:
+            candidates.update(self._postings.get(trigram, ()))
+
+        scored = []
+        for candidate in candidates:
+            similarity = trigram_similarity(query, self._trigrams[candidate])
+            if similarity >= self.min_similarity:
+                scored.append((-similarity, -self._frequency[candidate], candidate))
+
+        scored.sort()
+        return [(candidate, -similarity) for similarity, _, candidate in scored[:limit]]
+
+    def correct(self, query: str) -> Optional[str]:
+        """
+        Replace unknown words of a search query with their closest indexed word.
+
+        Words found in some title or brand, and numbers, are kept as they
+        are.
+
+        Args:
+            query: Search text
+
+        Returns:
+            Corrected query, or None if no word was corrected
+
+        Example:
+            >>> index.correct("air maxx")
+            'air max'
+        """
+        with self._lock:
+            self.lookups += 1
+            words = tokenize(query)
+            corrected = list(words)
+            for position, word in enumerate(words):
+                if word in self._frequency or word.isdigit():
+                    continue
+                suggestions = self._suggest(word, 1)
+                if suggestions:
+                    corrected[position] = suggestions[0][0]
+
+            if corrected == words:
+                return None
+            self.corrections += 1
+            return " ".join(corrected)
+
+    def stats(self) -> Dict[str, float]:
+        """Index size and lookup counters."""
+        with self._lock:
+            return {
+                "products": len(self._words_by_product),
+                "words": len(self._frequency),
+                "trigrams": len(self._postings),
+                "lookups": self.lookups,
+                "corrections": self.corrections,
+            }
+
+
+# ============================================================================
+# Engine (index lifecycle)
+# ============================================================================
+
+class TrigramIndexEngine(RefreshingSnapshot[TrigramIndex]):
+    """Owns the trigram index of one database and applies committed catalog changes to it."""
+
+    thread_name = "trigram-index-refresh"
+
+    def __init__(self, bind: Engine, min_similarity: float = 0.4, background_refresh: bool = True):
+        """
+        Initialize Trigram Index Engine.
+
+        Args:
+            bind: Database engine to load the catalog from
+            min_similarity: Minimum trigram similarity for a correction
+            background_refresh: Rebuild on a worker thread (False rebuilds
+                synchronously inside the change notification)
+        """
+        super().__init__(bind, background_refresh=background_refresh)
+        self.min_similarity = min_similarity
+        self._update_lock = threading.Lock()
+        self.updated_products = 0
+
+    def build(self) -> TrigramIndex:
+        """Build a new index from the database."""
+        return TrigramIndex.load(self.bind, self.min_similarity)
+
+    def update_products(self, product_ids: Iterable[str]) -> None:
+        """
+        Re-read committed products and re-index them in the current index.
+
+        Called after the write commits; lookups are only blocked while the
+        rows read are applied in memory.
+        """
+        index = self._snapshot
+        if index is not None:
+            table = Product.__table__
+            product_ids = sorted(product_ids)
+            # Serialized, so a slower re-read never overwrites a newer one
+            with self._update_lock:
+                with self.bind.connect() as connection:
+                    for start in range(0, len(product_ids), REFRESH_BATCH_SIZE):
+                        batch = product_ids[start:start + REFRESH_BATCH_SIZE]
+                        rows = connection.execute(
+                            select(table.c.id, table.c.title, table.c.brand).where(table.c.id.in_(batch))
+                        ).all()
+                        index.replace_products(batch, rows)
+                self.updated_products += len(product_ids)
+
+        with self._lock:
+            building = self._worker is not None
+        if building:
+            # The index being built may have read the catalog before this commit
+            self._schedule_rebuild()
+
+    def correct(self, query: str) -> Optional[str]:
+        """Correct a search query against the current index (see TrigramIndex.correct)."""
+        return self.snapshot.correct(query)
+
+    def stats(self) -> Dict[str, float]:
+        """Index size, lookup and rebuild metrics."""
+        index = self._snapshot or TrigramIndex(self.min_similarity)  # Zeros until built
+        return {
+            **index.stats(),
+            "updated_products": self.updated_products,
+            "rebuilds": self.rebuilds,
+            "last_build_seconds": round(self.last_build_seconds, 4),
+        }
+
+
+# ============================================================================
+# Per-Database Registry
+# ============================================================================
+
+_engines: "weakref.WeakKeyDictionary[Engine, TrigramIndexEngine]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_trigram_index(bind: Engine) -> Optional[TrigramIndexEngine]:
+    """
+    Return the trigram index engine for a database, creating it on first use.
+
+    Returns:
+        TrigramIndexEngine, or None when fuzzy search is disabled in settings
+    """
+    if not settings.fuzzy_search_enabled:
+        return None
+
+    with _registry_lock:
+        engine = _engines.get(bind)
+        if engine is None:
+            engine = TrigramIndexEngine(
+                bind,
+                min_similarity=settings.fuzzy_search_min_similarity,
+                background_refresh=settings.fuzzy_search_background_refresh
+            )
+            _engines[bind] = engine
+        return engine
+
+
+@catalog_events.subscribe
+def _update_on_catalog_change(bind: Engine, change: catalog_events.CatalogChange) -> None:
+    # Committed data only: the index never holds uncommitted words
+    engine = _engines.get(bind)
+    if engine is None or not change.committed:
+        return
+    if change.is_full:
+        engine.mark_stale()
+    else:
+        engine.update_products(change.product_ids)
@@ -10,7 +10,7 @@ from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -59,6 +59,32 @@ def db_session(db_engine) -> Generator[Session, None, None]:
         session.close()
 
 
+class StatementLog(list):
+    """SQL statements executed on the test engine; their parameters are in ``parameters``."""
+
+    def __init__(self):
+        super().__init__()
+        self.parameters = []
+
+    def clear(self):
+        super().clear()
+        self.parameters.clear()
+
+
+@pytest.fixture(scope="function")
+def statement_counter(db_engine) -> Generator[StatementLog, None, None]:
+    """Record the SQL statements issued against the test engine (clear() before measuring)."""
+    statements = StatementLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+        statements.parameters.append(parameters)
+
+    event.listen(db_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(db_engine, "before_cursor_execute", record)
+
+
 @pytest.fixture(scope="function")
 def test_client(db_session) -> Generator[TestClient, None, None]:
     """Create a test client with overridden database dependency."""
@@ -0,0 +1,80 @@
+"""
+Export ACP Product Feed
+
+Writes the whole catalog as an ACP product feed, one JSON object per line,
+reading products in batches so memory use stays flat for any catalog size.
+Output ending in ``.gz`` is gzipped.
+
+An interrupted export can be resumed by passing the last product ID
+written (printed after each chunk) as ``--cursor``. NDJSON output can be
+continued in place with ``--append``. An interrupted gzip file lacks its
+trailer and cannot be extended; write the remainder to a new file (the
+partial file still decompresses up to the printed cursor).
+
+Usage:
+    python scripts/export_feed.py --output feed.jsonl.gz [--batch-size 1000]
+    python scripts/export_feed.py --output feed.ndjson --cursor <id> --append
+    python scripts/export_feed.py > feed.ndjson
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, init_db
+from app.gateway.acp.feed import FEED_FORMAT_GZIP, FEED_FORMAT_NDJSON, encode_feed
+from app.services.product_service import ProductService
+
+
+def main():
+    """Export the product feed of the configured database."""
+    parser = argparse.ArgumentParser(description="Export the ACP product feed")
+    parser.add_argument("--output", help="Output file (default: stdout); .gz output is gzipped")
+    parser.add_argument("--cursor", help="Resume after this product ID")
+    parser.add_argument("--append", action="store_true", help="Append to the output file")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per database round trip")
+    args = parser.parse_args()
+
+    feed_format = FEED_FORMAT_GZIP if args.output and args.output.endswith(".gz") else FEED_FORMAT_NDJSON
+    if args.append and feed_format == FEED_FORMAT_GZIP:
+        parser.error("--append is only supported for NDJSON output; resume gzip exports into a new file")
+
+    init_db()
+
+    output = open(args.output, "ab" if args.append else "wb") if args.output else sys.stdout.buffer
+
+    progress = {"count": 0, "last_id": args.cursor}
+
+    def tracked(records):
+        for record in records:
+            # Counted before encoding: a chunk is yielded right after its last record
+            progress["count"] += 1
+            progress["last_id"] = record.id
+            yield record
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        records = ProductService(db).iter_catalog(after=args.cursor, batch_size=args.batch_size)
+        for chunk in encode_feed(tracked(records), feed_format):
+            output.write(chunk)
+            output.flush()
+            print(f"... {progress['count']} products, cursor={progress['last_id']}", file=sys.stderr)
+    finally:
+        db.close()
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    print(
+        f"✅ Feed exported: {progress['count']} products, last cursor={progress['last_id']} "
+        f"({time.perf_counter() - started:.2f}s)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
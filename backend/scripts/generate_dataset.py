@@ -0,0 +1,497 @@
+"""
+Generate a Synthetic Dataset
+
+Builds a production-sized database for scale testing: a product catalog
+with a realistic category tree, size variants and metadata, plus checkout
+sessions, orders and order events.
+
+Output is deterministic: the same --seed, counts and --until produce the
+same rows. Products are generated independently of each other (each from
+its own seeded generator), so sessions can reference any product without
+keeping the catalog in memory. Names, addresses and descriptions come from
+pools drawn once from a seeded Faker.
+
+Products are written through the bulk ingestion path
+(app/services/catalog_ingest.py); sessions, orders and events with batched
+executemany inserts in one transaction. Counts of 10k-5M products and
+millions of sessions are fine on a laptop; expect roughly ten thousand rows
+per second per table on a single core.
+
+Usage:
+    python scripts/generate_dataset.py --products 100000 --sessions 1000000 [--seed 42]
+    python scripts/generate_dataset.py --products 500000 --output catalog.jsonl.gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from faker import Faker
+from sqlalchemy import bindparam, insert
+
+from app.database import engine, init_db
+from app.models.checkout_session import CheckoutSession
+from app.models.gtin import gtin_check_digit
+from app.models.order import Order
+from app.models.order_event import OrderEvent
+from app.services.catalog_ingest import ingest_products
+from app.services.checkout_service import CheckoutService
+from app.services.pricing_engine import MINOR_UNITS, PricingEngine, to_minor
+from app.services.shipping_service import ShippingService
+
+
+# Category tree: top level -> subcategory -> leaves (a subcategory without
+# leaves is itself a leaf)
+CATEGORY_TREE = {
+    "Shoes": {
+        "Running": ["Road Running", "Trail Running", "Racing"],
+        "Basketball": ["High Tops", "Low Tops"],
+        "Lifestyle": ["Sneakers", "Slides", "Boots"],
+        "Training": ["Cross Training", "Weightlifting"],
+        "Soccer": ["Firm Ground Cleats", "Indoor Court"],
+        "Golf": [],
+        "Tennis": [],
+        "Skateboarding": [],
+    },
+    "Apparel": {
+        "Tops": ["T-Shirts", "Tank Tops", "Long Sleeve"],
+        "Hoodies & Sweatshirts": [],
+        "Jackets": ["Running Jackets", "Puffer Jackets"],
+        "Pants & Tights": ["Leggings", "Joggers"],
+        "Shorts": [],
+        "Sports Bras": [],
+    },
+    "Accessories": {
+        "Bags & Backpacks": [],
+        "Socks": [],
+        "Hats & Headwear": [],
+        "Gloves": [],
+    },
+    "Equipment": {
+        "Balls": ["Basketballs", "Soccer Balls"],
+        "Training Gear": [],
+        "Water Bottles": [],
+    },
+    "Gift Cards": {},
+}
+
+# Share of the catalog per top-level category
+CATEGORY_SHARE = {"Shoes": 0.45, "Apparel": 0.35, "Accessories": 0.1, "Equipment": 0.095, "Gift Cards": 0.005}
+
+PRICE_RANGE = {
+    "Shoes": (60, 250),
+    "Apparel": (25, 180),
+    "Accessories": (12, 90),
+    "Equipment": (15, 120),
+    "Gift Cards": (25, 200),
+}
+
+MODEL_LINES = {
+    "Shoes": [
+        "Air Max", "Air Zoom", "React", "Free", "Pegasus", "Vomero", "Invincible", "Dunk", "Blazer",
+        "Cortez", "Metcon", "Phantom", "Mercurial", "LeBron", "Air Force", "Waffle", "Infinity", "Structure",
+    ],
+    "Apparel": [
+        "Dri-FIT", "Tech Fleece", "Therma-FIT", "Club", "Pro", "Storm-FIT", "Essential", "Yoga", "Run Division",
+    ],
+    "Accessories": ["Heritage", "Brasilia", "Everyday", "Elite", "Club", "Utility"],
+    "Equipment": ["Elite", "Academy", "Premier", "Hypercharge", "Versa"],
+    "Gift Cards": ["Digital", "Physical"],
+}
+
+MODEL_SUFFIXES = ["SE", "Premium", "Retro", "Low", "Mid", "High", "Flyknit", "GORE-TEX", "Next Nature", "Pro", "Essential"]
+
+COLORS = [
+    "Black", "White", "Grey", "Navy", "Red", "Blue", "Green", "Pink", "Purple", "Orange",
+    "Volt", "Sail", "Brown", "Olive", "Cream", "Multi-Color",
+]
+
+GENDERS = ["men", "women", "unisex", "kids"]
+
+SHOE_SIZES = ["6", "6.5", "7", "7.5", "8", "8.5", "9", "9.5", "10", "10.5", "11", "11.5", "12", "13"]
+APPAREL_SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+SOCK_SIZES = ["S", "M", "L", "XL"]
+
+# Product noun per leaf category, where it is not the singular of the leaf name
+PRODUCT_NOUNS = {
+    "Long Sleeve": "Long-Sleeve Top",
+    "Hoodies & Sweatshirts": "Hoodie",
+    "Shorts": "Shorts",
+    "Leggings": "Leggings",
+    "Joggers": "Joggers",
+    "Bags & Backpacks": "Backpack",
+    "Socks": "Socks",
+    "Hats & Headwear": "Cap",
+    "Gloves": "Gloves",
+    "Training Gear": "Resistance Band",
+}
+
+# Each product owns a block of GTINs: its own, then one per variant
+GTIN_BLOCK = 32
+
+SESSION_STATUSES = [("completed", 0.4), ("ready_for_payment", 0.25), ("not_ready_for_payment", 0.2), ("canceled", 0.15)]
+ORDER_PROGRESSION = ["created", "confirmed", "processing", "shipped", "delivered"]
+
+# SQLAlchemy's storage format for DateTime on SQLite
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def gtin14(payload: int) -> str:
+    """GTIN-14 for a 13-digit payload, with its GS1 mod-10 check digit."""
+    digits = f"{payload:013d}"
+    return digits + str(gtin_check_digit(digits))
+
+
+def _category_leaves() -> List[Tuple[str, str, float]]:
+    """(top level, path, weight) per leaf; weights fall off Zipf-like within a top level."""
+    leaves = []
+    for top, subcategories in CATEGORY_TREE.items():
+        paths = []
+        for subcategory, children in subcategories.items():
+            if children:
+                paths += [f"{top} > {subcategory} > {child}" for child in children]
+            else:
+                paths.append(f"{top} > {subcategory}")
+        paths = paths or [top]
+        harmonic = sum(1 / rank for rank in range(1, len(paths) + 1))
+        leaves += [
+            (top, path, CATEGORY_SHARE[top] / (rank * harmonic))
+            for rank, path in enumerate(paths, start=1)
+        ]
+    return leaves
+
+
+def _json(value) -> Optional[str]:
+    return json.dumps(value) if value is not None else None
+
+
+class DatasetGenerator:
+    """Deterministic generator of products, sessions, orders and events."""
+
+    def __init__(self, seed: int, products: int, until: datetime, days: int):
+        self.seed = seed
+        self.product_count = products
+        self.until = until
+        self.days = days
+
+        fake = Faker("en_US")
+        fake.seed_instance(seed)
+        self.sentences = [fake.sentence(nb_words=12) for _ in range(2000)]
+        self.people = [
+            {
+                "first_name": fake.first_name(),
+                "last_name": fake.last_name(),
+                "email": fake.unique.email(),
+                "phone": "+1" + "".join(fake.random_choices("0123456789", length=10)),
+                "address_line_1": fake.street_address(),
+                "city": fake.city(),
+                "state": fake.state_abbr(include_territories=False),
+                "postal_code": fake.postcode(),
+            }
+            for _ in range(5000)
+        ]
+
+        self.leaves = _category_leaves()
+        self.leaf_weights = [weight for _, _, weight in self.leaves]
+
+        self.pricing_engine = PricingEngine(CheckoutService.TAX_RATE)
+
+        # Sessions mostly buy the same best sellers
+        self._cached_product = lru_cache(maxsize=20000)(self.product)
+
+    # ------------------------------------------------------------------
+    # Products
+    # ------------------------------------------------------------------
+
+    def product(self, n: int) -> Dict:
+        """The n-th product, as an ingestion row (same result for the same seed and n)."""
+        rng = random.Random(self.seed * 1_000_003 + n)
+        top, category, _ = rng.choices(self.leaves, weights=self.leaf_weights)[0]
+
+        line = rng.choice(MODEL_LINES[top])
+        leaf = category.rsplit(" > ", 1)[-1]
+        if top == "Shoes":
+            model = f"{line} {rng.randint(1, 99)}" if rng.random() < 0.5 else f"{line} {rng.choice(MODEL_SUFFIXES)}"
+            brand = "Jordan" if "Basketball" in category and rng.random() < 0.4 else (
+                "Nike SB" if "Skateboarding" in category else "Nike"
+            )
+        elif top == "Gift Cards":
+            model = f"{line} Gift Card"
+            brand = "Nike"
+        else:
+            noun = PRODUCT_NOUNS.get(leaf, leaf.rstrip("s"))
+            model = f"{line} {noun}" if rng.random() < 0.7 else f"{line} {rng.choice(MODEL_SUFFIXES)} {noun}"
+            brand = "Nike Sportswear" if rng.random() < 0.2 else "Nike"
+        color = rng.choice(COLORS)
+        title = f"{brand} {model}"[:150]
+
+        low, high = PRICE_RANGE[top]
+        price = Decimal(round(rng.uniform(low, high))) - (Decimal("0.01") if rng.random() < 0.6 else 0)
+
+        block = 1_000_000_000_000 + n * GTIN_BLOCK
+        if top == "Shoes":
+            sizes, system = SHOE_SIZES, "US"
+        elif top == "Apparel":
+            sizes, system = APPAREL_SIZES, "alpha"
+        elif "Socks" in category:
+            sizes, system = SOCK_SIZES, "alpha"
+        else:
+            sizes, system = [], None
+        variants = [
+            {"size": size, "size_system": system, "gtin": gtin14(block + index), "color": color}
+            for index, size in enumerate(sizes, start=1)
+            if rng.random() < 0.85
+        ] or None
+
+        availability = rng.choices(["in_stock", "out_of_stock", "preorder"], weights=[92, 7, 1])[0]
+        metadata = {
+            "gender": rng.choice(GENDERS),
+            "color": color,
+            "popularity_score": round(min(100.0, rng.lognormvariate(2.5, 0.9)), 1),
+        }
+        if top == "Shoes" and rng.random() < 0.02:
+            metadata["customizable"] = True
+
+        product_id = f"syn-{n:07d}"
+        return {
+            "id": product_id,
+            "gtin": gtin14(block),
+            "mpn": f"{rng.choice('ABCDFHJ')}{rng.choice('ABCDFHJVWXZ')}{rng.randint(1000, 9999)}-{rng.randint(0, 999):03d}",
+            "title": title,
+            "description": " ".join(rng.sample(self.sentences, rng.randint(2, 5))),
+            "brand": brand,
+            "category": category,
+            "price": str(price),
+            "currency": "USD",
+            "images": [f"https://static.example.com/products/{product_id}/{i}.jpg" for i in range(rng.randint(1, 4))],
+            "availability": availability,
+            "variants": variants,
+            "product_metadata": metadata,
+        }
+
+    def products(self) -> Iterator[Tuple[int, Dict]]:
+        """All products as (number, row) pairs for ingest_products()."""
+        for n in range(self.product_count):
+            yield n + 1, self.product(n)
+
+    # ------------------------------------------------------------------
+    # Checkout sessions, orders and events
+    # ------------------------------------------------------------------
+
+    def _pick_product(self, rng: random.Random) -> Dict:
+        # Power-law demand: low product numbers are the best sellers
+        for _ in range(10):
+            product = self._cached_product(int(self.product_count * rng.random() ** 3))
+            if product["availability"] == "in_stock" and not product["category"].startswith("Gift Cards"):
+                return product
+        return product
+
+    def history(self, sessions: int) -> Iterator[Tuple[str, tuple]]:
+        """
+        Checkout sessions with their orders and order events.
+
+        Yields:
+            (table name, row values in the column order of HISTORY_COLUMNS)
+        """
+        rng = random.Random(f"{self.seed}-history")
+        start = self.until - timedelta(days=self.days)
+        span = self.days * 86400
+        tag = f"{self.seed % 65536:04x}"
+        statuses, weights = zip(*SESSION_STATUSES)
+
+        for i in range(sessions):
+            created = start + timedelta(seconds=span * i / max(sessions, 1) + rng.random() * 60)
+            status = rng.choices(statuses, weights=weights)[0]
+            person = rng.choice(self.people)
+            address = None
+            if status != "not_ready_for_payment":
+                address = {
+                    "name": f"{person['first_name']} {person['last_name']}",
+                    **{key: person[key] for key in ("address_line_1", "city", "state", "postal_code")},
+                    "country": "US",
+                }
+            buyer = {key: person[key] for key in ("first_name", "last_name", "email", "phone")}
+
+            line_items = []
+            for _ in range(rng.choices([1, 2, 3, 4], weights=[60, 25, 10, 5])[0]):
+                product = self._pick_product(rng)
+                quantity = rng.choices([1, 2, 3], weights=[85, 12, 3])[0]
+                unit_amount = to_minor(product["price"])
+                line_item = {
+                    "gtin": product["gtin"],
+                    "product_id": product["id"],
+                    "title": product["title"],
+                    "quantity": quantity,
+                    "unit_price": unit_amount / MINOR_UNITS,
+                    "unit_amount": unit_amount,
+                    "total": unit_amount * quantity / MINOR_UNITS,
+                }
+                if product["variants"]:
+                    variant = rng.choice(product["variants"])
+                    line_item["gtin"] = variant["gtin"]
+                    line_item["variant"] = variant
+                line_items.append(line_item)
+
+            options = [dict(option) for option in ShippingService.SHIPPING_OPTIONS] if address else None
+            option = rng.choices(options, weights=[80, 15, 5])[0] if options else None
+            lines = [(item["unit_amount"], item["quantity"]) for item in line_items]
+            totals = self.pricing_engine.price_cart(lines, option).to_totals()
+
+            session_id = f"cs_{tag}{i:012x}"
+            order_id = f"order_{tag}{i:08x}" if status == "completed" else None
+            updated = created + timedelta(minutes=rng.randint(1, 30))
+            yield CheckoutSession.__tablename__, (
+                session_id, status, "USD", _json(line_items), _json(address), _json(options),
+                option["id"] if option else None, _json(totals), _json(buyer),
+                f"vt_{tag}{i:012x}" if status == "completed" else None, order_id, None,
+                created.strftime(_DATETIME_FORMAT), updated.strftime(_DATETIME_FORMAT),
+                (created + timedelta(hours=24)).strftime(_DATETIME_FORMAT),
+            )
+
+            if order_id:
+                yield from self._order(rng, i, tag, order_id, session_id, updated, line_items, address, option, totals, buyer)
+
+    def _order(self, rng, i, tag, order_id, session_id, created, line_items, address, option, totals, buyer):
+        # Older orders have progressed further; some are canceled on the way
+        age_days = (self.until - created).days
+        steps = min(len(ORDER_PROGRESSION), 1 + age_days // 2 + rng.randint(0, 1))
+        history = ORDER_PROGRESSION[:steps]
+        if rng.random() < 0.04:
+            history = history[:rng.randint(1, 3)] + ["canceled"]
+        status = history[-1]
+        tracking = f"1Z{rng.getrandbits(48):012X}" if "shipped" in history else None
+
+        moments = [created]
+        for _ in history[1:]:
+            moments.append(moments[-1] + timedelta(hours=rng.randint(2, 48)))
+
+        yield Order.__tablename__, (
+            order_id, session_id, status, _json(line_items), _json(address), _json(option), tracking,
+            _json(totals), _json(buyer), f"pi_{tag}{i:012x}", f"https://example.com/orders/{order_id}",
+            None, created.strftime(_DATETIME_FORMAT), moments[-1].strftime(_DATETIME_FORMAT),
+        )
+        for step, (event, moment) in enumerate(zip(history, moments)):
+            data = (
+                {"total": totals["total"]["value"], "items_count": len(line_items)}
+                if event == "created" else {"status": event}
+            )
+            yield OrderEvent.__tablename__, (
+                f"evt_{tag}{i:08x}{step:02x}", order_id, f"order.{event}", _json(data),
+                moment.strftime(_DATETIME_FORMAT),
+            )
+
+
+# Insert column order of the rows produced by DatasetGenerator.history()
+HISTORY_COLUMNS = {
+    CheckoutSession.__tablename__: (
+        "id", "status", "currency", "line_items", "fulfillment_address", "fulfillment_options",
+        "selected_fulfillment_option_id", "totals", "buyer_info", "payment_token_id", "order_id",
+        "session_metadata", "created_at", "updated_at", "expires_at",
+    ),
+    Order.__tablename__: (
+        "id", "checkout_session_id", "status", "line_items", "shipping_address", "shipping_option",
+        "tracking_number", "totals", "buyer_info", "payment_id", "permalink", "order_metadata",
+        "created_at", "updated_at",
+    ),
+    OrderEvent.__tablename__: ("id", "order_id", "event_type", "event_data", "created_at"),
+}
+
+
+def write_history(rows: Iterator[Tuple[str, tuple]], batch_size: int) -> Dict[str, int]:
+    """Insert history rows with driver-level executemany, one transaction for all of them."""
+    tables = {model.__tablename__: model.__table__ for model in (CheckoutSession, Order, OrderEvent)}
+    counts = {name: 0 for name in tables}
+    started = time.perf_counter()
+
+    with engine.begin() as connection:
+        statements = {}
+        for name, columns in HISTORY_COLUMNS.items():
+            compiled = insert(tables[name]).values({column: bindparam(column) for column in columns}).compile(
+                dialect=connection.dialect
+            )
+            statements[name] = (str(compiled), [columns.index(column) for column in compiled.positiontup])
+
+        batches = {name: [] for name in tables}
+
+        def flush(name):
+            sql, positions = statements[name]
+            connection.exec_driver_sql(sql, [tuple(row[p] for p in positions) for row in batches[name]])
+            counts[name] += len(batches[name])
+            batches[name] = []
+
+        for name, row in rows:
+            batches[name].append(row)
+            if len(batches[name]) >= batch_size:
+                flush(name)
+                if name == CheckoutSession.__tablename__ and counts[name] % (batch_size * 20) == 0:
+                    rate = sum(counts.values()) / (time.perf_counter() - started)
+                    print(f"... {counts[name]:,} sessions ({rate:,.0f} rows/s)", file=sys.stderr)
+        for name in tables:
+            if batches[name]:
+                flush(name)
+
+    return counts
+
+
+def main():
+    """Generate the dataset into the configured database (or a catalog file)."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog and order history")
+    parser.add_argument("--products", type=int, default=10000, help="Number of products")
+    parser.add_argument("--sessions", type=int, default=0, help="Number of checkout sessions (~40%% become orders)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--until", default="2026-01-01", help="Date of the newest session (ISO date)")
+    parser.add_argument("--days", type=int, default=365, help="Days of history before --until")
+    parser.add_argument("--output", help="Write the catalog to this JSONL file (.gz for gzip) instead of the database")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Validation processes for ingestion")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per executemany")
+    args = parser.parse_args()
+
+    generator = DatasetGenerator(args.seed, args.products, datetime.fromisoformat(args.until), args.days)
+
+    if args.output:
+        started = time.perf_counter()
+        opener = gzip.open if args.output.endswith(".gz") else open
+        with opener(args.output, "wt", encoding="utf-8") as output:
+            for _, product in generator.products():
+                output.write(json.dumps(product) + "\n")
+        print(f"✅ Wrote {args.products:,} products to {args.output} ({time.perf_counter() - started:.2f}s)")
+        return
+
+    init_db()
+
+    def progress(report):
+        if report.read % (args.batch_size * 20) == 0:
+            print(f"... {report.read:,} products ({report.rows_per_second:,.0f} rows/s)", file=sys.stderr)
+
+    report = ingest_products(
+        engine, generator.products(), batch_size=args.batch_size, workers=args.workers, on_progress=progress
+    )
+    print(
+        f"✅ Products: {report.written:,} written, {report.rejected:,} rejected "
+        f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+
+    if args.sessions:
+        started = time.perf_counter()
+        counts = write_history(generator.history(args.sessions), args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(
+            f"✅ History: {counts['checkout_sessions']:,} sessions, {counts['orders']:,} orders, "
+            f"{counts['order_events']:,} events in {elapsed:.2f}s ({sum(counts.values()) / elapsed:,.0f} rows/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Bulk Ingest Products
+
+Loads a product catalog from JSONL or CSV (optionally gzipped) with batched
+upserts keyed on GTIN, validating rows in worker processes. Search, variant
+and category indexes are rebuilt once at the end. See
+app/services/catalog_ingest.py for the row format.
+
+Usage:
+    python scripts/ingest_products.py catalog.jsonl.gz [--workers 4] [--batch-size 5000]
+    python scripts/ingest_products.py catalog.csv --format csv
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import engine, init_db
+from app.services.catalog_ingest import INGEST_FORMAT_CSV, INGEST_FORMAT_JSONL, ingest_products, read_product_rows
+
+
+def main():
+    """Ingest a catalog file into the configured database."""
+    parser = argparse.ArgumentParser(description="Bulk load products from JSONL or CSV")
+    parser.add_argument("input", help="Input file (.jsonl, .ndjson or .csv, optionally .gz)")
+    parser.add_argument("--format", choices=[INGEST_FORMAT_JSONL, INGEST_FORMAT_CSV], help="Override format detection")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Validation processes")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per upsert batch")
+    args = parser.parse_args()
+
+    init_db()
+
+    def progress(report):
+        print(
+            f"... {report.read:,} rows ({report.rows_per_second:,.0f} rows/s), "
+            f"{report.written:,} written, {report.rejected:,} rejected",
+            file=sys.stderr
+        )
+
+    report = ingest_products(
+        engine,
+        read_product_rows(args.input, args.format),
+        batch_size=args.batch_size,
+        workers=args.workers,
+        on_progress=progress
+    )
+
+    for number, message in report.errors:
+        print(f"⚠️  Line {number}: {message}", file=sys.stderr)
+    if report.rejected > len(report.errors):
+        print(f"⚠️  ... and {report.rejected - len(report.errors):,} more rejected rows", file=sys.stderr)
+
+    print(
+        f"✅ Ingested {report.read:,} rows in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s): "
+        f"{report.written:,} written, {report.unchanged:,} unchanged, {report.rejected:,} rejected"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Recompute Product Buyability
+
+Re-evaluates the buyability rules (app/models/buyability.py) for every
+product and stores the changed outcomes. Run after changing the rules;
+products written afterwards are evaluated automatically.
+
+Usage:
+    python scripts/recompute_buyability.py [--batch-size 1000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import engine, init_db
+from app.models.buyability import recompute_buyability
+from app.services.catalog_events import publish_catalog_change
+
+
+def main():
+    """Recompute buyability for the configured database."""
+    parser = argparse.ArgumentParser(description="Recompute stored product buyability")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per read/update batch")
+    args = parser.parse_args()
+    
+    init_db()
+    
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        changed = recompute_buyability(connection, batch_size=args.batch_size)
+    publish_catalog_change(engine)
+    
+    print(f"✅ Buyability recomputed: {changed} products changed ({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -101,7 +101,7 @@ class MCPFlowTester:
         
         # Parse products from result
         products_text = search_result['content'][1]['resource']['text']
-        products = eval(products_text)
+        products = eval(products_text)['products']
         
         self.print_success(f"Found {len(products)} products:")
         for p in products:
@@ -0,0 +1,105 @@
+"""
+Integration Tests for the Catalog REST API
+
+Tests the HTTP search endpoint end to end: routing, query parameter
+parsing, pagination and facets.
+"""
+
+import pytest
+from decimal import Decimal
+from app.models.product import Product
+
+
+@pytest.mark.integration
+class TestCatalogSearchAPI:
+    """Integration tests for GET /catalog/v1/products/search."""
+    
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create three shoes and a shirt."""
+        db_session.add_all([
+            Product(
+                id=f"shoe-{i}",
+                gtin=str(30000000000000 + i),
+                title=f"Nike Running Shoe {i}",
+                category="Shoes > Running",
+                price=Decimal("90.00") + 20 * i,
+                product_metadata={"color": "Black", "popularity_score": i + 1}
+            )
+            for i in range(3)
+        ] + [
+            Product(
+                id="shirt",
+                gtin="30000000000099",
+                title="Nike Training Shirt",
+                category="Apparel > Training",
+                price=Decimal("35.00"),
+                product_metadata={"color": "Blue"}
+            )
+        ])
+        db_session.commit()
+    
+    def test_search_pages_with_facets(self, test_client, catalog):
+        """Test a faceted first page and its continuation."""
+        # WHEN: Searching two products at a time with facets
+        response = test_client.get(
+            "/catalog/v1/products/search",
+            params={"q": "nike", "limit": 2, "sort": "popularity", "facets": "true"}
+        )
+        
+        # THEN: First page, cursor and facets over all four matches
+        assert response.status_code == 200
+        body = response.json()
+        assert [p["id"] for p in body["products"]] == ["shoe-2", "shoe-1"]
+        assert body["facets"]["category"] == {
+            "Shoes": 3, "Shoes > Running": 3, "Apparel": 1, "Apparel > Training": 1
+        }
+        assert body["facets"]["color"] == {"Black": 3, "Blue": 1}
+        
+        # WHEN: Following the cursor
+        response = test_client.get(
+            "/catalog/v1/products/search",
+            params={"q": "nike", "limit": 2, "sort": "popularity", "cursor": body["next_cursor"]}
+        )
+        
+        # THEN: The remaining products, and no further cursor
+        body = response.json()
+        assert [p["id"] for p in body["products"]] == ["shoe-0", "shirt"]
+        assert body["next_cursor"] is None
+        assert "facets" not in body
+    
+    def test_search_category_filter(self, test_client, catalog):
+        """Test filtering by category name."""
+        response = test_client.get("/catalog/v1/products/search", params={"category": "running"})
+        
+        assert response.status_code == 200
+        assert {p["id"] for p in response.json()["products"]} == {"shoe-0", "shoe-1", "shoe-2"}
+    
+    def test_invalid_cursor_returns_400(self, test_client, catalog):
+        """Test that a bad cursor is a client error."""
+        response = test_client.get("/catalog/v1/products/search", params={"cursor": "garbage"})
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "invalid"
+    
+    def test_misspelled_query_is_corrected(self, test_client, catalog):
+        """Test that a query with typos reports the corrected query."""
+        response = test_client.get("/catalog/v1/products/search", params={"q": "trainng shirtt"})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["corrected_query"] == "training shirt"
+        assert [p["id"] for p in body["products"]] == ["shirt"]
+    
+    def test_autocomplete(self, test_client, catalog, monkeypatch):
+        """Test suggestions for a typed prefix."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "autocomplete_background_refresh", False)
+        
+        response = test_client.get("/catalog/v1/autocomplete", params={"q": "nike r", "limit": 2})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["query"] == "nike r"
+        assert [s["text"] for s in body["suggestions"]] == ["Nike Running Shoe 2", "Nike Running Shoe 1"]
+        assert body["suggestions"][0]["kind"] == "product"
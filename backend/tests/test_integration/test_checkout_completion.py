@@ -0,0 +1,111 @@
+"""
+Integration Tests for Checkout Completion
+
+Tests POST /acp/v1/checkout_sessions/{id}/complete and the MCP
+complete_purchase tool end to end: the order, its creation event and the
+completed session are committed together, once, and a failure while
+completing the session leaves no order behind.
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import event
+
+from app.mcp.handlers import MCPHandlers
+from app.models.checkout_session import CheckoutSession
+from app.models.order import Order
+from app.models.order_event import OrderEvent
+from app.models.product import Product
+from app.services.checkout_service import CheckoutService
+
+
+def _fail(*args, **kwargs):
+    raise RuntimeError("session store unavailable")
+
+
+@pytest.mark.integration
+class TestCheckoutCompletion:
+    """Integration tests for completing a checkout session."""
+
+    @pytest.fixture
+    def checkout_session(self, db_session, sample_shipping_address):
+        """Create a checkout session ready for payment."""
+        db_session.add(Product(
+            id="tee", gtin="04006381333931", title="Nike Tee", price=Decimal("25.00"), availability="in_stock"
+        ))
+        db_session.commit()
+        return CheckoutService(db_session).create_session(
+            items=[{"product_id": "tee", "quantity": 2}],
+            address=sample_shipping_address,
+            buyer_info={"email": "buyer@example.com"}
+        )
+
+    @pytest.fixture
+    def commit_counter(self, db_engine):
+        """Count transactions committed on the test engine."""
+        commits = []
+
+        def record(conn):
+            commits.append(conn)
+
+        event.listen(db_engine, "commit", record)
+        yield commits
+        event.remove(db_engine, "commit", record)
+
+    def _assert_completed_once(self, db_session, session_id, commit_counter):
+        assert len(commit_counter) == 1
+        db_session.expire_all()
+        session = db_session.get(CheckoutSession, session_id)
+        order = db_session.query(Order).one()
+        assert (session.status, session.order_id) == ("completed", order.id)
+        assert db_session.query(OrderEvent).filter_by(order_id=order.id).count() == 1
+
+    def _assert_nothing_written(self, db_session, session_id, commit_counter):
+        assert commit_counter == []
+        db_session.expire_all()
+        assert db_session.query(Order).count() == 0
+        assert db_session.query(OrderEvent).count() == 0
+        assert db_session.get(CheckoutSession, session_id).status == "ready_for_payment"
+
+    def test_acp_complete_commits_once(self, test_client, db_session, checkout_session, commit_counter):
+        """Test that the ACP endpoint writes order, event and session in one commit."""
+        response = test_client.post(
+            f"/acp/v1/checkout_sessions/{checkout_session.id}/complete",
+            json={"payment_token_id": "tok_123"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        self._assert_completed_once(db_session, checkout_session.id, commit_counter)
+
+    def test_acp_complete_failure_leaves_no_order(
+        self, test_client, db_session, checkout_session, commit_counter, monkeypatch
+    ):
+        """Test that an error while completing the session rolls back the order."""
+        monkeypatch.setattr(CheckoutService, "complete_session", _fail)
+
+        response = test_client.post(
+            f"/acp/v1/checkout_sessions/{checkout_session.id}/complete",
+            json={"payment_token_id": "tok_123"}
+        )
+
+        assert response.status_code == 500
+        self._assert_nothing_written(db_session, checkout_session.id, commit_counter)
+
+    async def test_mcp_complete_purchase_commits_once(self, db_session, checkout_session, commit_counter):
+        """Test that the MCP tool writes order, event and session in one commit."""
+        result = await MCPHandlers(db_session).complete_purchase(checkout_session.id, {"card_number": "4242"})
+
+        assert result["success"] is True
+        self._assert_completed_once(db_session, checkout_session.id, commit_counter)
+
+    async def test_mcp_complete_purchase_failure_leaves_no_order(
+        self, db_session, checkout_session, commit_counter, monkeypatch
+    ):
+        """Test that an error while completing the session rolls back the order."""
+        monkeypatch.setattr(CheckoutService, "complete_session", _fail)
+
+        with pytest.raises(RuntimeError):
+            await MCPHandlers(db_session).complete_purchase(checkout_session.id, {"card_number": "4242"})
+
+        self._assert_nothing_written(db_session, checkout_session.id, commit_counter)
@@ -0,0 +1,176 @@
+"""
+Integration Tests for the ACP Product Feed
+
+Tests GET /acp/v1/product_feed end to end: NDJSON and gzip encoding, ACP
+item fields, and resuming an interrupted transfer from a cursor. Tests
+GET /acp/v1/product_feed/changes: changes and tombstones since a
+watermark, and the next watermark.
+"""
+
+import gzip
+import json
+import zlib
+
+import pytest
+from decimal import Decimal
+from app.gateway.acp.feed import encode_feed
+from app.models.product import Product
+from app.models.product_record import ProductRecord
+
+
+def _lines(body: bytes):
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+@pytest.mark.integration
+class TestProductFeedAPI:
+    """Integration tests for the streaming product feed."""
+    
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create five products, one of them not purchasable."""
+        db_session.add_all([
+            Product(
+                id=f"shoe-{i}",
+                gtin=str(40000000000000 + i),
+                title=f"Nike Shoe {i}",
+                category="Shoes > Running",
+                price=Decimal("90.00") + i,
+                images=[f"https://example.com/shoe-{i}.jpg", f"https://example.com/shoe-{i}-side.jpg"],
+                availability="in_stock" if i else "out_of_stock",
+                product_metadata={"color": "Black"}
+            )
+            for i in range(5)
+        ])
+        db_session.commit()
+    
+    def test_ndjson_feed(self, test_client, catalog):
+        """Test one ACP item per line in product ID order."""
+        # WHEN: Requesting the feed in small batches
+        response = test_client.get("/acp/v1/product_feed", params={"batch_size": 2})
+        
+        # THEN: Every product, one JSON object per line
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = _lines(response.content)
+        assert [item["id"] for item in items] == [f"shoe-{i}" for i in range(5)]
+        
+        # AND: Items use ACP feed attributes
+        item = items[1]
+        assert item["price"] == "91.00 USD"
+        assert item["image_link"] == "https://example.com/shoe-1.jpg"
+        assert item["additional_image_link"] == ["https://example.com/shoe-1-side.jpg"]
+        assert item["product_category"] == "Shoes > Running"
+        assert item["enable_search"] is True
+        assert item["enable_checkout"] is True
+        assert items[0]["enable_checkout"] is False  # Out of stock
+    
+    def test_gzip_feed(self, test_client, catalog):
+        """Test that jsonl.gz is a gzip file of the same lines."""
+        plain = test_client.get("/acp/v1/product_feed").content
+        
+        response = test_client.get("/acp/v1/product_feed", params={"format": "jsonl.gz"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert gzip.decompress(response.content) == plain
+    
+    def test_resume_from_cursor(self, test_client, catalog):
+        """Test that a feed resumed after the last received ID completes it."""
+        response = test_client.get("/acp/v1/product_feed", params={"cursor": "shoe-2"})
+        
+        assert [item["id"] for item in _lines(response.content)] == ["shoe-3", "shoe-4"]
+    
+    def test_unknown_format_returns_400(self, test_client, catalog):
+        """Test that unsupported formats are rejected before streaming."""
+        response = test_client.get("/acp/v1/product_feed", params={"format": "csv"})
+        
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "invalid"
+    
+    def test_gzip_chunks_decompress_incrementally(self, db_session, catalog):
+        """Test that every gzip chunk received so far decodes to whole lines."""
+        records = [
+            ProductRecord.from_product(product)
+            for product in db_session.query(Product).order_by(Product.id)
+        ]
+        
+        chunks = list(encode_feed(records, "jsonl.gz", chunk_size=1))
+        
+        # One chunk per line, then the gzip trailer
+        assert len(chunks) == 6
+        
+        # Everything before the trailer already decodes to complete lines
+        partial = zlib.decompressobj(wbits=31).decompress(b"".join(chunks[:3]))
+        assert [item["id"] for item in _lines(partial)] == ["shoe-0", "shoe-1", "shoe-2"]
+
+
+@pytest.mark.integration
+class TestProductFeedChangesAPI:
+    """Integration tests for the delta feed."""
+    
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create three products changed a minute apart, then delete one."""
+        db_session.add_all([
+            Product(id=f"shoe-{i}", gtin=str(40000000000000 + i), title=f"Nike Shoe {i}", price=Decimal("90.00"))
+            for i in range(3)
+        ])
+        db_session.commit()
+        connection = db_session.connection()
+        for i in range(3):
+            connection.exec_driver_sql(
+                "UPDATE products SET updated_at = ? WHERE id = ?", (f"2026-01-01 10:0{i}:00", f"shoe-{i}")
+            )
+        db_session.delete(db_session.get(Product, "shoe-1"))
+        db_session.flush()
+        connection.exec_driver_sql("UPDATE product_tombstones SET deleted_at = '2026-01-01 10:05:00'")
+        db_session.commit()
+    
+    def test_changes_since_watermark(self, test_client, catalog):
+        """Test upserts and tombstones after the watermark, then the next watermark."""
+        # WHEN: Requesting changes after the first product's change
+        response = test_client.get(
+            "/acp/v1/product_feed/changes",
+            params={"updated_at": "2026-01-01T10:00:00Z", "id": "shoe-0"}
+        )
+        
+        # THEN: The later change and the deletion, in change order
+        assert response.status_code == 200
+        lines = _lines(response.content)
+        assert [(line["op"], line["id"]) for line in lines] == [
+            ("upsert", "shoe-2"), ("delete", "shoe-1"), ("watermark", "shoe-1")
+        ]
+        assert lines[0]["item"]["price"] == "90.00 USD"
+        assert lines[1]["gtin"] == "40000000000001"
+        
+        # AND: The watermark line points after the last change
+        assert lines[-1] == {"op": "watermark", "updated_at": "2026-01-01 10:05:00", "id": "shoe-1", "has_more": False}
+        
+        # WHEN: Requesting again from that watermark
+        again = _lines(test_client.get(
+            "/acp/v1/product_feed/changes",
+            params={"updated_at": lines[-1]["updated_at"], "id": lines[-1]["id"]}
+        ).content)
+        
+        # THEN: Only the unchanged watermark
+        assert again == [lines[-1]]
+    
+    def test_initial_sync_with_limit(self, test_client, catalog):
+        """Test that omitting the watermark starts from the first change."""
+        response = test_client.get(
+            "/acp/v1/product_feed/changes", params={"limit": 1, "format": "jsonl.gz"}
+        )
+        
+        lines = _lines(gzip.decompress(response.content))
+        assert [line["id"] for line in lines] == ["shoe-0", "shoe-0"]
+        assert lines[-1]["has_more"] is True
+    
+    def test_invalid_watermark_returns_400(self, test_client, catalog):
+        """Test that malformed watermarks are rejected before streaming."""
+        bad_timestamp = test_client.get("/acp/v1/product_feed/changes", params={"updated_at": "last week"})
+        id_only = test_client.get("/acp/v1/product_feed/changes", params={"id": "shoe-0"})
+        
+        assert bad_timestamp.status_code == 400
+        assert id_only.status_code == 400
+        assert id_only.json()["detail"]["code"] == "invalid"
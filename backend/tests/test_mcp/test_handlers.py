@@ -0,0 +1,72 @@
+"""
+Tests for MCP Tool Handlers
+
+Test Coverage:
+1. get_products_details() - request order, per-item errors for invalid,
+   unknown and non-string GTINs, the MAX_DETAILS_GTINS limit, one query per
+   batch
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.mcp.handlers import MAX_DETAILS_GTINS, MCPHandlers
+from app.models.product import Product
+
+
+@pytest.mark.unit
+@pytest.mark.mcp
+class TestGetProductsDetails:
+    """Test suite for the get_products_details tool."""
+
+    @pytest.fixture
+    def handlers(self, db_session, sample_product):
+        """Handlers over a catalog of two products."""
+        db_session.add(Product(
+            id="tee", gtin="04006381333931", title="Nike Tee", price=Decimal("25.00"), availability="in_stock"
+        ))
+        db_session.commit()
+        return MCPHandlers(db_session)
+
+    async def test_products_in_request_order(self, handlers, sample_product):
+        """Test that details come back in the order the GTINs were requested."""
+        result = await handlers.get_products_details(["04006381333931", sample_product.gtin])
+
+        assert [p["id"] for p in result["products"]] == ["tee", sample_product.id]
+        assert result["products"][0]["price"] == 25.0
+
+    async def test_per_item_errors(self, handlers, sample_product):
+        """Test that bad or unknown GTINs fail on their own and the rest still resolve."""
+        result = await handlers.get_products_details(
+            ["123", sample_product.gtin, 4006381333931, "99999999999999", "abcdefgh"]
+        )
+
+        invalid, found, not_string, unknown, not_numeric = result["products"]
+        assert invalid == {"gtin": "123", "error": "GTIN must be 8-14 digits, got 3 digits"}
+        assert found["id"] == sample_product.id
+        assert not_string == {"gtin": 4006381333931, "error": "GTIN must be a string, got: 4006381333931"}
+        assert unknown == {"gtin": "99999999999999", "error": "Product with GTIN '99999999999999' not found"}
+        assert not_numeric["error"] == "GTIN must be numeric, got: abcdefgh"
+
+    @pytest.mark.parametrize("gtins", [[], None, "04006381333931"])
+    async def test_requires_non_empty_list(self, handlers, gtins):
+        """Test that anything but a non-empty list is rejected as a whole."""
+        assert await handlers.get_products_details(gtins) == {"error": "gtins must be a non-empty list"}
+
+    async def test_batch_limit(self, handlers):
+        """Test that at most MAX_DETAILS_GTINS GTINs are looked up per call."""
+        at_limit = await handlers.get_products_details(["04006381333931"] * MAX_DETAILS_GTINS)
+        over_limit = await handlers.get_products_details(["04006381333931"] * (MAX_DETAILS_GTINS + 1))
+
+        assert len(at_limit["products"]) == MAX_DETAILS_GTINS
+        assert over_limit == {"error": f"At most {MAX_DETAILS_GTINS} GTINs per call, got {MAX_DETAILS_GTINS + 1}"}
+
+    async def test_one_query_per_batch(self, handlers, sample_product, statement_counter):
+        """Test that the whole batch is fetched with a single SELECT."""
+        gtins = [sample_product.gtin, "04006381333931", "99999999999999", "123"]
+        statement_counter.clear()
+
+        result = await handlers.get_products_details(gtins)
+
+        assert len(result["products"]) == 4
+        assert [statement.split()[0] for statement in statement_counter] == ["SELECT"]
@@ -0,0 +1,82 @@
+"""
+Tests for Product Buyability
+
+Test Coverage:
+1. evaluate_buyability() rules and reason codes
+2. Outcome stored on insert and update
+3. recompute_buyability() after rule changes
+"""
+
+import pytest
+from decimal import Decimal
+from app.models.product import Product
+from app.models.buyability import (
+    evaluate_buyability,
+    recompute_buyability,
+    buyability_message,
+    OUT_OF_STOCK,
+    GIFT_CARD,
+    CUSTOMIZABLE,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestBuyability:
+    """Test suite for write-time buyability."""
+    
+    @pytest.mark.parametrize("availability,title,category,metadata,expected", [
+        ("in_stock", "Nike Air Max 90", "Shoes > Running", None, None),
+        ("out_of_stock", "Nike Air Max 90", "Shoes > Running", None, OUT_OF_STOCK),
+        ("in_stock", "Nike Gift Card", "Gifts", None, GIFT_CARD),
+        ("in_stock", "Nike eGift", "Gift Cards", None, GIFT_CARD),
+        ("in_stock", "Air Force 1", "Shoes > Customizable", None, CUSTOMIZABLE),
+        ("in_stock", "Air Force 1 By You", "Shoes", {"customizable": True}, CUSTOMIZABLE),
+        ("out_of_stock", "Nike Gift Card", "Gift Cards", None, OUT_OF_STOCK),
+    ])
+    def test_evaluate_buyability(self, availability, title, category, metadata, expected):
+        """Test each rule and that the first failing rule wins."""
+        assert evaluate_buyability(availability, title, category, metadata) == expected
+    
+    def test_outcome_stored_on_write(self, db_session, sample_product):
+        """Test that inserts and updates store the evaluated outcome."""
+        # Then: A buyable product is stored as such
+        assert sample_product.is_buyable is True
+        assert sample_product.buyability_reason is None
+        
+        # When: It goes out of stock
+        sample_product.availability = "out_of_stock"
+        db_session.commit()
+        
+        # Then: The stored outcome follows
+        assert sample_product.is_buyable is False
+        assert sample_product.buyability_reason == OUT_OF_STOCK
+        assert buyability_message(sample_product.buyability_reason) == "Product is out of stock"
+    
+    def test_recompute_fixes_stale_outcomes(self, db_session, sample_product):
+        """Test that a bulk recompute re-evaluates rows written under old rules."""
+        # Given: A gift card stored as buyable (e.g., written before the rule existed)
+        db_session.add(Product(
+            id="gift-card",
+            gtin="00883419999999",
+            title="Nike Gift Card",
+            category="Gift Cards",
+            price=Decimal("50.00")
+        ))
+        db_session.commit()
+        connection = db_session.connection()
+        connection.execute(
+            Product.__table__.update()
+            .where(Product.__table__.c.id == "gift-card")
+            .values(is_buyable=True, buyability_reason=None)
+        )
+        
+        # When: Recomputing
+        changed = recompute_buyability(connection, batch_size=1)
+        
+        # Then: Only the stale row changes
+        assert changed == 1
+        gift_card = db_session.get(Product, "gift-card", populate_existing=True)
+        assert gift_card.is_buyable is False
+        assert gift_card.buyability_reason == GIFT_CARD
+        assert recompute_buyability(connection) == 0
@@ -0,0 +1,147 @@
+"""
+Tests for Category Models
+
+Test Coverage:
+1. Tree and closure rows created from product category paths
+2. Subtree product counts maintained on insert, update and delete
+3. Rebuild / backfill from existing products
+4. Path helpers
+"""
+
+import pytest
+from decimal import Decimal
+from app.models.product import Product
+from app.models.category import (
+    Category,
+    CategoryClosure,
+    ProductCategory,
+    category_matches,
+    ensure_categories,
+    rebuild_categories,
+    split_category_path,
+)
+
+
+def _counts(db_session):
+    db_session.expire_all()
+    return {c.path: c.product_count for c in db_session.query(Category).all()}
+
+
+def _product(product_id, gtin, category):
+    return Product(
+        id=product_id,
+        gtin=gtin,
+        title=product_id,
+        category=category,
+        price=Decimal("10.00")
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestCategoryModel:
+    """Test suite for the materialized category tree."""
+
+    @pytest.fixture
+    def products(self, db_session):
+        """Create products in three categories."""
+        products = [
+            _product("air-max", "00883419552502", "Shoes > Running > Sneakers"),
+            _product("pegasus", "00883419552503", "Shoes > Running"),
+            _product("shirt", "00883419552504", "Apparel > Training > Shirts"),
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return products
+
+    def test_paths_create_nodes_and_closure(self, db_session, products):
+        """Test that every path prefix becomes a node with its ancestors."""
+        # Then: One node per distinct prefix
+        nodes = {c.path: c for c in db_session.query(Category).all()}
+        assert set(nodes) == {
+            "Shoes", "Shoes > Running", "Shoes > Running > Sneakers",
+            "Apparel", "Apparel > Training", "Apparel > Training > Shirts",
+        }
+        sneakers = nodes["Shoes > Running > Sneakers"]
+        assert sneakers.depth == 2
+        assert sneakers.name == "Sneakers"
+        assert sneakers.parent_id == nodes["Shoes > Running"].id
+
+        # And: The closure lists the node, its parent and its grandparent
+        ancestors = {
+            row.ancestor_id: row.distance
+            for row in db_session.query(CategoryClosure).filter_by(descendant_id=sneakers.id)
+        }
+        assert ancestors == {sneakers.id: 0, nodes["Shoes > Running"].id: 1, nodes["Shoes"].id: 2}
+
+    def test_counts_include_descendants(self, db_session, products):
+        """Test that product counts cover each node's subtree."""
+        counts = _counts(db_session)
+
+        assert counts["Shoes"] == 2
+        assert counts["Shoes > Running"] == 2
+        assert counts["Shoes > Running > Sneakers"] == 1
+        assert counts["Apparel"] == 1
+
+    def test_counts_follow_category_change(self, db_session, products):
+        """Test that moving a product adjusts both old and new ancestors."""
+        # When: Moving the shirt under Shoes
+        products[2].category = "Shoes > Running > Socks"
+        db_session.commit()
+
+        # Then: Counts move with it
+        counts = _counts(db_session)
+        assert counts["Shoes"] == 3
+        assert counts["Shoes > Running > Socks"] == 1
+        assert counts["Apparel"] == 0
+        assert db_session.get(ProductCategory, "shirt").category_id == (
+            db_session.query(Category).filter_by(path="Shoes > Running > Socks").one().id
+        )
+
+    def test_counts_follow_delete(self, db_session, products):
+        """Test that deleting a product decrements its ancestors."""
+        db_session.delete(products[0])
+        db_session.commit()
+
+        counts = _counts(db_session)
+        assert counts["Shoes"] == 1
+        assert counts["Shoes > Running > Sneakers"] == 0
+        assert db_session.get(ProductCategory, "air-max") is None
+
+    def test_paths_are_normalized(self, db_session, products):
+        """Test that spacing and case variants map to the same node."""
+        db_session.add(_product("vomero", "00883419552505", "shoes>running "))
+        db_session.commit()
+
+        assert _counts(db_session)["Shoes > Running"] == 3
+
+    def test_rebuild_matches_incremental_counts(self, db_session, products):
+        """Test that a full rebuild reproduces the maintained tree."""
+        before = _counts(db_session)
+
+        mapped = rebuild_categories(db_session.connection())
+
+        assert mapped == 3
+        assert _counts(db_session) == before
+
+    def test_backfilled_on_upgrade(self, db_session, products):
+        """Test that ensure_categories maps products written before the tree existed."""
+        # Given: An empty tree
+        connection = db_session.connection()
+        connection.execute(ProductCategory.__table__.delete())
+        connection.execute(CategoryClosure.__table__.delete())
+        connection.execute(Category.__table__.delete())
+
+        # When: Upgrading the schema
+        ensure_categories(connection)
+
+        # Then: The tree is rebuilt
+        assert _counts(db_session)["Shoes"] == 2
+
+    def test_category_matches(self):
+        """Test path and name matching used by the in-memory engine."""
+        assert category_matches("Shoes > Running > Sneakers", "Shoes > Running")
+        assert category_matches("Shoes > Running > Sneakers", "running")
+        assert not category_matches("Shoes > Road Running", "Running")
+        assert not category_matches("Shoes > Running", "Shoes > Run")
+        assert split_category_path(" Shoes >Running> ") == ["Shoes", "Running"]
@@ -0,0 +1,46 @@
+"""
+Tests for GTIN Normalization
+
+Test Coverage:
+1. canonical_gtin() - padding of GTIN-8/UPC-A/EAN-13/GTIN-14, check digits
+2. canonical_gtin_sql() - same result as the Python version in SQLite
+"""
+
+import random
+
+import pytest
+
+from app.models.gtin import canonical_gtin, canonical_gtin_sql
+
+
+@pytest.mark.unit
+class TestCanonicalGTIN:
+    """Test suite for GTIN normalization."""
+
+    @pytest.mark.parametrize("gtin, expected", [
+        ("96385074", "00000096385074"),        # GTIN-8
+        ("012345678905", "00012345678905"),    # UPC-A
+        ("4006381333931", "04006381333931"),   # EAN-13
+        ("04006381333931", "04006381333931"),  # GTIN-14
+        ("4006381333932", None),               # Wrong check digit
+        ("99999999999999", None),
+        ("123456789", None),                   # Not a GTIN length
+        ("40063813339a1", None),
+        ("", None),
+    ])
+    def test_canonical_gtin(self, gtin, expected):
+        """Test that valid GTINs are zero-padded to 14 digits and others rejected."""
+        assert canonical_gtin(gtin) == expected
+
+    def test_sql_expression_matches_python(self, db_session):
+        """Test that the generated-column expression agrees with canonical_gtin()."""
+        rng = random.Random(7)
+        gtins = ["".join(rng.choice("0123456789") for _ in range(rng.choice([8, 9, 12, 13, 14]))) for _ in range(2000)]
+        gtins += ["012345678905", "96385074", "12a45678"]
+
+        connection = db_session.connection()
+        statement = f"WITH t(gtin) AS (VALUES (?)) SELECT {canonical_gtin_sql('gtin')} FROM t"
+        results = [connection.exec_driver_sql(statement, (gtin,)).scalar() for gtin in gtins]
+
+        assert results == [canonical_gtin(gtin) for gtin in gtins]
+        assert sum(result is not None for result in results) > 100
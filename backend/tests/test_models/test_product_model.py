@@ -9,6 +9,7 @@ Following TDD principles, we test:
 5. Indexes
 6. to_dict() method
 7. Timestamps
+8. Generated metadata columns and their migration
 """
 
 import pytest
@@ -309,4 +310,165 @@ class TestProductModel:
         # Then: Product is found
         assert len(found_products) >= 1
         assert sample_product in found_products
-
+    
+    # ============================================================================
+    # Generated Metadata Columns
+    # ============================================================================
+    
+    def test_generated_columns_follow_metadata(self, db_session, sample_product):
+        """Test that hot metadata fields are readable as columns."""
+        # Then: Values come from product_metadata
+        db_session.refresh(sample_product)
+        assert sample_product.popularity_score == 85.0
+        assert sample_product.gender == "unisex"
+        assert sample_product.color == "White"
+        assert sample_product.customizable is False
+        
+        # When: Metadata changes
+        sample_product.product_metadata = {"popularity_score": "12.5", "customizable": True}
+        db_session.commit()
+        
+        # Then: Columns are recomputed; missing fields fall back to defaults
+        assert sample_product.popularity_score == 12.5
+        assert sample_product.gender is None
+        assert sample_product.customizable is True
+    
+    def test_generated_columns_are_indexed(self, db_session, sample_product):
+        """Test that attribute filters and popularity order use indexes."""
+        connection = db_session.connection()
+        
+        def plan(sql):
+            return " ".join(row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+        
+        assert "ix_products_color" in plan("SELECT id FROM products WHERE color = 'white'")
+        assert "ix_products_gender" in plan("SELECT id FROM products WHERE gender = 'UNISEX'")
+        assert "ix_products_popularity" in plan(
+            "SELECT id FROM products ORDER BY popularity_score DESC, id LIMIT 10"
+        )
+        assert "ix_products_updated_at_id" in plan(
+            "SELECT id FROM products WHERE (updated_at, id) > ('2026-01-01 00:00:00', '') "
+            "ORDER BY updated_at, id LIMIT 10"
+        )
+        # NOCASE collation makes equality case-insensitive
+        assert db_session.query(Product).filter(Product.color == "WHITE").one() == sample_product
+    
+    def test_canonical_gtin_is_unique(self, db_session, sample_product):
+        """Test that a second spelling of a stored GTIN is rejected."""
+        # sample_product is stored as GTIN-14 00883419552502; this is its EAN-13
+        db_session.add(Product(id="copy", gtin="0883419552502", title="Copy", price=Decimal("1.00")))
+        
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+    
+    def test_products_reload_after_commit(self, db_session, sample_product):
+        """Test that a plain commit expires products, so values written by the database are read again."""
+        # Like a trigger or bulk statement, this write bypasses the loaded object
+        db_session.execute(Product.__table__.update().values(is_buyable=False, buyability_reason="recalled"))
+        db_session.commit()
+        
+        assert (sample_product.is_buyable, sample_product.buyability_reason) == (False, "recalled")
+    
+    def test_gtin14_index_made_unique_on_upgrade(self):
+        """Test that upgrade_schema replaces the old non-unique gtin14 index."""
+        from sqlalchemy import create_engine
+        from app.database import Base
+        from app.models.migrations import upgrade_schema
+        
+        # Given: A database with the non-unique index of earlier versions
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX ix_products_gtin14")
+            connection.exec_driver_sql("CREATE INDEX ix_products_gtin14 ON products (gtin14)")
+        
+        # When: Upgrading
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+        
+        # Then: The index is unique
+        with engine.connect() as connection:
+            unique = {row[1]: row[2] for row in connection.exec_driver_sql("PRAGMA index_list(products)")}
+        assert unique["ix_products_gtin14"] == 1
+        engine.dispose()
+    
+    def test_variant_gtin14_index_made_unique_on_upgrade(self):
+        """Test that upgrade_schema makes the variant gtin14 index unique, keeping the latest duplicate."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.models.migrations import upgrade_schema
+        
+        # Given: The non-unique index of earlier versions and one GTIN indexed in two spellings
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add_all([
+                Product(id="a", gtin="10000000000001", title="A", price=Decimal("10.00")),
+                Product(id="b", gtin="20000000000001", title="B", price=Decimal("10.00")),
+            ])
+            session.commit()
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX ix_product_variants_gtin14")
+            connection.exec_driver_sql("CREATE INDEX ix_product_variants_gtin14 ON product_variants (gtin14)")
+            connection.exec_driver_sql(
+                "INSERT INTO product_variants (product_id, gtin) "
+                "VALUES ('a', '012345678905'), ('b', '0012345678905')"
+            )
+        
+        # When: Upgrading
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+        
+        # Then: The index is unique and the variant written last is kept
+        with engine.connect() as connection:
+            unique = {row[1]: row[2] for row in connection.exec_driver_sql("PRAGMA index_list(product_variants)")}
+            variants = connection.exec_driver_sql("SELECT product_id, gtin FROM product_variants").all()
+        assert unique["ix_product_variants_gtin14"] == 1
+        assert variants == [("b", "0012345678905")]
+        engine.dispose()
+    
+    def test_columns_added_to_existing_database(self):
+        """Test that upgrade_schema adds new columns to an old products table and backfills them."""
+        from sqlalchemy import create_engine, inspect
+        from app.database import Base
+        from app.models.migrations import upgrade_schema
+        
+        # Given: A products table created before the generated columns existed
+        engine = create_engine("sqlite:///:memory:")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE products (id VARCHAR(100) PRIMARY KEY, gtin VARCHAR(14) NOT NULL, "
+                "mpn VARCHAR(50), title VARCHAR(150) NOT NULL, description TEXT, brand VARCHAR(70), "
+                "category VARCHAR(200), price NUMERIC(10, 2) NOT NULL, currency VARCHAR(3), images JSON, "
+                "availability VARCHAR(20), variants JSON, product_metadata JSON, "
+                "created_at DATETIME, updated_at DATETIME)"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO products (id, gtin, title, price, product_metadata) "
+                "VALUES ('old', '00883419552502', 'Old Shoe', 100, '{\"color\": \"Red\", \"popularity_score\": 7}')"
+            )
+        
+        # When: Starting up as init_db does (twice, to check it is idempotent)
+        for _ in range(2):
+            Base.metadata.create_all(bind=engine)
+            with engine.begin() as connection:
+                upgrade_schema(connection)
+        
+        # Then: Existing rows expose the new columns and the indexes exist
+        with engine.connect() as connection:
+            row = connection.exec_driver_sql(
+                "SELECT color, popularity_score, customizable, is_buyable, buyability_reason, gtin14 FROM products"
+            ).one()
+            indexes = {index["name"] for index in inspect(connection).get_indexes("products")}
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DELETE FROM products")
+            tombstone = connection.exec_driver_sql("SELECT product_id, gtin FROM product_tombstones").one()
+        # availability is NULL in the old row, so it is backfilled as not buyable
+        assert tuple(row) == ("Red", 7.0, 0, 0, "out_of_stock", "00883419552502")
+        assert {
+            "ix_products_popularity", "ix_products_color", "ix_products_gender", "ix_products_is_buyable",
+            "ix_products_updated_at_id", "ix_products_gtin14"
+        } <= indexes
+        # Deletions are recorded for the catalog delta feed
+        assert tuple(tombstone) == ("old", "00883419552502")
+        engine.dispose()
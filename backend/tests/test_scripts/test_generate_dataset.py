@@ -0,0 +1,76 @@
+"""
+Tests for the Synthetic Dataset Generator
+
+Test Coverage:
+1. Products are valid ingestion rows (normalize_product_row)
+2. Session totals are the PricingEngine price of their line items
+3. DatasetGenerator.product() / history() - same rows for the same seed
+"""
+
+import json
+import pytest
+from datetime import datetime
+
+pytest.importorskip("faker")
+
+from app.models.checkout_session import CheckoutSession
+from app.services.catalog_ingest import normalize_product_row
+from app.services.checkout_service import CheckoutService
+from app.services.pricing_engine import PricingEngine, to_minor
+from scripts.generate_dataset import HISTORY_COLUMNS, DatasetGenerator
+
+
+def _generator():
+    # Building the Faker pools takes seconds: generators are shared per class, and each
+    # test builds at most one so it stays within the per-test timeout
+    return DatasetGenerator(7, products=200, until=datetime(2026, 1, 1), days=30)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+class TestDatasetGenerator:
+    """Test suite for DatasetGenerator."""
+
+    @pytest.fixture(scope="class")
+    def generator(self):
+        return _generator()
+
+    @pytest.fixture(scope="class")
+    def twin(self):
+        """A second generator with the same seed."""
+        return _generator()
+
+    @pytest.fixture(scope="class")
+    def sessions(self, generator):
+        """Generated checkout sessions as column dicts."""
+        columns = HISTORY_COLUMNS[CheckoutSession.__tablename__]
+        return [
+            dict(zip(columns, values))
+            for table, values in generator.history(100)
+            if table == CheckoutSession.__tablename__
+        ]
+
+    def test_products_are_valid_ingestion_rows(self, generator):
+        """Test that every product passes ingestion validation with its id and GTIN intact."""
+        for number, row in generator.products():
+            normalized = normalize_product_row(row)
+            assert (normalized["id"], normalized["gtin"]) == (row["id"], row["gtin"]), number
+
+    def test_session_totals_match_pricing_engine(self, generator, sessions):
+        """Test that stored totals are what PricingEngine charges for the cart."""
+        pricing_engine = PricingEngine(CheckoutService.TAX_RATE)
+        products = {row["id"]: row for _, row in generator.products()}
+
+        for session in sessions:
+            line_items = json.loads(session["line_items"])
+            options = json.loads(session["fulfillment_options"]) if session["fulfillment_options"] else []
+            option = next((o for o in options if o["id"] == session["selected_fulfillment_option_id"]), None)
+            lines = [(to_minor(products[item["product_id"]]["price"]), item["quantity"]) for item in line_items]
+
+            expected = pricing_engine.price_cart(lines, option).to_totals()
+            assert json.loads(session["totals"]) == expected, session["id"]
+
+    def test_same_seed_same_rows(self, generator, twin):
+        """Test that products and history are reproducible from the seed."""
+        assert [generator.product(n) for n in (0, 57, 199)] == [twin.product(n) for n in (0, 57, 199)]
+        assert list(generator.history(20)) == list(twin.history(20))
@@ -0,0 +1,175 @@
+"""
+Tests for Autocomplete
+
+Test Coverage:
+1. CompletionTrie - prefix walk through compressed edges, ranking, limits
+2. ProductService.autocomplete() - titles, brands, categories from the
+   catalog, refresh on catalog changes
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.config import settings
+from app.models.product import Product
+from app.services.autocomplete import (
+    KIND_BRAND,
+    KIND_CATEGORY,
+    KIND_PRODUCT,
+    Completion,
+    CompletionTrie,
+    MAX_COMPLETIONS,
+)
+from app.services.product_service import ProductService
+
+
+def _texts(completions):
+    return [completion.text for completion in completions]
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestCompletionTrie:
+    """Test suite for the CompletionTrie data structure."""
+
+    @pytest.fixture
+    def trie(self):
+        """Trie over a few product titles."""
+        titles = {"Air Max 90": 90, "Air Max 270": 95, "Air Force 1": 80, "Pegasus 40": 70}
+        return CompletionTrie(
+            (title, Completion(title, KIND_PRODUCT, popularity))
+            for title, popularity in titles.items()
+        )
+
+    def test_prefix_ends_inside_an_edge(self, trie):
+        """Test that prefixes ending mid-label still match."""
+        assert _texts(trie.complete("air m")) == ["Air Max 270", "Air Max 90"]
+        assert _texts(trie.complete("air")) == ["Air Max 270", "Air Max 90", "Air Force 1"]
+        assert _texts(trie.complete("pegasus 40")) == ["Pegasus 40"]
+
+    def test_no_match(self, trie):
+        """Test that unknown prefixes and diverging edges return nothing."""
+        assert trie.complete("airx") == []
+        assert trie.complete("pegasus 40 extra") == []
+        assert trie.complete("zoom") == []
+
+    def test_prefix_is_normalized(self, trie):
+        """Test that case and spacing do not matter."""
+        assert _texts(trie.complete("  AIR   max 2")) == ["Air Max 270"]
+
+    def test_limit_and_empty_prefix(self, trie):
+        """Test that the limit applies and the root ranks everything."""
+        assert _texts(trie.complete("", limit=2)) == ["Air Max 270", "Air Max 90"]
+        assert len(trie.complete("a", limit=1)) == 1
+
+    def test_compressed(self, trie):
+        """Test that single-child chains are merged into one edge."""
+        assert trie.size == 4
+        assert trie.nodes < 2 * trie.size
+
+    def test_duplicates_are_suggested_once(self):
+        """Test that identical titles of different products appear once."""
+        trie = CompletionTrie(
+            ("Dunk Low", Completion("Dunk Low", KIND_PRODUCT, score, product_id))
+            for product_id, score in (("a", 1), ("b", 2))
+        )
+
+        completions = trie.complete("dunk")
+        assert len(completions) == 1
+        assert completions[0].product_id == "b"  # The most popular one
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductServiceAutocomplete:
+    """Test suite for ProductService.autocomplete()."""
+
+    @pytest.fixture(autouse=True)
+    def synchronous_refresh(self, monkeypatch):
+        """Rebuild the trie inside change notifications."""
+        monkeypatch.setattr(settings, "autocomplete_background_refresh", False)
+
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create products with popularity scores."""
+        db_session.add_all([
+            Product(
+                id="air-max-90",
+                gtin="00883419552502",
+                title="Nike Air Max 90",
+                brand="Nike",
+                category="Shoes > Running > Sneakers",
+                price=Decimal("120.00"),
+                product_metadata={"popularity_score": 90}
+            ),
+            Product(
+                id="air-max-270",
+                gtin="00883419552503",
+                title="Nike Air Max 270",
+                brand="Nike",
+                category="Shoes > Lifestyle",
+                price=Decimal("150.00"),
+                product_metadata={"popularity_score": 95}
+            ),
+            Product(
+                id="nikeland-tee",
+                gtin="00883419552504",
+                title="Nikeland Tee",
+                brand="Acme",
+                category="Apparel > Tops",
+                price=Decimal("20.00"),
+                product_metadata={"popularity_score": 10}
+            ),
+        ])
+        db_session.commit()
+
+    def test_titles_brands_and_categories(self, db_session, catalog):
+        """Test completion kinds ranked by popularity."""
+        completions = ProductService(db_session).autocomplete("nike")
+
+        assert [(c.text, c.kind) for c in completions] == [
+            ("Nike", KIND_BRAND),  # Ranked as its most popular product (95)
+            ("Nike Air Max 270", KIND_PRODUCT),
+            ("Nike Air Max 90", KIND_PRODUCT),
+            ("Nikeland Tee", KIND_PRODUCT),
+        ]
+        assert completions[1].product_id == "air-max-270"
+
+    def test_titles_complete_without_brand(self, db_session, catalog):
+        """Test that typing the model name finds branded titles."""
+        assert _texts(ProductService(db_session).autocomplete("air max 9")) == ["Nike Air Max 90"]
+
+    def test_categories_by_path_and_name(self, db_session, catalog):
+        """Test that category paths and node names complete."""
+        service = ProductService(db_session)
+
+        assert [(c.text, c.kind) for c in service.autocomplete("shoes > l")] == [
+            ("Shoes > Lifestyle", KIND_CATEGORY)
+        ]
+        assert _texts(service.autocomplete("runn")) == ["Shoes > Running"]
+
+    def test_refreshed_after_catalog_change(self, db_session, catalog):
+        """Test that committed writes rebuild the trie."""
+        service = ProductService(db_session)
+        assert service.autocomplete("pegasus") == []
+
+        db_session.add(Product(
+            id="pegasus-40",
+            gtin="00883419552505",
+            title="Pegasus 40",
+            price=Decimal("130.00")
+        ))
+        db_session.commit()
+
+        assert _texts(service.autocomplete("pegasus")) == ["Pegasus 40"]
+        assert service.autocomplete_engine.stats()["rebuilds"] == 2
+
+    def test_limit_validation(self, db_session):
+        """Test that limits outside 1..MAX_COMPLETIONS are rejected."""
+        service = ProductService(db_session)
+
+        with pytest.raises(ValueError):
+            service.autocomplete("air", limit=0)
+        with pytest.raises(ValueError):
+            service.autocomplete("air", limit=MAX_COMPLETIONS + 1)
+        assert service.autocomplete("   ") == []
@@ -0,0 +1,186 @@
+"""
+Tests for the Catalog Delta
+
+Test Coverage:
+1. Watermark - parsing and normalization of request timestamps
+2. ProductService.changes_since() - change order, resuming from a
+   watermark, tombstones, limits, holding back unsettled changes, not
+   blocking writers while streamed
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.models.product import Product
+from app.services.catalog_delta import CHANGE_DELETE, CHANGE_UPSERT, Watermark
+from app.services.product_service import ProductService
+
+
+def _changes(delta):
+    return [(change.op, change.id, change.changed_at) for change in delta]
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestWatermark:
+    """Test suite for Watermark."""
+
+    def test_parse_normalizes_to_stored_form(self):
+        """Test that ISO timestamps become UTC in the stored format."""
+        assert Watermark.parse("2026-01-01 10:00:00", "a") == Watermark("2026-01-01 10:00:00", "a")
+        assert Watermark.parse("2026-01-01T10:00:00Z").updated_at == "2026-01-01 10:00:00"
+        assert Watermark.parse("2026-01-01T12:00:00+02:00").updated_at == "2026-01-01 10:00:00"
+        assert Watermark.parse("2026-01-01T10:00:00.250").updated_at == "2026-01-01 10:00:00.250000"
+
+    def test_parse_rejects_invalid_timestamps(self):
+        """Test that malformed timestamps raise ValueError."""
+        with pytest.raises(ValueError):
+            Watermark.parse("yesterday")
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductServiceChangesSince:
+    """Test suite for ProductService.changes_since()."""
+
+    @pytest.fixture
+    def stamp(self, db_session):
+        """Set stored change timestamps, as if the writes happened earlier."""
+        def stamp(table, timestamps):
+            key = "product_id" if table == "product_tombstones" else "id"
+            column = "deleted_at" if table == "product_tombstones" else "updated_at"
+            for product_id, timestamp in timestamps.items():
+                db_session.connection().exec_driver_sql(
+                    f"UPDATE {table} SET {column} = ? WHERE {key} = ?", (timestamp, product_id)
+                )
+            db_session.commit()
+        return stamp
+
+    @pytest.fixture
+    def catalog(self, db_session, stamp):
+        """Create four products changed at three moments."""
+        db_session.add_all([
+            Product(id=product_id, gtin=str(50000000000000 + i), title=f"Shoe {i}", price=Decimal("50.00"))
+            for i, product_id in enumerate(["b", "a", "d", "c"])
+        ])
+        db_session.commit()
+        stamp("products", {
+            "a": "2026-01-01 10:00:00",
+            "b": "2026-01-01 10:00:00",
+            "c": "2026-01-01 10:00:01",
+            "d": "2026-01-01 10:00:02",
+        })
+
+    def test_all_changes_in_order(self, db_session, catalog):
+        """Test that changes come in (timestamp, id) order, ties by id."""
+        delta = ProductService(db_session).changes_since(batch_size=2)
+
+        assert [(op, product_id) for op, product_id, _ in _changes(delta)] == [
+            (CHANGE_UPSERT, "a"), (CHANGE_UPSERT, "b"), (CHANGE_UPSERT, "c"), (CHANGE_UPSERT, "d")
+        ]
+        assert delta.watermark == Watermark("2026-01-01 10:00:02", "d")
+        assert delta.has_more is False
+
+    def test_resume_within_a_second(self, db_session, catalog):
+        """Test that a watermark resumes after its product, not after its second."""
+        delta = ProductService(db_session).changes_since(Watermark("2026-01-01 10:00:00", "a"))
+
+        changes = list(delta)
+        assert [change.id for change in changes] == ["b", "c", "d"]
+        assert changes[0].record.title == "Shoe 0"
+        assert changes[0].gtin == "50000000000000"
+
+    def test_deletions_are_tombstones(self, db_session, catalog, stamp):
+        """Test that deleted products are reported in change order."""
+        db_session.delete(db_session.get(Product, "a"))
+        db_session.commit()
+        stamp("product_tombstones", {"a": "2026-01-01 10:00:01"})
+
+        changes = _changes(ProductService(db_session).changes_since(Watermark("2026-01-01 10:00:00", "b")))
+
+        assert changes == [
+            (CHANGE_DELETE, "a", "2026-01-01 10:00:01"),
+            (CHANGE_UPSERT, "c", "2026-01-01 10:00:01"),
+            (CHANGE_UPSERT, "d", "2026-01-01 10:00:02"),
+        ]
+
+    def test_recreated_product_clears_tombstone(self, db_session, catalog, stamp):
+        """Test that re-inserting a deleted product replaces its tombstone."""
+        db_session.delete(db_session.get(Product, "a"))
+        db_session.commit()
+        db_session.add(Product(id="a", gtin="50000000000009", title="Shoe 9", price=Decimal("50.00")))
+        db_session.commit()
+        stamp("products", {"a": "2026-01-01 10:00:03"})
+
+        changes = _changes(ProductService(db_session).changes_since(Watermark("2026-01-01 10:00:02", "d")))
+
+        assert changes == [(CHANGE_UPSERT, "a", "2026-01-01 10:00:03")]
+
+    def test_limit_sets_has_more(self, db_session, catalog):
+        """Test that a limited delta returns the watermark of its last change."""
+        service = ProductService(db_session)
+
+        first = service.changes_since(limit=3)
+        assert [change.id for change in first] == ["a", "b", "c"]
+        assert first.has_more is True
+
+        second = service.changes_since(first.watermark, limit=3)
+        assert [change.id for change in second] == ["d"]
+        assert second.has_more is False
+
+        # Nothing new: the watermark stays where it was
+        third = service.changes_since(second.watermark)
+        assert list(third) == []
+        assert third.watermark == second.watermark
+
+    def test_unsettled_changes_are_held_back(self, db_session, catalog):
+        """Test that changes from the last seconds wait for a later request."""
+        db_session.add(Product(id="e", gtin="50000000000008", title="Shoe 8", price=Decimal("50.00")))
+        db_session.commit()
+
+        changes = _changes(ProductService(db_session).changes_since(Watermark("2026-01-01 10:00:02", "d")))
+
+        assert changes == []
+
+    def test_does_not_block_writers(self, tmp_path):
+        """Test that a write succeeds while a delta over a file database is half consumed."""
+        import sqlite3
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+
+        # Given: A file database (rollback journal) with 250 settled changes and a deletion
+        path = tmp_path / "catalog.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all(
+            Product(id=f"p-{i:03d}", gtin=str(10000000 + i), title=f"Product {i}", price=Decimal("10.00"))
+            for i in range(251)
+        )
+        session.commit()
+        session.delete(session.get(Product, "p-250"))
+        session.commit()
+        session.connection().exec_driver_sql("UPDATE products SET updated_at = '2026-01-01 10:00:00'")
+        session.connection().exec_driver_sql("UPDATE product_tombstones SET deleted_at = '2026-01-01 10:00:01'")
+        session.commit()
+
+        # When: 150 changes are read and another connection writes
+        changes = iter(ProductService(session).changes_since(batch_size=100))
+        assert len([change for _, change in zip(range(150), changes)]) == 150
+        writer = sqlite3.connect(path, timeout=0.1)
+        writer.execute("UPDATE products SET title = 'Renamed' WHERE id = 'p-249'")
+        writer.commit()
+        writer.close()
+
+        # Then: The write was not blocked and the delta continues to the end
+        rest = [(change.op, change.id) for change in changes]
+        assert len(rest) == 101
+        assert rest[-1] == (CHANGE_DELETE, "p-250")
+        session.close()
+        engine.dispose()
+
+    def test_invalid_limit(self, db_session):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError):
+            ProductService(db_session).changes_since(limit=0)
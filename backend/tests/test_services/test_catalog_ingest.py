@@ -0,0 +1,178 @@
+"""
+Tests for Catalog Ingestion
+
+Test Coverage:
+1. normalize_product_row() - defaults, JSON cells, buyability, rejected rows
+2. iter_product_rows() - JSONL and CSV input with line numbers
+3. ingest_products() - inserts, GTIN-keyed updates, unchanged rows, ID
+   conflicts, rebuilt search/variant/category indexes, worker processes
+"""
+
+import io
+import json
+
+import pytest
+from decimal import Decimal
+
+from app.models.product import Product
+from app.services.catalog_ingest import (
+    INGEST_FORMAT_CSV,
+    INGEST_FORMAT_JSONL,
+    ingest_products,
+    iter_product_rows,
+    normalize_product_row,
+)
+from app.services.product_service import ProductService
+
+
+def _jsonl(*products):
+    return list(iter_product_rows(io.StringIO("\n".join(json.dumps(p) for p in products)), INGEST_FORMAT_JSONL))
+
+
+AIR_MAX = {
+    "id": "air-max-90",
+    "gtin": "00883419552502",
+    "title": "Nike Air Max 90",
+    "category": "Shoes > Running",
+    "price": "120.00",
+    "variants": [{"size": "9", "size_system": "US", "gtin": "00883419552503"}],
+    "product_metadata": {"color": "White", "popularity_score": 90},
+}
+TEE = {"id": "tee", "gtin": "00883419552510", "title": "Nike Tee", "category": "Apparel > Tops", "price": 25}
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestNormalizeProductRow:
+    """Test suite for row validation."""
+
+    def test_defaults_and_buyability(self):
+        """Test that optional columns get model defaults and buyability is evaluated."""
+        row = normalize_product_row(json.dumps({"gtin": "12345678", "title": " Gift Card ", "price": 50}))
+
+        assert row["id"] == "12345678"  # Defaults to the GTIN
+        assert row["title"] == "Gift Card"
+        assert row["price"] == Decimal("50.00")
+        assert (row["brand"], row["currency"], row["availability"]) == ("Nike", "USD", "in_stock")
+        assert (row["is_buyable"], row["buyability_reason"]) == (False, "gift_card")
+
+    def test_csv_cells(self):
+        """Test that CSV cells hold JSON or a single image URL."""
+        row = normalize_product_row({
+            "gtin": "12345678", "title": "Tee", "price": "19.999", "currency": "usd",
+            "images": "https://example.com/tee.jpg", "product_metadata": '{"color": "Red"}', "mpn": ""
+        })
+
+        assert row["images"] == ["https://example.com/tee.jpg"]
+        assert row["product_metadata"] == {"color": "Red"}
+        assert row["price"] == Decimal("20.00")
+        assert row["currency"] == "USD"
+        assert row["mpn"] is None
+
+    @pytest.mark.parametrize("raw, message", [
+        ("[1, 2]", "JSON object"),
+        ("{oops", "Invalid JSON"),
+        ({"gtin": "12-34", "title": "x", "price": 1}, "GTIN"),
+        ({"gtin": "12345678", "price": 1}, "title"),
+        ({"gtin": "12345678", "title": "x", "price": "free"}, "price"),
+        ({"gtin": "12345678", "title": "x", "price": -1}, "price"),
+        ({"gtin": "12345678", "title": "x", "price": 1, "availability": "soon"}, "availability"),
+        ({"gtin": "12345678", "title": "x", "price": 1, "variants": '{"size": 9}'}, "variants"),
+    ])
+    def test_invalid_rows(self, raw, message):
+        """Test that invalid rows raise ValueError naming the problem."""
+        with pytest.raises(ValueError, match=message):
+            normalize_product_row(raw)
+
+    def test_csv_line_numbers(self):
+        """Test that CSV rows report the line they end on."""
+        stream = io.StringIO('gtin,title,price\n12345678,"Two\nLines",5\n87654321,Tee,6\n')
+
+        rows = list(iter_product_rows(stream, INGEST_FORMAT_CSV))
+
+        assert [number for number, _ in rows] == [3, 4]
+        assert rows[0][1]["title"] == "Two\nLines"
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestIngestProducts:
+    """Test suite for ingest_products()."""
+
+    def test_loads_products_and_derived_indexes(self, db_engine, db_session):
+        """Test that a load makes products searchable and resolvable by variant GTIN."""
+        report = ingest_products(db_engine, _jsonl(AIR_MAX, TEE))
+
+        assert (report.read, report.written, report.rejected) == (2, 2, 0)
+        service = ProductService(db_session)
+        assert [p.id for p in service.search_products("air max")] == ["air-max-90"]
+        product, variant = service.resolve_gtins(["00883419552503"])["00883419552503"]
+        assert (product.id, variant.size) == ("air-max-90", "9")
+        assert service.get_category_counts() == {"Apparel": 1, "Shoes": 1}
+        assert product.color == "White"
+        assert product.is_buyable is True
+
+    def test_upserts_on_gtin(self, db_engine, db_session):
+        """Test that a known GTIN updates the product in place, keeping its ID."""
+        db_session.add(Product(id="legacy-id", gtin=AIR_MAX["gtin"], title="Old Title", price=Decimal("99.00")))
+        db_session.commit()
+
+        report = ingest_products(db_engine, _jsonl({**AIR_MAX, "price": "110.00"}))
+
+        db_session.expire_all()
+        product = db_session.query(Product).filter_by(gtin=AIR_MAX["gtin"]).one()
+        assert report.written == 1
+        assert (product.id, product.title, product.price) == ("legacy-id", "Nike Air Max 90", Decimal("110.00"))
+        assert [p.id for p in ProductService(db_session).search_products("air max")] == ["legacy-id"]
+
+    def test_upserts_on_canonical_gtin(self, db_engine, db_session):
+        """Test that the UPC-A and GTIN-14 spellings of an item update one product."""
+        ingest_products(db_engine, _jsonl({**TEE, "gtin": "012345678905"}))
+
+        report = ingest_products(db_engine, _jsonl({**TEE, "id": "tee-14", "gtin": "00012345678905", "price": 30}))
+
+        assert report.written == 1
+        product = db_session.query(Product).one()
+        assert (product.id, product.gtin, product.price) == ("tee", "012345678905", Decimal("30.00"))
+        assert ProductService(db_session).get_by_gtin("00012345678905").id == "tee"
+
+    def test_unchanged_rows_are_not_rewritten(self, db_engine, db_session):
+        """Test that reloading the same catalog writes nothing."""
+        ingest_products(db_engine, _jsonl(AIR_MAX, TEE))
+        db_session.connection().exec_driver_sql("UPDATE products SET updated_at = '2026-01-01 00:00:00'")
+        db_session.commit()
+
+        report = ingest_products(db_engine, _jsonl(AIR_MAX, {**TEE, "price": 30}))
+
+        assert (report.written, report.unchanged) == (1, 1)
+        stamps = dict(db_session.connection().exec_driver_sql("SELECT id, updated_at FROM products").all())
+        assert stamps["air-max-90"] == "2026-01-01 00:00:00"
+        assert stamps["tee"] != "2026-01-01 00:00:00"
+
+    def test_rejected_rows_are_reported(self, db_engine, db_session):
+        """Test that invalid rows and ID conflicts are skipped, not fatal."""
+        rows = _jsonl(AIR_MAX, {"gtin": "1", "title": "Bad", "price": 1}, {**TEE, "id": "air-max-90"}, TEE)
+
+        report = ingest_products(db_engine, rows, batch_size=10)
+
+        assert (report.read, report.written, report.rejected) == (4, 2, 2)
+        assert [number for number, _ in report.errors] == [2, 3]
+        assert "Conflicts" in report.errors[1][1]
+        assert db_session.query(Product).count() == 2
+
+    def test_worker_processes(self, db_engine, db_session):
+        """Test that validating in worker processes loads the same rows in order."""
+        products = [{**TEE, "id": f"tee-{i}", "gtin": str(10000000 + i)} for i in range(50)]
+        progress = []
+
+        report = ingest_products(db_engine, _jsonl(*products), batch_size=7, workers=2, on_progress=progress.append)
+
+        assert report.written == 50
+        assert len(progress) == 8  # One call per batch
+        assert report.rows_per_second > 0
+        assert db_session.query(Product).count() == 50
+
+    def test_invalid_batch_size(self, db_engine):
+        """Test that non-positive batch sizes are rejected."""
+        with pytest.raises(ValueError):
+            ingest_products(db_engine, [], batch_size=0)
@@ -0,0 +1,177 @@
+"""
+Tests for the Columnar Catalog Engine
+
+Test Coverage:
+1. CatalogSnapshot.search() - parity with the SQL search path, ordering
+   CatalogSnapshot.facet_counts() - parity with SQL facets
+2. Immutability of snapshot columns
+3. ColumnarCatalogEngine - rebuild and swap on catalog change
+4. ProductService engine selection via settings
+"""
+
+import pytest
+from decimal import Decimal
+
+np = pytest.importorskip("numpy")
+
+from app.config import settings
+from app.models.product import Product
+from app.services.catalog_snapshot import CatalogSnapshot, ColumnarCatalogEngine
+from app.services.product_service import ProductService
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestCatalogSnapshot:
+    """Test suite for the columnar catalog engine."""
+    
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create products with popularity scores."""
+        products = [
+            Product(
+                id="nike-air-max-90",
+                gtin="00883419552502",
+                title="Nike Air Max 90",
+                description="Classic running shoe with visible Air cushioning",
+                category="Shoes > Running > Sneakers",
+                price=Decimal("120.00"),
+                availability="in_stock",
+                product_metadata={"popularity_score": 90, "color": "White", "gender": "unisex"}
+            ),
+            Product(
+                id="nike-air-max-270",
+                gtin="00883419552503",
+                title="Nike Air Max 270",
+                description="Modern Air Max with 270 degrees of visibility",
+                category="Shoes > Lifestyle > Sneakers",
+                price=Decimal("150.00"),
+                availability="in_stock",
+                product_metadata={"popularity_score": 95, "color": "Black", "gender": "men"}
+            ),
+            Product(
+                id="nike-pegasus-40",
+                gtin="00883419552504",
+                title="Nike Pegasus 40",
+                description="Versatile running shoe for everyday training",
+                category="Shoes > Running > Road Running",
+                price=Decimal("140.00"),
+                availability="out_of_stock"
+            ),
+            Product(
+                id="nike-dri-fit-shirt",
+                gtin="00883419552505",
+                title="Nike Dri-FIT Training Shirt",
+                description="Moisture-wicking training shirt",
+                category="Apparel > Training > Shirts",
+                price=Decimal("45.00"),
+                availability="in_stock",
+                product_metadata={"popularity_score": 40, "color": "Black", "gender": "women"}
+            ),
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return products
+    
+    @pytest.fixture
+    def columnar_settings(self, monkeypatch):
+        """Select the columnar engine with synchronous rebuilds."""
+        monkeypatch.setattr(settings, "catalog_engine", "columnar")
+        monkeypatch.setattr(settings, "catalog_snapshot_background_refresh", False)
+    
+    @pytest.mark.parametrize("filters", [
+        {"query": "air max"},
+        {"query": "running"},
+        {"query": "nike", "category": "Shoes > Running"},
+        {"query": "nike", "price_min": Decimal("100.00"), "price_max": Decimal("140.00")},
+        {"query": "", "availability": "in_stock"},
+        {"query": "nike", "availability": "discontinued"},
+        {"query": "adidas"},
+        {"color": "BLACK"},
+        {"query": "nike", "gender": "men"},
+        {"query": "nike", "buyable_only": True},
+    ])
+    def test_matches_sql_search(self, db_session, catalog, filters):
+        """Test that vectorized filtering returns the same products as SQL."""
+        snapshot = CatalogSnapshot.load(db_session)
+        sql_results = ProductService(db_session).search_products(**filters)
+        
+        columnar_results = snapshot.search(**filters)
+        
+        assert {p.id for p in columnar_results} == {p.id for p in sql_results}
+    
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"query": "nike"},
+        {"category": "Running"},
+        {"price_max": Decimal("140.00"), "availability": "in_stock"},
+        {"query": "adidas"},
+    ])
+    def test_facets_match_sql(self, db_session, catalog, filters):
+        """Test that bincount facets equal the SQL GROUP BY facets."""
+        snapshot = CatalogSnapshot.load(db_session)
+        sql_facets = ProductService(db_session).search_products_page(facets=True, **filters).facets
+        
+        assert snapshot.facet_counts(**filters) == sql_facets
+    
+    def test_orders_by_popularity_then_id(self, db_session, catalog):
+        """Test top-k selection by popularity."""
+        snapshot = CatalogSnapshot.load(db_session)
+        
+        results = snapshot.search(query="nike", limit=3)
+        
+        assert [p.id for p in results] == ["nike-air-max-270", "nike-air-max-90", "nike-dri-fit-shirt"]
+    
+    def test_columns_are_read_only(self, db_session, catalog):
+        """Test that snapshot arrays cannot be modified in place."""
+        snapshot = CatalogSnapshot.load(db_session)
+        
+        with pytest.raises(ValueError):
+            snapshot.price_cents[0] = 0
+    
+    def test_engine_swaps_snapshot_after_commit(self, db_engine, db_session, catalog):
+        """Test that a committed catalog change produces a new snapshot."""
+        from app.services import catalog_snapshot
+        
+        engine = ColumnarCatalogEngine(db_engine, background_refresh=False)
+        catalog_snapshot._engines[db_engine] = engine
+        before = engine.snapshot
+        
+        catalog[3].price = Decimal("25.00")
+        db_session.commit()
+        
+        assert engine.snapshot is not before
+        assert engine.search(query="shirt")[0].price == Decimal("25.00")
+        # The old snapshot is untouched
+        assert before.search(query="shirt")[0].price == Decimal("45.00")
+    
+    def test_background_rebuild(self, db_engine, db_session, catalog):
+        """Test that mark_stale rebuilds on a worker thread."""
+        engine = ColumnarCatalogEngine(db_engine, background_refresh=True)
+        before = engine.snapshot
+        
+        engine.mark_stale()
+        
+        assert engine.wait_until_fresh(timeout=5)
+        assert engine.snapshot is not before
+        assert engine.stats()["rebuilds"] == 2
+    
+    def test_product_service_pages_columnar_engine(self, db_session, catalog, columnar_settings):
+        """Test that snapshot pages follow the same keyset order as SQL."""
+        service = ProductService(db_session)
+        
+        first = service.search_products_page(query="nike", limit=2)
+        second = service.search_products_page(query="nike", limit=2, cursor=first.next_cursor)
+        
+        assert [p.id for p in first.items] == ["nike-air-max-270", "nike-air-max-90"]
+        assert [p.id for p in second.items] == ["nike-dri-fit-shirt", "nike-pegasus-40"]
+        assert second.next_cursor is None
+    
+    def test_product_service_uses_columnar_engine(self, db_session, catalog, columnar_settings):
+        """Test that settings select the columnar engine for search_products."""
+        service = ProductService(db_session)
+        
+        results = service.search_products(query="air max")
+        
+        assert service.catalog_engine is not None
+        assert [p.id for p in results] == ["nike-air-max-270", "nike-air-max-90"]
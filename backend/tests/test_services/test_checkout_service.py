@@ -0,0 +1,190 @@
+"""
+Tests for Checkout Service
+
+Test coverage:
+1. create_session() - with/without address, multiple items, variants, validation
+   update_session() - repricing for another shipping option
+2. Query cost of cart resolution and of session writes
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.services.checkout_service import CheckoutService
+from app.services.product_service import ProductNotFoundError
+from app.models.product import Product
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestCheckoutService:
+    """Test suite for CheckoutService."""
+    
+    @pytest.fixture
+    def checkout_service(self, db_session):
+        """Create CheckoutService instance."""
+        return CheckoutService(db_session)
+    
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create 20 in-stock products."""
+        products = [
+            Product(
+                id=f"test-product-{i}",
+                gtin=f"{12345678901200 + i}",
+                title=f"Test Product {i}",
+                price=Decimal("100.00"),
+                availability="in_stock"
+            )
+            for i in range(20)
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return products
+    
+    # ============================================================================
+    # create_session() Tests
+    # ============================================================================
+    
+    def test_create_session_without_address(self, checkout_service, catalog):
+        """Test creating session without shipping address."""
+        # GIVEN: One item
+        items = [{"product_id": catalog[0].id, "quantity": 1}]
+        
+        # WHEN: Creating session without address
+        session = checkout_service.create_session(items=items)
+        
+        # THEN: Session created with not_ready_for_payment status
+        assert session.id is not None
+        assert session.status == "not_ready_for_payment"
+        assert len(session.line_items) == 1
+        assert session.fulfillment_options is None
+    
+    def test_create_session_with_address(self, checkout_service, catalog, sample_shipping_address):
+        """Test creating session with shipping address."""
+        # GIVEN: Items and address
+        items = [{"product_id": catalog[0].id, "quantity": 2}]
+        
+        # WHEN: Creating session with address
+        session = checkout_service.create_session(items=items, address=sample_shipping_address)
+        
+        # THEN: Session is ready for payment with standard shipping selected
+        assert session.status == "ready_for_payment"
+        assert session.selected_fulfillment_option_id == "standard"
+        assert session.totals["items_total"]["value"] == "200.00"
+    
+    def test_create_session_totals(self, checkout_service, catalog, sample_shipping_address):
+        """Test that totals are priced in cents and formatted with two decimals."""
+        # GIVEN: Two lines
+        items = [{"product_id": catalog[0].id, "quantity": 2}, {"product_id": catalog[1].id, "quantity": 1}]
+        
+        # WHEN: Creating session with address (standard shipping)
+        session = checkout_service.create_session(items=items, address=sample_shipping_address)
+        
+        # THEN: Line and session totals add up
+        assert [(line["unit_amount"], line["total"]) for line in session.line_items] == [(10000, 200.0), (10000, 100.0)]
+        assert {name: total["value"] for name, total in session.totals.items()} == {
+            "items_total": "300.00", "discounts": "0.00", "subtotal": "300.00",
+            "fulfillment": "5.00", "taxes": "24.00", "fees": "0.00", "total": "329.00"
+        }
+    
+    def test_update_session_reprices_shipping(self, checkout_service, catalog, sample_shipping_address, db_session):
+        """Test that choosing another shipping option updates the stored totals."""
+        # GIVEN: A session with standard shipping
+        session = checkout_service.create_session(
+            items=[{"product_id": catalog[0].id, "quantity": 1}], address=sample_shipping_address
+        )
+        
+        # WHEN: Switching to express
+        checkout_service.update_session(session.id, fulfillment_option_id="express")
+        db_session.expire_all()
+        
+        # THEN: The reloaded session is priced with express shipping
+        session = checkout_service.get_session(session.id)
+        assert session.selected_fulfillment_option_id == "express"
+        assert session.totals["fulfillment"]["value"] == "15.00"
+        assert session.totals["total"]["value"] == "123.00"
+        
+        with pytest.raises(ValueError, match="Unknown fulfillment option"):
+            checkout_service.update_session(session.id, fulfillment_option_id="teleport")
+    
+    def test_create_session_records_variant(self, checkout_service, sample_product):
+        """Test that a chosen variant is recorded on the line item."""
+        # GIVEN: Item for the size 9 variant
+        variant = {"size": "9", "size_system": "US", "gtin": "00883419552503"}
+        items = [{"product_id": sample_product.id, "quantity": 1, "variant": variant}]
+        
+        # WHEN: Creating session
+        session = checkout_service.create_session(items=items)
+        
+        # THEN: Line item carries variant GTIN and details
+        assert session.line_items[0]["gtin"] == "00883419552503"
+        assert session.line_items[0]["variant"] == variant
+    
+    def test_create_session_unknown_product(self, checkout_service, catalog):
+        """Test that an unknown product raises error."""
+        items = [{"product_id": catalog[0].id, "quantity": 1}, {"product_id": "missing", "quantity": 1}]
+        
+        with pytest.raises(ProductNotFoundError):
+            checkout_service.create_session(items=items)
+    
+    def test_create_session_out_of_stock_product(self, checkout_service, catalog, db_session):
+        """Test that out of stock products raise error."""
+        # GIVEN: Out of stock product
+        catalog[1].availability = "out_of_stock"
+        db_session.commit()
+        
+        # WHEN/THEN: Creating session raises ValueError
+        with pytest.raises(ValueError):
+            checkout_service.create_session(items=[{"product_id": catalog[1].id, "quantity": 1}])
+    
+    def test_create_session_restricted_product(self, checkout_service, catalog, db_session):
+        """Test that products stored as not buyable are rejected with the rule's reason."""
+        # GIVEN: A product marked customizable
+        catalog[2].product_metadata = {"customizable": True}
+        db_session.commit()
+        
+        # WHEN/THEN: Creating session raises ValueError naming the reason
+        with pytest.raises(ValueError, match="Nike By You"):
+            checkout_service.create_session(items=[{"product_id": catalog[2].id, "quantity": 1}])
+    
+    def test_create_session_query_count_independent_of_cart_size(
+        self, checkout_service, catalog, statement_counter
+    ):
+        """Test that cart resolution costs a fixed number of queries."""
+        # GIVEN: A 1-line and a 20-line cart
+        single_cart = [{"product_id": catalog[0].id, "quantity": 1}]
+        large_cart = [{"product_id": product.id, "quantity": 1} for product in catalog]
+        statement_counter.clear()
+        
+        # WHEN: Creating a session for each
+        checkout_service.create_session(items=single_cart)
+        single_line = len(statement_counter)
+        statement_counter.clear()
+        
+        checkout_service.create_session(items=large_cart)
+        
+        # THEN: Both issue the same number of statements
+        assert len(statement_counter) == single_line
+    
+    def test_writes_do_not_reload_sessions(
+        self, checkout_service, catalog, sample_shipping_address, statement_counter
+    ):
+        """Test that each write is one statement after its lookups, with no read-back."""
+        # WHEN: Creating a session and serializing it
+        items = [{"product_id": catalog[0].id, "quantity": 1}]
+        statement_counter.clear()
+        session = checkout_service.create_session(items=items, address=sample_shipping_address)
+        session.to_dict()
+        
+        # THEN: Cart lookup and INSERT ... RETURNING created_at, updated_at
+        assert [statement.split()[0] for statement in statement_counter] == ["SELECT", "INSERT"]
+        assert "RETURNING" in statement_counter[1]
+        
+        # WHEN: Updating the session and serializing it
+        statement_counter.clear()
+        checkout_service.update_session(session.id, fulfillment_option_id="express").to_dict()
+        
+        # THEN: Session lookup and UPDATE only
+        assert [statement.split()[0] for statement in statement_counter] == ["SELECT", "UPDATE"]
+
@@ -0,0 +1,123 @@
+"""
+Tests for Order Service
+
+Test Coverage:
+1. create_order() - order and creation event from a checkout session
+2. update_order_status() - status change and event
+3. Statements issued per write (no read-back after commit)
+4. unit_of_work() - one commit for several writes, rollback on error
+   (completion through the ACP and MCP paths: test_checkout_completion)
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import event
+
+from app.database import unit_of_work
+from app.models.checkout_session import CheckoutSession
+from app.models.order import Order
+from app.models.order_event import OrderEvent
+from app.models.product import Product
+from app.services.checkout_service import CheckoutService
+from app.services.order_service import OrderService
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestOrderService:
+    """Test suite for OrderService."""
+    
+    @pytest.fixture
+    def order_service(self, db_session):
+        """Create OrderService instance."""
+        return OrderService(db_session)
+    
+    @pytest.fixture
+    def checkout_session(self, db_session, sample_shipping_address):
+        """Create a checkout session ready for payment."""
+        db_session.add(Product(
+            id="tee", gtin="04006381333931", title="Nike Tee", price=Decimal("25.00"), availability="in_stock"
+        ))
+        db_session.commit()
+        return CheckoutService(db_session).create_session(
+            items=[{"product_id": "tee", "quantity": 2}], address=sample_shipping_address
+        )
+    
+    def test_create_order(self, order_service, checkout_session, db_session):
+        """Test that an order copies the session and records a creation event."""
+        # WHEN: Creating the order
+        order = order_service.create_order(checkout_session, "pi_123")
+        
+        # THEN: Order carries the session's items, totals and shipping choice
+        assert order.status == "created"
+        assert order.totals == checkout_session.totals
+        assert order.shipping_option["id"] == "standard"
+        assert order.created_at is not None
+        event_types = [e.event_type for e in db_session.query(OrderEvent).filter_by(order_id=order.id)]
+        assert event_types == ["order.created"]
+    
+    def test_update_order_status(self, order_service, checkout_session, db_session):
+        """Test that status changes are recorded as events."""
+        order = order_service.create_order(checkout_session, "pi_123")
+        
+        updated = order_service.update_order_status(order.id, "shipped")
+        
+        assert updated.status == "shipped"
+        assert db_session.query(OrderEvent).filter_by(event_type="order.shipped").count() == 1
+    
+    def test_writes_do_not_reload_orders(self, order_service, checkout_session, statement_counter):
+        """Test that order writes issue no SELECT after their commit."""
+        # WHEN: Creating an order and serializing it
+        statement_counter.clear()
+        order = order_service.create_order(checkout_session, "pi_123")
+        order.to_dict()
+        
+        # THEN: Two INSERTs (order, event), timestamps read back by RETURNING
+        assert [statement.split()[0] for statement in statement_counter] == ["INSERT", "INSERT"]
+        assert all("RETURNING" in statement for statement in statement_counter)
+        
+        # WHEN: Updating the status and serializing the order
+        statement_counter.clear()
+        order_service.update_order_status(order.id, "confirmed").to_dict()
+        
+        # THEN: Order lookup, UPDATE and the event INSERT
+        assert [statement.split()[0] for statement in statement_counter] == ["SELECT", "UPDATE", "INSERT"]
+    
+    @pytest.fixture
+    def commit_counter(self, db_engine):
+        """Count transactions committed on the test engine."""
+        commits = []
+        
+        def record(conn):
+            commits.append(conn)
+        
+        event.listen(db_engine, "commit", record)
+        yield commits
+        event.remove(db_engine, "commit", record)
+    
+    def test_unit_of_work_commits_once(self, order_service, checkout_session, db_session, commit_counter):
+        """Test that service writes inside a unit of work share one commit."""
+        # WHEN: Completing the session inside a unit of work
+        with unit_of_work(db_session):
+            order = order_service.create_order(checkout_session, "pi_123")
+            checkout_session.status = "completed"
+            checkout_session.order_id = order.id
+        
+        # THEN: One commit persisted all three writes
+        assert len(commit_counter) == 1
+        db_session.expire_all()
+        assert db_session.get(CheckoutSession, checkout_session.id).order_id == order.id
+        assert db_session.query(OrderEvent).filter_by(order_id=order.id).count() == 1
+    
+    def test_unit_of_work_rolls_back_on_error(self, order_service, checkout_session, db_session, commit_counter):
+        """Test that an error inside the unit of work rolls back the order."""
+        # WHEN: Completion fails after the order is created
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db_session):
+                order_service.create_order(checkout_session, "pi_123")
+                raise RuntimeError("payment capture failed")
+        
+        # THEN: No order exists and the session is still awaiting payment
+        assert commit_counter == []
+        assert db_session.query(Order).count() == 0
+        assert db_session.get(CheckoutSession, checkout_session.id).status == "ready_for_payment"
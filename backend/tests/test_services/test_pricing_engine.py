@@ -0,0 +1,92 @@
+"""
+Tests for the Pricing Engine
+
+Test Coverage:
+1. to_minor() / format_minor() - conversions and rounding
+2. PricingEngine.price_cart() - line totals, tax rounding, shipping, totals
+   breakdown, large carts
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.services.pricing_engine import PricingEngine, format_minor, to_minor
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestMinorUnits:
+    """Test suite for minor unit conversions."""
+
+    @pytest.mark.parametrize("amount, minor", [
+        (Decimal("120.00"), 12000),
+        ("19.99", 1999),
+        (19.99, 1999),
+        (5, 500),
+        ("0.005", 1),  # Half-cents round away from zero
+        ("-0.005", -1),
+    ])
+    def test_to_minor(self, amount, minor):
+        """Test conversion of decimal amounts to cents."""
+        assert to_minor(amount) == minor
+
+    def test_format_minor(self):
+        """Test formatting with exactly two decimal places."""
+        assert [format_minor(m) for m in (0, 5, 1999, 100000, -250)] == ["0.00", "0.05", "19.99", "1000.00", "-2.50"]
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestPricingEngine:
+    """Test suite for PricingEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        return PricingEngine(Decimal("0.08"))
+
+    def test_price_cart_breakdown(self, engine):
+        """Test line totals, tax and grand total in minor units."""
+        pricing = engine.price_cart([(12000, 2), (2599, 3)], fulfillment_option={"id": "express", "cost": "15.00"})
+
+        assert pricing.line_totals == [24000, 7797]
+        assert pricing.items_total == 31797
+        assert pricing.taxes == 2544  # 2543.76 rounded
+        assert pricing.total == 31797 + 1500 + 2544
+        assert pricing.to_totals() == {
+            "items_total": {"value": "317.97", "currency": "USD"},
+            "discounts": {"value": "0.00", "currency": "USD"},
+            "subtotal": {"value": "317.97", "currency": "USD"},
+            "fulfillment": {"value": "15.00", "currency": "USD"},
+            "taxes": {"value": "25.44", "currency": "USD"},
+            "fees": {"value": "0.00", "currency": "USD"},
+            "total": {"value": "358.41", "currency": "USD"},
+        }
+
+    def test_tax_rounds_half_up(self, engine):
+        """Test that half a cent of tax rounds up and less rounds down."""
+        assert engine.price_cart([(1, 1)]).taxes == 0        # 0.08 cents
+        assert engine.price_cart([(625, 1)]).taxes == 50     # exactly 50 cents
+        assert engine.price_cart([(1875, 1)]).taxes == 150   # exactly 150 cents
+        assert engine.price_cart([(1881, 1)]).taxes == 150   # 150.48 cents
+        assert engine.price_cart([(1882, 1)]).taxes == 151   # 150.56 cents
+
+    def test_with_fulfillment_reprices_shipping_only(self, engine):
+        """Test switching shipping options without revisiting lines."""
+        pricing = engine.price_cart([(10000, 2)])
+
+        express = engine.with_fulfillment(pricing, {"cost": "15.00"})
+
+        assert (pricing.fulfillment, pricing.total) == (0, 21600)
+        assert (express.fulfillment, express.total) == (1500, 23100)
+        assert express.line_totals is pricing.line_totals
+
+    def test_large_cart_matches_decimal_arithmetic(self, engine):
+        """Test a 500-line cart against the same sums done with Decimal."""
+        lines = [(1999 + i * 37, 1 + i % 10) for i in range(500)]
+
+        pricing = engine.price_cart(lines)
+
+        items_total = sum(Decimal(unit) / 100 * quantity for unit, quantity in lines)
+        tax = (items_total * Decimal("0.08")).quantize(Decimal("0.01"), rounding="ROUND_HALF_UP")
+        assert pricing.to_totals()["items_total"]["value"] == str(items_total)
+        assert pricing.to_totals()["taxes"]["value"] == str(tax)
@@ -0,0 +1,183 @@
+"""
+Tests for Product Cache
+
+Test Coverage:
+1. ProductCache - LRU eviction, TTL expiry, GTIN aliases, counters
+2. ProductService read-through - hits, invalidation on writes, immutability
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.models.product import Product
+from app.models.product_record import ProductRecord
+from app.services.product_cache import ProductCache
+from app.services.product_service import ProductService
+
+
+def make_record(product_id: str, gtin: str, **overrides) -> ProductRecord:
+    """Build a ProductRecord without touching the database."""
+    data = {
+        "id": product_id,
+        "gtin": gtin,
+        "mpn": None,
+        "title": product_id,
+        "description": None,
+        "brand": "Nike",
+        "category": None,
+        "price": Decimal("100.00"),
+        "currency": "USD",
+        "images": None,
+        "availability": "in_stock",
+        "variants": None,
+        "product_metadata": None,
+        "popularity_score": 0.0,
+        "gender": None,
+        "color": None,
+        "customizable": False,
+        "is_buyable": True,
+        "buyability_reason": None,
+        "created_at": None,
+        "updated_at": None,
+    }
+    data.update(overrides)
+    return ProductRecord(**data)
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductCache:
+    """Test suite for the ProductCache data structure."""
+    
+    def test_lookup_by_id_and_gtin_alias(self):
+        """Test that a record is reachable by ID, product GTIN and extra GTINs."""
+        cache = ProductCache()
+        record = cache.put(make_record("a", "00000000000001"), ["00000000000002"])
+        
+        assert cache.get_by_id("a") is record
+        assert cache.get_by_gtin("00000000000001") is record
+        assert cache.get_by_gtin("00000000000002") is record
+        assert cache.stats()["hits"] == 3
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ProductCache(max_size=2)
+        cache.put(make_record("a", "00000000000001"))
+        cache.put(make_record("b", "00000000000002"))
+        cache.get_by_id("a")  # "b" is now least recently used
+        cache.put(make_record("c", "00000000000003"))
+        
+        assert cache.get_by_id("b") is None
+        assert cache.get_by_gtin("00000000000002") is None
+        assert cache.get_by_id("a") is not None
+        assert cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after their TTL."""
+        now = [0.0]
+        cache = ProductCache(ttl_seconds=10, clock=lambda: now[0])
+        cache.put(make_record("a", "00000000000001"))
+        
+        now[0] = 9.9
+        assert cache.get_by_id("a") is not None
+        now[0] = 10.0
+        assert cache.get_by_id("a") is None
+        assert cache.stats()["expirations"] == 1
+    
+    def test_invalidate_by_gtin_and_all(self):
+        """Test targeted and full invalidation."""
+        cache = ProductCache()
+        cache.put(make_record("a", "00000000000001"))
+        cache.put(make_record("b", "00000000000002"))
+        
+        cache.invalidate([], ["00000000000001"])
+        assert cache.get_by_id("a") is None
+        assert cache.get_by_id("b") is not None
+        
+        cache.invalidate()
+        assert cache.stats()["size"] == 0
+    
+    def test_discard_if_stale(self):
+        """Test that a newer updated_at drops the cached record."""
+        from datetime import datetime
+        
+        cache = ProductCache()
+        cache.put(make_record("a", "00000000000001", updated_at=datetime(2025, 1, 1)))
+        
+        cache.discard_if_stale("a", datetime(2025, 1, 1))
+        assert cache.get_by_id("a") is not None
+        
+        cache.discard_if_stale("a", datetime(2025, 1, 2))
+        assert cache.get_by_id("a") is None
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductServiceCaching:
+    """Test suite for read-through caching in ProductService."""
+    
+    @pytest.fixture
+    def product_service(self, db_session):
+        """Create ProductService instance."""
+        return ProductService(db_session)
+    
+    def test_repeated_get_by_id_is_served_from_cache(self, product_service, sample_product):
+        """Test that the second read is a cache hit."""
+        first = product_service.get_by_id(sample_product.id)
+        second = product_service.get_by_id(sample_product.id)
+        
+        assert isinstance(first, ProductRecord)
+        assert second is first
+        assert product_service.cache.stats()["hits"] == 1
+    
+    def test_variant_gtin_is_cached(self, product_service, sample_product):
+        """Test that a variant GTIN lookup is cached under that GTIN."""
+        product_service.get_by_gtin("00883419552503")
+        product_service.get_by_gtin("00883419552503")
+        
+        assert product_service.cache.stats()["hits"] == 1
+    
+    def test_cached_record_is_immutable(self, product_service, sample_product):
+        """Test that cached records and their JSON fields cannot be mutated."""
+        record = product_service.get_by_id(sample_product.id)
+        
+        with pytest.raises(AttributeError):
+            record.price = Decimal("1.00")
+        with pytest.raises(TypeError):
+            record.variants.append({"size": "12"})
+        with pytest.raises(TypeError):
+            record.product_metadata["color"] = "Black"
+        
+        # Still serializes like a Product
+        assert record.to_dict()["variants"][0]["size"] == "8"
+    
+    def test_write_through_session_invalidates(self, product_service, sample_product, db_session):
+        """Test that a committed product update is visible on the next read."""
+        product_service.get_by_gtin(sample_product.gtin)
+        
+        sample_product.price = Decimal("99.00")
+        db_session.commit()
+        
+        assert product_service.get_by_id(sample_product.id).price == Decimal("99.00")
+        assert product_service.get_by_gtin(sample_product.gtin).price == Decimal("99.00")
+    
+    def test_deleted_product_is_not_served(self, product_service, sample_product, db_session):
+        """Test that deleting a product drops it from the cache."""
+        from app.services.product_service import ProductNotFoundError
+        
+        product_service.get_by_id(sample_product.id)
+        db_session.delete(sample_product)
+        db_session.commit()
+        
+        with pytest.raises(ProductNotFoundError):
+            product_service.get_by_id(sample_product.id)
+    
+    def test_rolled_back_write_is_not_served(self, product_service, sample_product, db_session):
+        """Test that rows read inside a rolled back transaction are dropped."""
+        sample_product.title = "Uncommitted Title"
+        db_session.flush()
+        assert product_service.get_by_id(sample_product.id).title == "Uncommitted Title"
+        
+        db_session.rollback()
+        
+        assert product_service.get_by_id(sample_product.id).title == "Nike Air Max 90"
@@ -5,17 +5,26 @@ Following TDD: Write tests FIRST, then implement service.
 
 Test Coverage:
 1. search_products() - full text search with filters
+   search_products_page() - keyset pagination with continuation cursors,
+   column projections
 2. get_by_id() - retrieve by internal ID
 3. get_by_gtin() - retrieve by GTIN
 4. check_buyability() - validate product can be purchased
 5. get_variants() - retrieve product variants
 6. Error handling for all methods
+7. iter_catalog() - batched, resumable walk of the whole catalog
 """
 
 import pytest
 from decimal import Decimal
-from app.services.product_service import ProductService, ProductNotFoundError, InvalidGTINError
+from app.services.product_service import (
+    ProductService,
+    ProductNotFoundError,
+    InvalidGTINError,
+    InvalidCursorError,
+)
 from app.models.product import Product
+from app.models.product_record import ProductRecord
 
 
 @pytest.mark.unit
@@ -125,6 +134,34 @@ class TestProductService:
         for product in results:
             assert "Running" in product.category
     
+    def test_search_products_category_includes_descendants(self, product_service, multiple_products):
+        """Test that a category path matches its whole subtree."""
+        # When: Filtering by a top-level category
+        results = product_service.search_products(category="Shoes")
+        
+        # Then: Products from every shoe subcategory are returned
+        assert {p.id for p in results} == {"nike-air-max-90", "nike-air-max-270", "nike-pegasus-40"}
+    
+    def test_search_products_category_by_name(self, product_service, multiple_products):
+        """Test that a node name matches that node wherever it appears."""
+        # When: Filtering by names rather than paths
+        running = product_service.search_products(category="running")
+        sneakers = product_service.search_products(category="Sneakers")
+        
+        # Then: Whole segments match; substrings do not
+        assert {p.id for p in running} == {"nike-air-max-90", "nike-pegasus-40"}
+        assert {p.id for p in sneakers} == {"nike-air-max-90", "nike-air-max-270"}
+        assert product_service.search_products(category="Run") == []
+    
+    def test_get_category_counts(self, product_service, multiple_products):
+        """Test subtree counts for category facets."""
+        assert product_service.get_category_counts() == {"Shoes": 3, "Apparel": 1}
+        assert product_service.get_category_counts("Shoes") == {
+            "Shoes > Running": 2,
+            "Shoes > Lifestyle": 1,
+        }
+        assert product_service.get_category_counts("Unknown") == {}
+    
     def test_search_products_with_price_filter(self, product_service, multiple_products):
         """Test filtering by price range."""
         # When: Searching with price filter
@@ -168,6 +205,60 @@ class TestProductService:
         # Then: Returns empty list
         assert len(results) == 0
     
+    def test_search_products_matches_brand_and_category(self, product_service, multiple_products):
+        """Test that full-text search covers brand and category, not just title."""
+        # When: Searching for a word that only appears in a category
+        results = product_service.search_products(query="apparel")
+        
+        # Then: Returns the product in that category
+        assert [p.id for p in results] == ["nike-dri-fit-shirt"]
+    
+    def test_search_products_ranks_by_relevance(self, product_service, multiple_products):
+        """Test that stronger matches are ranked first."""
+        # When: Searching for a term in one title but another description too
+        results = product_service.search_products(query="training")
+        
+        # Then: Product matching in title, description and category ranks first
+        assert [p.id for p in results] == ["nike-dri-fit-shirt", "nike-pegasus-40"]
+    
+    def test_search_index_follows_product_writes(self, product_service, multiple_products, db_session):
+        """Test that the search index stays in sync with updates and deletes."""
+        # Given: A renamed product and a deleted product
+        multiple_products[0].title = "Nike Vaporfly 3"
+        db_session.delete(multiple_products[1])
+        db_session.commit()
+        
+        # Then: Search reflects the new state
+        assert [p.id for p in product_service.search_products(query="vaporfly")] == ["nike-air-max-90"]
+        assert product_service.search_products(query="Air Max") == []
+    
+    def test_search_falls_back_without_index(self, product_service, multiple_products, db_session):
+        """Test that search still works on databases without FTS5."""
+        from app.models.product_search import drop_product_search_index
+        
+        # Given: Database without the search index
+        drop_product_search_index(db_session.connection())
+        
+        # When: Searching
+        results = product_service.search_products(query="Air Max")
+        
+        # Then: ILIKE fallback returns the same matches
+        assert len(results) == 2
+    
+    def test_search_index_backfilled_on_upgrade(self, product_service, multiple_products, db_session):
+        """Test that upgrading an existing database indexes existing rows."""
+        from app.models.product_search import drop_product_search_index, ensure_product_search_index
+        
+        # Given: Products written before the index existed
+        connection = db_session.connection()
+        drop_product_search_index(connection)
+        
+        # When: Upgrading the schema
+        ensure_product_search_index(connection)
+        
+        # Then: Existing products are searchable through the index
+        assert [p.id for p in product_service.search_products(query="apparel")] == ["nike-dri-fit-shirt"]
+    
     def test_search_products_with_limit(self, product_service, multiple_products):
         """Test limiting search results."""
         # When: Searching with limit
@@ -176,6 +267,245 @@ class TestProductService:
         # Then: Returns limited results
         assert len(results) == 2
     
+    # ============================================================================
+    # search_products_page() Tests
+    # ============================================================================
+    
+    @pytest.fixture
+    def paged_catalog(self, db_session):
+        """Create 25 running products with tied popularity scores."""
+        products = [
+            Product(
+                id=f"runner-{i:02d}",
+                gtin=str(10000000000000 + i),
+                title=f"Nike Runner {i}" if i % 2 else f"Nike Runner Runner {i}",
+                description="Lightweight running shoe",
+                category="Shoes > Running",
+                price=Decimal("100.00") + i,
+                availability="in_stock",
+                product_metadata={"popularity_score": i % 4}
+            )
+            for i in range(25)
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return products
+    
+    def _all_pages(self, product_service, **kwargs):
+        pages = [product_service.search_products_page(**kwargs)]
+        while pages[-1].next_cursor:
+            pages.append(product_service.search_products_page(cursor=pages[-1].next_cursor, **kwargs))
+        return pages
+    
+    def test_search_page_walks_popularity_order(self, product_service, paged_catalog):
+        """Test that pages concatenate to the full popularity ordering."""
+        # When: Paging through all products 10 at a time
+        pages = self._all_pages(product_service, limit=10)
+        
+        # Then: Every product appears exactly once, by popularity then ID
+        ids = [p.id for page in pages for p in page.items]
+        expected = sorted(paged_catalog, key=lambda p: (-p.product_metadata["popularity_score"], p.id))
+        assert ids == [p.id for p in expected]
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert pages[-1].next_cursor is None
+        assert {page.sort for page in pages} == {"popularity"}
+    
+    def test_search_page_walks_relevance_order(self, product_service, paged_catalog):
+        """Test that keyword searches page by relevance without gaps or repeats."""
+        # Given: The unpaginated ranking
+        ranked = [p.id for p in product_service.search_products(query="runner")]
+        
+        # When: Paging through the same search 4 at a time
+        pages = self._all_pages(product_service, query="runner", limit=4)
+        
+        # Then: Pages reproduce the ranking
+        assert [p.id for page in pages for p in page.items] == ranked
+        assert len(ranked) == 25
+        assert pages[0].sort == "relevance"
+    
+    def test_search_page_stable_under_inserts(self, product_service, paged_catalog, db_session):
+        """Test that rows inserted ahead of the cursor do not shift later pages."""
+        # Given: The first page
+        first = product_service.search_products_page(limit=10)
+        
+        # When: A product that sorts first is added before fetching page two
+        db_session.add(Product(
+            id="runner-new",
+            gtin="10000000000099",
+            title="Nike Runner New",
+            category="Shoes > Running",
+            price=Decimal("100.00"),
+            product_metadata={"popularity_score": 99}
+        ))
+        db_session.commit()
+        second = product_service.search_products_page(limit=10, cursor=first.next_cursor)
+        
+        # Then: Page two continues exactly where page one stopped
+        first_ids = [p.id for p in first.items]
+        second_ids = [p.id for p in second.items]
+        assert not set(first_ids) & set(second_ids)
+        assert "runner-new" not in second_ids
+        assert first_ids + second_ids == [p.id for p in product_service.search_products(limit=21)][1:]
+    
+    def test_search_page_does_not_use_offset(self, product_service, paged_catalog, statement_counter):
+        """Test that deep pages seek by key instead of skipping rows."""
+        statement_counter.clear()
+        self._all_pages(product_service, query="runner", limit=5)
+        
+        # SQLite renders "LIMIT ? OFFSET ?" for every LIMIT; the offset is the last parameter
+        offsets = [
+            parameters[-1]
+            for statement, parameters in zip(statement_counter, statement_counter.parameters)
+            if "OFFSET ?" in statement
+        ]
+        assert len(offsets) == 5
+        assert set(offsets) == {0}
+    
+    def test_search_page_seeks_popularity_index(
+        self, product_service, paged_catalog, db_session, statement_counter
+    ):
+        """Test that a page after a cursor seeks ix_products_popularity instead of scanning it."""
+        first = product_service.search_products_page(sort="popularity", limit=5)
+        statement_counter.clear()
+        product_service.search_products_page(sort="popularity", limit=5, cursor=first.next_cursor)
+        
+        statement, parameters = statement_counter[-1], statement_counter.parameters[-1]
+        plan = " ".join(
+            row[3] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+        assert "SEARCH products USING INDEX ix_products_popularity (popularity_score<?)" in plan
+    
+    def test_search_page_rejects_cursor_from_other_search(self, product_service, paged_catalog):
+        """Test that a cursor only continues the search it came from."""
+        page = product_service.search_products_page(query="runner", limit=5)
+        
+        with pytest.raises(InvalidCursorError):
+            product_service.search_products_page(query="running", limit=5, cursor=page.next_cursor)
+        
+        with pytest.raises(InvalidCursorError):
+            product_service.search_products_page(
+                query="runner", sort="popularity", limit=5, cursor=page.next_cursor
+            )
+    
+    def test_search_page_cursor_shared_by_equivalent_searches(self, product_service, paged_catalog):
+        """Test that a cursor continues every spelling of the search (they share cached pages)."""
+        # Given: First pages of searches that differ only in spelling
+        page = product_service.search_products_page(query="Nike  Runner", price_max=Decimal("150.0"), limit=5)
+        same = product_service.search_products_page(query="nike runner", price_max=Decimal("150"), limit=5)
+        assert same.next_cursor == page.next_cursor
+        
+        # When: Continuing with the other spelling
+        second = product_service.search_products_page(
+            query="nike runner", price_max=Decimal("150"), limit=5, cursor=page.next_cursor
+        )
+        
+        # Then: The cursor is accepted and the pages do not overlap
+        assert not {r.id for r in second.items} & {r.id for r in page.items}
+    
+    def test_search_page_rejects_malformed_cursor(self, product_service, paged_catalog):
+        """Test that garbage cursors raise InvalidCursorError."""
+        for cursor in ("not-a-cursor", "e30", "!!!"):
+            with pytest.raises(InvalidCursorError):
+                product_service.search_products_page(cursor=cursor)
+    
+    def test_search_page_projection(self, product_service, paged_catalog, statement_counter):
+        """Test that projected pages read only the named columns and page the same way."""
+        # When: Paging through a keyword search with a projection
+        statement_counter.clear()
+        pages = self._all_pages(product_service, query="runner", limit=10, fields=["title", "price"])
+        searches = [statement for statement in statement_counter if "products_fts MATCH" in statement]
+        
+        # Then: Same results as whole products, without the unprojected columns
+        items = [p for page in pages for p in page.items]
+        assert [p.id for p in items] == [p.id for p in product_service.search_products(query="runner")]
+        assert items[0].title.startswith("Nike Runner")
+        with pytest.raises(AttributeError):
+            items[0].description
+        assert searches and not any("products.variants" in statement for statement in searches)
+    
+    def test_search_page_projection_with_popularity(self, product_service, paged_catalog):
+        """Test projecting the popularity sort key itself."""
+        whole = product_service.search_products_page(limit=5)
+        projected = product_service.search_products_page(limit=5, fields=["popularity_score"])
+        
+        assert [p.popularity_score for p in projected.items] == [p.popularity_score for p in whole.items]
+        assert projected.next_cursor == whole.next_cursor
+    
+    def test_search_page_rejects_unknown_fields(self, product_service):
+        """Test that projections of unknown attributes raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown product fields: sku"):
+            product_service.search_products_page(fields=["title", "sku"])
+    
+    def test_search_page_facets(self, product_service, multiple_products, db_session):
+        """Test facet counts over all matches, independent of the page size."""
+        # Given: Color and gender metadata on two products
+        multiple_products[0].product_metadata = {"color": "White", "gender": "unisex"}
+        multiple_products[1].product_metadata = {"color": "White", "gender": "men"}
+        db_session.commit()
+        
+        # When: Requesting one product with facets
+        page = product_service.search_products_page(query="nike", limit=1, facets=True)
+        
+        # Then: Facets cover every match, with categories rolled up
+        assert len(page.items) == 1
+        assert page.facets["category"]["Shoes"] == 3
+        assert page.facets["category"]["Shoes > Running"] == 2
+        assert page.facets["category"]["Apparel > Training > Shirts"] == 1
+        assert page.facets["availability"] == {"in_stock": 3, "out_of_stock": 1}
+        assert page.facets["price"] == {"0-50": 1, "100-150": 2, "150-200": 1}
+        assert page.facets["color"] == {"White": 2}
+        assert page.facets["gender"] == {"men": 1, "unisex": 1}
+    
+    def test_search_page_facets_follow_filters(self, product_service, multiple_products):
+        """Test that facets count only products matching the filters."""
+        page = product_service.search_products_page(category="Running", facets=True)
+        
+        assert page.facets["availability"] == {"in_stock": 1, "out_of_stock": 1}
+        assert "Apparel" not in page.facets["category"]
+        assert product_service.search_products_page().facets is None
+    
+    def test_search_products_by_generated_attributes(self, product_service, multiple_products, db_session):
+        """Test gender and color filters on the generated metadata columns."""
+        # Given: Gender and color metadata
+        multiple_products[0].product_metadata = {"color": "White", "gender": "unisex"}
+        multiple_products[1].product_metadata = {"color": "Black", "gender": "men"}
+        multiple_products[3].product_metadata = {"color": "white", "gender": "men"}
+        db_session.commit()
+        
+        # When/Then: Filters match case-insensitively and combine
+        assert {p.id for p in product_service.search_products(color="WHITE")} == {
+            "nike-air-max-90", "nike-dri-fit-shirt"
+        }
+        assert [p.id for p in product_service.search_products(gender="men", color="black")] == [
+            "nike-air-max-270"
+        ]
+        assert product_service.search_products(gender="women") == []
+    
+    def test_search_products_buyable_only(self, product_service, multiple_products, db_session):
+        """Test that the stored buyability flag filters search results."""
+        # Given: A gift card among the shoes
+        db_session.add(Product(
+            id="nike-gift-card",
+            gtin="00883419999999",
+            title="Nike Gift Card",
+            category="Gift Cards",
+            price=Decimal("50.00")
+        ))
+        db_session.commit()
+        
+        # When: Searching with and without the filter
+        everything = product_service.search_products(query="nike")
+        buyable = product_service.search_products(query="nike", buyable_only=True)
+        
+        # Then: Gift card and out-of-stock products are dropped
+        assert len(everything) == 5
+        assert {p.id for p in buyable} == {"nike-air-max-90", "nike-air-max-270", "nike-dri-fit-shirt"}
+    
+    def test_search_page_rejects_unknown_sort(self, product_service):
+        """Test that unsupported sort orders raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported sort"):
+            product_service.search_products_page(sort="price")
+    
     # ============================================================================
     # get_by_id() Tests
     # ============================================================================
@@ -258,6 +588,260 @@ class TestProductService:
         with pytest.raises(InvalidGTINError):
             product_service.get_by_gtin("123456789012345")
     
+    def test_get_by_gtin_resolves_variant_gtin(self, product_service, sample_product):
+        """Test that a size-level variant GTIN resolves to its product."""
+        # When: Getting product by the size 9 variant GTIN
+        product = product_service.get_by_gtin("00883419552503")
+        
+        # Then: Returns the owning product
+        assert product.id == sample_product.id
+    
+    def test_resolve_gtin_returns_variant(self, product_service, sample_product):
+        """Test resolving product and variant in one lookup."""
+        # When: Resolving a variant GTIN and the product GTIN
+        product, variant = product_service.resolve_gtin("00883419552504")
+        _, product_gtin_variant = product_service.resolve_gtin(sample_product.gtin)
+        
+        # Then: Variant matches the requested GTIN
+        assert product.id == sample_product.id
+        assert variant.size == "10"
+        assert variant.to_dict() == {"size": "10", "size_system": "US", "gtin": "00883419552504"}
+        
+        # And: Product GTIN also matches its size 8 variant
+        assert product_gtin_variant.size == "8"
+    
+    def test_get_by_gtin_equivalent_forms(self, product_service, sample_product, db_session):
+        """Test that UPC-A, EAN-13 and GTIN-14 forms of one GTIN find the same product."""
+        # Given: A variant stored as a zero-padded GTIN-14
+        db_session.add(Product(
+            id="tee", gtin="04006381333924", title="Nike Tee", price=Decimal("25.00"),
+            variants=[{"size": "M", "gtin": "04006381333931"}]
+        ))
+        db_session.commit()
+        
+        # When: Looking up product and variant GTINs without leading zeros
+        by_upc = product_service.get_by_gtin("883419552502")
+        by_ean = product_service.get_by_gtin("0883419552502")
+        product, variant = product_service.resolve_gtin("4006381333931")
+        
+        # Then: They match the stored GTIN-14s
+        assert by_upc.id == by_ean.id == sample_product.id
+        assert (product.id, variant.size) == ("tee", "M")
+        resolved = product_service.resolve_gtins(["883419552502", "4006381333931"])
+        assert resolved["883419552502"][0].id == sample_product.id
+        assert resolved["4006381333931"][1].size == "M"
+    
+    def test_gtin_without_valid_check_digit_matches_exactly(self, product_service, db_session):
+        """Test that GTINs failing the check digit are not zero-padded for lookup."""
+        # Given: A product whose GTIN has a wrong check digit
+        db_session.add(Product(id="internal", gtin="12345678", title="Internal Code", price=Decimal("10.00")))
+        db_session.commit()
+        
+        # Then: Only the exact string finds it
+        assert product_service.get_by_gtin("12345678").id == "internal"
+        with pytest.raises(ProductNotFoundError):
+            product_service.get_by_gtin("00000012345678")
+        assert product_service.resolve_gtins(["00000012345678"]) == {}
+    
+    def test_variant_index_follows_product_writes(self, product_service, sample_product, db_session):
+        """Test that the variant index is rebuilt when variants change or product is deleted."""
+        # Given: Variants replaced
+        sample_product.variants = [{"size": "11", "size_system": "US", "gtin": "00883419552599"}]
+        db_session.commit()
+        
+        # Then: Old variant GTINs no longer resolve, new one does
+        with pytest.raises(ProductNotFoundError):
+            product_service.get_by_gtin("00883419552503")
+        assert product_service.resolve_gtin("00883419552599")[1].size == "11"
+        
+        # When: Product deleted
+        db_session.delete(sample_product)
+        db_session.commit()
+        
+        # Then: Variant GTIN no longer resolves
+        with pytest.raises(ProductNotFoundError):
+            product_service.get_by_gtin("00883419552599")
+    
+    def test_variant_index_backfilled_on_upgrade(self, product_service, sample_product, db_session):
+        """Test that upgrading an existing database indexes existing variants."""
+        from app.models.product_variant import ProductVariant, ensure_product_variants
+        
+        # Given: Variants written before the index existed
+        db_session.query(ProductVariant).delete()
+        db_session.commit()
+        
+        # When: Upgrading the schema
+        ensure_product_variants(db_session.connection())
+        
+        # Then: Variant GTINs resolve again
+        assert product_service.get_by_gtin("00883419552503").id == sample_product.id
+    
+    def test_variant_index_rebuild_matches_write_time_index(self, db_session):
+        """Test that rebuilding the variant index reproduces what product writes stored."""
+        from app.models.product_variant import ProductVariant, rebuild_product_variants
+        
+        # Given: Products whose variants were indexed on write, one GTIN claimed twice
+        db_session.add_all([
+            Product(id="a", gtin="10000000000001", title="A", price=Decimal("10"), variants=[
+                {"size": "9", "size_system": "US", "gtin": "10000000000002"},
+                {"size": 10, "gtin": "10000000000003", "color": "Red"},
+                {"size": "11"},
+            ]),
+            Product(id="b", gtin="20000000000001", title="B", price=Decimal("10"), variants=[
+                {"size": "S", "gtin": "10000000000003"},
+            ]),
+            Product(id="c", gtin="30000000000001", title="C", price=Decimal("10"), variants=[
+                {"gtin": 0}, {"gtin": "0"}, {"gtin": False}, {"gtin": True}, {"gtin": ""},
+                {"gtin": None}, {"gtin": 1.5}, {"gtin": ["1"]}, {"gtin": 30000000000002}, "30000000000003",
+            ]),
+        ])
+        db_session.commit()
+        
+        def indexed():
+            db_session.expire_all()
+            return sorted(
+                (v.product_id, v.gtin, v.size, v.size_system, v.color, v.to_dict())
+                for v in db_session.query(ProductVariant)
+            )
+        written = indexed()
+        
+        # When: Rebuilding the index from products
+        rebuild_product_variants(db_session.connection())
+        
+        # Then: Same rows, last owner of the shared GTIN kept, only string and integer GTINs indexed
+        assert indexed() == written
+        assert [row[:2] for row in written] == [
+            ("a", "10000000000002"), ("b", "10000000000003"), ("c", "0"), ("c", "30000000000002")
+        ]
+    
+    def test_variant_gtin_spellings_are_one_variant(self, product_service, db_session):
+        """Test that a variant GTIN claimed again in another spelling moves to the last writer."""
+        from app.models.product_variant import ProductVariant, rebuild_product_variants
+        
+        # Given: Two products claiming one item as UPC-A and as EAN-13
+        db_session.add(Product(id="a", gtin="10000000000001", title="A", price=Decimal("10"), variants=[
+            {"size": "9", "gtin": "012345678905"},
+        ]))
+        db_session.commit()
+        db_session.add(Product(id="b", gtin="20000000000001", title="B", price=Decimal("10"), variants=[
+            {"size": "S", "gtin": "0012345678905"},
+        ]))
+        db_session.commit()
+        
+        # Then: One variant row, owned by the last writer, found by every spelling
+        def indexed():
+            return [(v.product_id, v.gtin) for v in db_session.query(ProductVariant)]
+        assert indexed() == [("b", "0012345678905")]
+        for gtin in ("012345678905", "0012345678905", "00012345678905"):
+            assert product_service.get_by_gtin(gtin).id == "b"
+        
+        # And: A rebuild comes to the same result
+        rebuild_product_variants(db_session.connection())
+        db_session.expire_all()
+        assert indexed() == [("b", "0012345678905")]
+    
+    # ============================================================================
+    # Batch lookup Tests
+    # ============================================================================
+    
+    def test_get_many_by_id_returns_keyed_map(self, product_service, multiple_products):
+        """Test retrieving several products by ID in one call."""
+        # When: Getting known, unknown and duplicate IDs
+        products = product_service.get_many_by_id(
+            ["nike-air-max-90", "nike-pegasus-40", "nike-air-max-90", "unknown-id"]
+        )
+        
+        # Then: Returns only known products keyed by ID
+        assert set(products) == {"nike-air-max-90", "nike-pegasus-40"}
+        assert products["nike-pegasus-40"].title == "Nike Pegasus 40"
+    
+    def test_get_many_by_id_empty(self, product_service):
+        """Test that an empty ID list returns an empty map."""
+        assert product_service.get_many_by_id([]) == {}
+    
+    # ============================================================================
+    # Catalog Walk Tests
+    # ============================================================================
+    
+    def test_iter_catalog_walks_all_products_in_id_order(self, product_service, paged_catalog):
+        """Test that the walk crosses batch boundaries in ID order."""
+        # When: Walking with a batch size that does not divide the catalog
+        records = list(product_service.iter_catalog(batch_size=4))
+        
+        # Then: Every product once, as detached records
+        assert [r.id for r in records] == sorted(p.id for p in paged_catalog)
+        assert all(isinstance(r, ProductRecord) for r in records)
+        assert records[3].price == Decimal("103.00")
+        assert records[3].popularity_score == 3
+    
+    def test_iter_catalog_resumes_after_cursor(self, product_service, paged_catalog):
+        """Test that a walk resumed from the last ID continues where it stopped."""
+        # Given: A walk interrupted after 10 products
+        first = [r.id for _, r in zip(range(10), product_service.iter_catalog(batch_size=3))]
+        
+        # When: Resuming after the last ID received
+        rest = [r.id for r in product_service.iter_catalog(after=first[-1], batch_size=3)]
+        
+        # Then: Together they cover the catalog exactly once
+        assert first + rest == sorted(p.id for p in paged_catalog)
+    
+    def test_iter_catalog_does_not_block_writers(self, tmp_path):
+        """Test that a write succeeds while a walk over a file database is half consumed."""
+        import sqlite3
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+        
+        # Given: A file database (rollback journal) with 250 products
+        path = tmp_path / "catalog.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all(
+            Product(id=f"p-{i:03d}", gtin=str(10000000 + i), title=f"Product {i}", price=Decimal("10.00"))
+            for i in range(250)
+        )
+        session.commit()
+        
+        # When: 150 rows of a walk are read and another connection writes
+        walk = ProductService(session).iter_catalog(batch_size=100)
+        assert len([record for _, record in zip(range(150), walk)]) == 150
+        writer = sqlite3.connect(path, timeout=0.1)
+        writer.execute("UPDATE products SET title = 'Renamed' WHERE id = 'p-249'")
+        writer.commit()
+        writer.close()
+        
+        # Then: The write was not blocked and the rest of the walk sees it
+        rest = list(walk)
+        assert len(rest) == 100
+        assert rest[-1].title == "Renamed"
+        session.close()
+        engine.dispose()
+    
+    def test_iter_catalog_rejects_bad_batch_size(self, product_service):
+        """Test that batch_size must be positive."""
+        with pytest.raises(ValueError):
+            list(product_service.iter_catalog(batch_size=0))
+    
+    def test_get_many_by_gtin_resolves_product_and_variant_gtins(self, product_service, sample_product):
+        """Test resolving product and variant GTINs in one call."""
+        # When: Resolving product GTIN, variant GTIN and unknown GTIN
+        resolved = product_service.resolve_gtins(
+            [sample_product.gtin, "00883419552504", "99999999999999"]
+        )
+        
+        # Then: Known GTINs map to product and variant
+        assert set(resolved) == {sample_product.gtin, "00883419552504"}
+        assert resolved["00883419552504"][0].id == sample_product.id
+        assert resolved["00883419552504"][1].size == "10"
+        assert resolved[sample_product.gtin][1].size == "8"
+        assert product_service.get_many_by_gtin(["00883419552504"])["00883419552504"].id == sample_product.id
+    
+    def test_get_many_by_gtin_invalid_gtin(self, product_service):
+        """Test that any invalid GTIN in the batch raises error."""
+        with pytest.raises(InvalidGTINError):
+            product_service.get_many_by_gtin(["00883419552502", "bad"])
+    
     # ============================================================================
     # check_buyability() Tests
     # ============================================================================
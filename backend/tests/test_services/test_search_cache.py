@@ -0,0 +1,149 @@
+"""
+Tests for Search Result Cache
+
+Test Coverage:
+1. SearchResultCache - key normalization, LRU bound, TTL, generations, counters
+2. ProductService search caching - hits, invalidation on writes, immutability
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.models.product import Product
+from app.models.product_record import ProductRecord
+from app.services.product_service import ProductService
+from app.services.search_cache import SearchResultCache, search_cache_key
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestSearchResultCache:
+    """Test suite for the SearchResultCache data structure."""
+
+    def test_equivalent_searches_share_a_key(self):
+        """Test that case, spacing and unset parameters do not change the key."""
+        assert search_cache_key("s", query=" Air  MAX ", category="shoes>running", limit=10) == (
+            search_cache_key("s", query="air max", category="Shoes > Running", limit=10, color=None)
+        )
+        assert search_cache_key("s", price_max=Decimal("150.00")) == search_cache_key("s", price_max=150)
+        assert search_cache_key("s", query="air max", limit=10) != search_cache_key("s", query="air max", limit=20)
+        assert search_cache_key("s", query="air") != search_cache_key("t", query="air")
+
+    def test_lru_bound(self):
+        """Test that the least recently used entry is evicted past max_entries."""
+        cache = SearchResultCache(max_entries=2)
+        cache.put("a", 1, cache.generation)
+        cache.put("b", 2, cache.generation)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", 3, cache.generation)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["size"] == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after their TTL."""
+        now = [0.0]
+        cache = SearchResultCache(ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", 1, cache.generation)
+
+        now[0] = 9.9
+        assert cache.get("a") == 1
+        now[0] = 10.0
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_bump_invalidates_everything(self):
+        """Test that bumping the generation drops all entries."""
+        cache = SearchResultCache()
+        cache.put("a", 1, cache.generation)
+
+        cache.bump_generation()
+
+        assert cache.get("a") is None
+        assert cache.stats()["generation"] == 1
+
+    def test_result_from_an_older_generation_is_not_stored(self):
+        """Test that a search overlapping a write is not cached."""
+        cache = SearchResultCache()
+        generation = cache.generation  # Search starts
+        cache.bump_generation()        # Catalog write lands
+        cache.put("a", "stale", generation)
+
+        assert cache.get("a") is None
+
+    def test_hit_rate(self):
+        """Test that hits and misses are counted."""
+        cache = SearchResultCache()
+        cache.get("a")
+        cache.put("a", 1, cache.generation)
+        cache.get("a")
+        cache.get("a")
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductServiceSearchCaching:
+    """Test suite for search result caching in ProductService."""
+
+    @pytest.fixture
+    def product_service(self, db_session):
+        """Create ProductService instance."""
+        return ProductService(db_session)
+
+    def test_repeated_search_is_served_from_cache(self, product_service, sample_product):
+        """Test that an equivalent search is a cache hit."""
+        # Given: A search
+        first = product_service.search_products_page(query="Air Max", limit=10)
+
+        # When: Searching again with different case and spacing
+        second = product_service.search_products_page(query="  air max", limit=10)
+
+        # Then: The cached records are returned
+        assert [p.id for p in second.items] == [sample_product.id]
+        assert all(isinstance(p, ProductRecord) for p in second.items)
+        assert second.items[0] is first.items[0]
+        assert product_service.search_cache.stats()["hits"] == 1
+
+    def test_write_invalidates_cached_results(self, product_service, sample_product, db_session):
+        """Test that a product written after a search shows up on the next one."""
+        assert len(product_service.search_products(query="air max")) == 1
+
+        db_session.add(Product(
+            id="nike-air-max-95",
+            gtin="00883419552599",
+            title="Nike Air Max 95",
+            category="Shoes > Running",
+            price=Decimal("170.00")
+        ))
+        db_session.commit()
+
+        assert {p.id for p in product_service.search_products(query="air max")} == {
+            sample_product.id, "nike-air-max-95"
+        }
+
+    def test_cached_page_cannot_be_mutated(self, product_service, sample_product):
+        """Test that callers cannot corrupt cached pages."""
+        page = product_service.search_products_page(query="air max", facets=True)
+        page.items.clear()
+
+        with pytest.raises(TypeError):
+            page.facets["availability"]["in_stock"] = 0
+
+        again = product_service.search_products_page(query="air max", facets=True)
+        assert [p.id for p in again.items] == [sample_product.id]
+
+    def test_disabled_by_settings(self, db_session, sample_product, monkeypatch):
+        """Test that search_cache_enabled=False bypasses the cache."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "search_cache_enabled", False)
+
+        service = ProductService(db_session)
+
+        assert service.search_cache is None
+        assert isinstance(service.search_products(query="air max")[0], Product)
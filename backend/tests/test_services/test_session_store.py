@@ -0,0 +1,188 @@
+"""
+Tests for Checkout Session Stores
+
+Test Coverage:
+1. WriteBehindSessionStore - changes held in memory until flush(), batched
+   upserts, synchronous completion in the order's transaction, rolled back
+   completions, stale flushes never reopening a completed session, expired
+   sessions, eviction
+2. SessionStore - stores must implement every operation
+3. get_session_store() - store selected by settings
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import unit_of_work
+from app.models.order import Order
+from app.models.product import Product
+from app.services.checkout_service import CheckoutService
+from app.services.order_service import OrderService
+from app.services.session_store import SessionStore, SQLSessionStore, WriteBehindSessionStore, get_session_store
+
+
+def _stored_status(db_session, session_id):
+    return db_session.execute(
+        text("SELECT status FROM checkout_sessions WHERE id = :id"), {"id": session_id}
+    ).scalar()
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestWriteBehindSessionStore:
+    """Test suite for WriteBehindSessionStore."""
+
+    @pytest.fixture
+    def store(self, db_engine):
+        """Write-behind store flushed by the test (no background thread)."""
+        return WriteBehindSessionStore(db_engine, flush_interval_seconds=None, max_sessions=2)
+
+    @pytest.fixture
+    def checkout_service(self, db_session, store):
+        """CheckoutService using the write-behind store, with one product."""
+        db_session.add(Product(
+            id="tee", gtin="04006381333931", title="Nike Tee", price=Decimal("25.00"), availability="in_stock"
+        ))
+        db_session.commit()
+        return CheckoutService(db_session, session_store=store)
+
+    def test_changes_are_written_on_flush(self, checkout_service, store, db_session, sample_shipping_address):
+        """Test that creates and updates stay in memory until one batched flush."""
+        # GIVEN: A session created and then given an address
+        session = checkout_service.create_session(items=[{"product_id": "tee", "quantity": 1}])
+        checkout_service.update_session(session.id, address=sample_shipping_address)
+
+        # THEN: Nothing is written yet, but reads see the latest state
+        assert _stored_status(db_session, session.id) is None
+        assert checkout_service.get_session(session.id).status == "ready_for_payment"
+        assert session.created_at is not None
+
+        # WHEN: Flushing
+        assert store.flush() == 1
+
+        # THEN: The latest state is stored, and a second flush has nothing to do
+        assert _stored_status(db_session, session.id) == "ready_for_payment"
+        assert store.flush() == 0
+        assert store.stats()["flushed_sessions"] == 1
+
+    def test_completion_commits_with_order(self, checkout_service, store, db_session, sample_shipping_address):
+        """Test that completion is written synchronously in the order's transaction."""
+        session = checkout_service.create_session(
+            items=[{"product_id": "tee", "quantity": 1}], address=sample_shipping_address
+        )
+
+        # WHEN: Completing without any flush
+        with unit_of_work(db_session):
+            order = OrderService(db_session).create_order(session, "pi_123")
+            checkout_service.complete_session(session, "tok_123", order.id)
+
+        # THEN: Order and completed session are stored; nothing left to flush
+        assert _stored_status(db_session, session.id) == "completed"
+        assert checkout_service.get_session(session.id).order_id == order.id
+        assert store.flush() == 0
+
+    def test_rolled_back_completion_keeps_session_open(
+        self, checkout_service, store, db_session, sample_shipping_address
+    ):
+        """Test that a failed completion leaves the session payable and dirty."""
+        session = checkout_service.create_session(
+            items=[{"product_id": "tee", "quantity": 1}], address=sample_shipping_address
+        )
+
+        # WHEN: The unit of work fails after the completion was written
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db_session):
+                order = OrderService(db_session).create_order(session, "pi_123")
+                checkout_service.complete_session(session, "tok_123", order.id)
+                raise RuntimeError("receipt failed")
+
+        # THEN: No order; the in-memory session is unchanged and still flushed later
+        assert db_session.query(Order).count() == 0
+        assert checkout_service.get_session(session.id).status == "ready_for_payment"
+        assert store.flush() == 1
+        assert _stored_status(db_session, session.id) == "ready_for_payment"
+
+    def test_flush_never_reopens_completed_session(
+        self, checkout_service, store, db_session, sample_shipping_address
+    ):
+        """Test that a stale in-memory copy cannot overwrite a completion."""
+        # GIVEN: A flushed session completed by another process
+        session = checkout_service.create_session(items=[{"product_id": "tee", "quantity": 1}])
+        store.flush()
+        db_session.execute(text("UPDATE checkout_sessions SET status = 'completed'"))
+        db_session.commit()
+
+        # WHEN: This process updates and flushes its copy
+        checkout_service.update_session(session.id, address=sample_shipping_address)
+        store.flush()
+
+        # THEN: The completion stands
+        assert _stored_status(db_session, session.id) == "completed"
+
+    def test_expired_sessions_are_not_flushed(self, checkout_service, store, db_session):
+        """Test that expired sessions are dropped instead of written (the sweeper deletes them)."""
+        session = checkout_service.create_session(items=[{"product_id": "tee", "quantity": 1}])
+        session.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        store.save(db_session, session)
+
+        assert store.flush() == 0
+        assert store.stats()["sessions"] == 0
+        assert _stored_status(db_session, session.id) is None
+
+    def test_flushed_sessions_are_evicted(self, checkout_service, store):
+        """Test that sessions over max_sessions are dropped once flushed and reloaded on use."""
+        ids = [checkout_service.create_session(items=[{"product_id": "tee", "quantity": 1}]).id for _ in range(3)]
+
+        # WHEN: Three sessions exceed max_sessions=2 while all are dirty
+        # THEN: The third save flushed them all and evicted the oldest
+        assert store.stats()["sessions"] == 2
+        assert store.stats()["dirty"] == 0
+        assert store.evictions == 1
+
+        assert checkout_service.get_session(ids[0]).id == ids[0]
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestSessionStore:
+    """Test suite for the SessionStore interface."""
+
+    def test_incomplete_store_cannot_be_created(self):
+        """Test that a store missing an operation fails when created, not when first used."""
+        class ReadOnlyStore(SessionStore):
+            def get(self, db, session_id):
+                return None
+
+        with pytest.raises(TypeError, match="add, persist, save"):
+            ReadOnlyStore()
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestGetSessionStore:
+    """Test suite for the store selected in settings."""
+
+    def test_sql_store(self, db_engine, monkeypatch):
+        """Test that the "sql" setting commits sessions synchronously."""
+        monkeypatch.setattr(settings, "checkout_session_store", "sql")
+
+        assert isinstance(get_session_store(db_engine), SQLSessionStore)
+
+    def test_write_behind_per_database(self, db_engine, monkeypatch):
+        """Test that the write-behind store is created once per database."""
+        monkeypatch.setattr(settings, "checkout_session_store", "write_behind")
+
+        store = get_session_store(db_engine)
+
+        assert isinstance(store, WriteBehindSessionStore)
+        assert get_session_store(db_engine) is store
+
+    def test_unknown_store(self, db_engine, monkeypatch):
+        """Test that a misspelled setting is reported."""
+        monkeypatch.setattr(settings, "checkout_session_store", "redis")
+
+        with pytest.raises(ValueError, match="checkout_session_store"):
+            get_session_store(db_engine)
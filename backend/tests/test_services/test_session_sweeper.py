@@ -0,0 +1,136 @@
+"""
+Tests for the Checkout Session Sweeper
+
+Test Coverage:
+1. sweep() - expired open and canceled sessions deleted in bounded batches,
+   completed and unexpired sessions kept, (status, expires_at) index used
+2. Leader lease - one sweeping worker, renewal, takeover after expiry or
+   release
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.models.checkout_session import CheckoutSession
+from app.services.session_sweeper import SessionSweeper
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+class _Clock:
+    """Settable UTC clock."""
+
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _session(session_id, status, expires_in_hours):
+    return CheckoutSession(
+        id=session_id, status=status, line_items=[], expires_at=NOW + timedelta(hours=expires_in_hours)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestSessionSweeper:
+    """Test suite for SessionSweeper."""
+
+    @pytest.fixture
+    def clock(self):
+        return _Clock()
+
+    @pytest.fixture
+    def sessions(self, db_session):
+        """Five expired sessions that may be deleted, plus ones that must stay."""
+        db_session.add_all(
+            [_session(f"cs_open_{i}", "ready_for_payment", -1) for i in range(3)]
+            + [
+                _session("cs_cart", "not_ready_for_payment", -2),
+                _session("cs_canceled", "canceled", -3),
+                _session("cs_completed", "completed", -1),
+                _session("cs_active", "ready_for_payment", 1),
+            ]
+        )
+        db_session.commit()
+
+    def _remaining(self, db_session):
+        db_session.expire_all()
+        return {session.id for session in db_session.query(CheckoutSession)}
+
+    def test_deletes_expired_sessions(self, db_engine, db_session, sessions, clock):
+        """Test that expired sessions are deleted unless completed."""
+        sweeper = SessionSweeper(db_engine, batch_size=2, clock=clock)
+
+        # WHEN: Sweeping
+        deleted = sweeper.sweep()
+
+        # THEN: Five sessions in three batches; completed and active sessions stay
+        assert deleted == 5
+        assert self._remaining(db_session) == {"cs_completed", "cs_active"}
+        stats = sweeper.stats()
+        assert (stats["sessions_deleted"], stats["batches"], stats["runs"]) == (5, 3, 1)
+
+    def test_batches_per_run_are_bounded(self, db_engine, db_session, sessions, clock):
+        """Test that a run stops after max_batches and the next one continues."""
+        sweeper = SessionSweeper(db_engine, batch_size=2, max_batches=1, clock=clock)
+
+        assert sweeper.sweep() == 2
+        assert len(self._remaining(db_session)) == 5
+
+        assert sweeper.sweep() == 2
+        assert sweeper.sweep() == 1
+        assert sweeper.sweep() == 0
+        assert sweeper.stats()["sessions_deleted"] == 5
+
+    def test_sweep_uses_status_expiry_index(self, db_session):
+        """Test that expired sessions are found through the (status, expires_at) index."""
+        plan = " ".join(row[3] for row in db_session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id FROM checkout_sessions "
+            "WHERE status IN ('ready_for_payment', 'canceled') AND expires_at < '2026-03-01' LIMIT 500"
+        ))
+
+        assert "ix_checkout_sessions_status_expires_at" in plan
+
+    def test_only_the_leader_sweeps(self, db_engine, db_session, sessions, clock):
+        """Test that a second worker skips runs while the lease is held."""
+        leader = SessionSweeper(db_engine, interval_seconds=60, holder="worker-1", clock=clock)
+        follower = SessionSweeper(db_engine, interval_seconds=60, holder="worker-2", clock=clock)
+
+        # WHEN: Both workers run
+        assert leader.sweep() == 5
+        db_session.add(_session("cs_late", "ready_for_payment", -1))
+        db_session.commit()
+        assert follower.sweep() == 0
+
+        # THEN: The follower skipped; the leader renews its lease
+        assert follower.stats()["leader"] is False
+        assert follower.stats()["skipped_runs"] == 1
+        assert leader.acquire_lease() is True
+        assert "cs_late" in self._remaining(db_session)
+
+    def test_lease_is_taken_over(self, db_engine, sessions, clock):
+        """Test that another worker leads after the lease lapses or is released."""
+        leader = SessionSweeper(db_engine, interval_seconds=60, holder="worker-1", clock=clock)
+        follower = SessionSweeper(db_engine, interval_seconds=60, holder="worker-2", clock=clock)
+        assert leader.acquire_lease() is True
+
+        # WHEN: The leader stops renewing for three intervals
+        clock.now = NOW + timedelta(seconds=181)
+
+        # THEN: The follower takes over and the old leader cannot renew
+        assert follower.acquire_lease() is True
+        assert leader.acquire_lease() is False
+
+        # WHEN: The new leader releases the lease
+        follower.release_lease()
+
+        # THEN: Any worker can take it at once
+        assert leader.acquire_lease() is True
+
+    def test_invalid_batch_size(self, db_engine):
+        """Test that non-positive batch limits are rejected."""
+        with pytest.raises(ValueError):
+            SessionSweeper(db_engine, batch_size=0)
@@ -0,0 +1,208 @@
+"""
+Tests for Trigram Index
+
+Test Coverage:
+1. TrigramIndex - similarity, suggestions, query correction, incremental updates
+2. ProductService typo-tolerant search - fallback, cursors, index maintenance
+   on commit, background rebuilds, lookups without database access
+"""
+
+import pytest
+from decimal import Decimal
+
+from app.models.product import Product
+from app.services.catalog_events import publish_catalog_change
+from app.services.product_service import ProductService
+from app.services.trigram_index import TrigramIndex, trigram_similarity, word_trigrams
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestTrigramIndex:
+    """Test suite for the TrigramIndex data structure."""
+
+    @pytest.fixture
+    def index(self):
+        """Index a few titles and brands."""
+        index = TrigramIndex(min_similarity=0.4)
+        index.add_product("air-max", "Nike Air Max 90", "Nike")
+        index.add_product("pegasus", "Nike Pegasus 40", "Nike")
+        index.add_product("maxi", "Maxi Dress", "Acme")
+        return index
+
+    def test_similarity(self):
+        """Test pg_trgm-style similarity of padded words."""
+        assert trigram_similarity(word_trigrams("pegasus"), word_trigrams("pegasus")) == 1.0
+        assert trigram_similarity(word_trigrams("pegassus"), word_trigrams("pegasus")) == pytest.approx(0.7)
+        assert trigram_similarity(word_trigrams("air"), word_trigrams("max")) == 0.0
+
+    def test_suggest_ranks_by_similarity(self, index):
+        """Test that the closest word comes first."""
+        suggestions = index.suggest("maxx")
+
+        assert suggestions[0][0] == "max"
+        assert [word for word, _ in suggestions] == ["max", "maxi"]
+        assert index.suggest("zzzz") == []
+
+    def test_correct_replaces_unknown_words_only(self, index):
+        """Test that known words and numbers are kept as they are."""
+        assert index.correct("Air Maxx") == "air max"
+        assert index.correct("pegassus 40") == "pegasus 40"
+        assert index.correct("air max") is None
+        assert index.correct("qwerty") is None
+
+    def test_incremental_add_and_remove(self, index):
+        """Test that words disappear with the last product using them."""
+        index.add_product("vomero", "Nike Vomero 17")
+        assert index.correct("vomeor") == "vomero"
+
+        index.remove_product("vomero")
+        assert index.correct("vomeor") is None
+        assert index.correct("nikee") == "nike"  # Still used by other products
+
+    def test_reindexing_a_product_replaces_its_words(self, index):
+        """Test that re-adding a product drops its old words."""
+        index.add_product("pegasus", "Nike Invincible 3", "Nike")
+
+        assert index.correct("pegassus") is None
+        assert index.correct("invincibel") == "invincible"
+        assert index.stats()["products"] == 3
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestProductServiceFuzzySearch:
+    """Test suite for typo-tolerant search in ProductService."""
+
+    @pytest.fixture
+    def product_service(self, db_session):
+        """Create ProductService instance."""
+        return ProductService(db_session)
+
+    @pytest.fixture
+    def catalog(self, db_session):
+        """Create three Air Max products."""
+        products = [
+            Product(
+                id=f"nike-air-max-{i}",
+                gtin=f"0088341955250{i}",
+                title=f"Nike Air Max {90 + i}",
+                brand="Nike",
+                category="Shoes > Running",
+                price=Decimal("120.00")
+            )
+            for i in range(3)
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return products
+
+    def test_typo_is_corrected(self, product_service, catalog):
+        """Test that a misspelled query returns the corrected query's results."""
+        # When: Searching with typos
+        page = product_service.search_products_page(query="nikee air maxx")
+
+        # Then: Results for the corrected query
+        assert page.corrected_query == "nike air max"
+        assert len(page.items) == 3
+
+    def test_exact_matches_are_not_corrected(self, product_service, catalog):
+        """Test that queries with results are left alone."""
+        page = product_service.search_products_page(query="air max")
+
+        assert page.corrected_query is None
+        assert product_service.trigram_index.stats()["lookups"] == 0
+
+    def test_corrected_search_pages_with_original_query(self, product_service, catalog):
+        """Test that cursors of a corrected search work with the query as typed."""
+        first = product_service.search_products_page(query="air maxx", limit=2)
+        second = product_service.search_products_page(query="air maxx", limit=2, cursor=first.next_cursor)
+
+        assert second.corrected_query == "air max"
+        assert {p.id for p in first.items + second.items} == {p.id for p in catalog}
+        assert second.next_cursor is None
+
+    def test_index_follows_catalog_writes(self, product_service, catalog, db_session):
+        """Test that new and renamed products are picked up incrementally."""
+        # Given: A built index
+        assert product_service.search_products(query="pegassus") == []
+
+        # When: Adding a product, then renaming it
+        db_session.add(Product(
+            id="nike-pegasus-40",
+            gtin="00883419552599",
+            title="Nike Pegasus 40",
+            price=Decimal("130.00")
+        ))
+        db_session.commit()
+        assert [p.id for p in product_service.search_products(query="pegassus")] == ["nike-pegasus-40"]
+
+        db_session.get(Product, "nike-pegasus-40").title = "Nike Vomero 17"
+        db_session.commit()
+
+        # Then: The old word is gone and the new one is found, without a rebuild
+        assert product_service.search_products(query="pegassus") == []
+        assert [p.id for p in product_service.search_products(query="vomeor")] == ["nike-pegasus-40"]
+        assert product_service.trigram_index.stats()["rebuilds"] == 1
+
+    def test_disabled_by_settings(self, db_session, catalog, monkeypatch):
+        """Test that fuzzy_search_enabled=False turns the fallback off."""
+        from app.config import settings
+        monkeypatch.setattr(settings, "fuzzy_search_enabled", False)
+
+        assert ProductService(db_session).search_products(query="air maxx") == []
+
+    def test_warm_up_builds_in_background(self, product_service, catalog):
+        """Test that the startup build happens on a worker thread, not in a search."""
+        product_service.trigram_index.warm_up()
+
+        assert product_service.trigram_index.wait_until_fresh()
+        assert product_service.trigram_index.stats()["words"] == 6
+        product_service.search_products(query="air maxx")
+        assert product_service.trigram_index.stats()["rebuilds"] == 1
+
+    def test_commit_updates_index_before_lookup(self, product_service, catalog, db_session, statement_counter):
+        """Test that committed writes are applied by the commit, so lookups never query."""
+        # Given: A built index
+        product_service.trigram_index.refresh()
+
+        # When: A product is renamed and committed
+        db_session.get(Product, "nike-air-max-0").title = "Nike Pegasus 40"
+        db_session.commit()
+
+        # Then: The lookup sees it without touching the database
+        statement_counter.clear()
+        assert product_service.trigram_index.correct("pegassus") == "pegasus"
+        assert statement_counter == []
+        assert product_service.trigram_index.stats()["updated_products"] == 1
+
+    def test_uncommitted_writes_are_not_indexed(self, product_service, catalog, db_session):
+        """Test that flushed and rolled back writes never reach the index."""
+        product_service.trigram_index.refresh()
+
+        db_session.add(Product(
+            id="nike-pegasus-40", gtin="00883419552599", title="Nike Pegasus 40", price=Decimal("130.00")
+        ))
+        db_session.flush()
+        assert product_service.trigram_index.correct("pegassus") is None
+        db_session.rollback()
+
+        assert product_service.trigram_index.correct("pegassus") is None
+        assert product_service.trigram_index.stats()["updated_products"] == 0
+
+    def test_full_catalog_change_rebuilds_in_background(self, product_service, catalog, db_engine, db_session):
+        """Test that bulk changes swap in a rebuilt index while lookups use the current one."""
+        trigram_index = product_service.trigram_index
+        trigram_index.refresh()
+        current = trigram_index.snapshot
+
+        # When: A write that bypassed the ORM is published
+        db_session.execute(Product.__table__.update().values(title="Nike Pegasus 40"))
+        db_session.commit()
+        publish_catalog_change(db_engine)
+
+        # Then: A replacement is built off the request path and swapped in
+        assert trigram_index.wait_until_fresh()
+        assert trigram_index.snapshot is not current
+        assert trigram_index.correct("pegassus") == "pegasus"
+        assert trigram_index.stats()["rebuilds"] == 2
@@ -117,7 +117,7 @@ export const useStore = create((set, get) => ({
       })
       
       // Parse product from MCP response
-      const products = parseMCPResult(result) || []
+      const products = parseMCPResult(result)?.products || []
       
       if (products.length > 0) {
         const product = products[0]